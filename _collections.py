@@ -16,18 +16,26 @@ except ImportError:  # Platform-specific: No threads available
             pass
 
 
-from collections import OrderedDict
+from collections import OrderedDict, deque
 
 from .exceptions import InvalidHeader
 from .packages import six
 from .packages.six import iterkeys, itervalues
 
-__all__ = ["RecentlyUsedContainer", "HTTPHeaderDict"]
+__all__ = [
+    "RecentlyUsedContainer",
+    "ConcurrentRecentlyUsedContainer",
+    "HTTPHeaderDict",
+]
 
 
 _Null = object()
 
 
+def _first(positions):
+    return positions[0]
+
+
 class RecentlyUsedContainer(MutableMapping):
     """
     Provides a thread-safe dict-like container which maintains up to
@@ -103,6 +111,126 @@ class RecentlyUsedContainer(MutableMapping):
         with self.lock:
             return list(iterkeys(self._container))
 
+    def values(self):
+        """Return the values without changing their eviction order."""
+        with self.lock:
+            return list(itervalues(self._container))
+
+
+class _ClockEntry(object):
+    __slots__ = ("value", "referenced")
+
+    def __init__(self, value):
+        self.value = value
+        self.referenced = False
+
+
+class ConcurrentRecentlyUsedContainer(RecentlyUsedContainer):
+    """
+    Variant of :class:`RecentlyUsedContainer` for containers that are read
+    by many threads at once, such as the pools of a busy
+    :class:`~urllib3.poolmanager.PoolManager`.
+
+    Lookups take no lock and write nothing shared: they read the dict, which
+    is atomic, and set the entry's reference bit. Eviction approximates LRU
+    with the CLOCK (second chance) algorithm: entries sit in insertion order
+    and, when the container is over ``maxsize``, entries found with their
+    bit set get it cleared and go to the back, and the first one found
+    without it is evicted. Inserts, deletions and eviction still run under
+    :attr:`lock`, and ``dispose_func`` is called for every value that
+    leaves the container, outside the lock, as before.
+    """
+
+    ContainerCls = dict
+
+    def __init__(self, maxsize=10, dispose_func=None):
+        super(ConcurrentRecentlyUsedContainer, self).__init__(maxsize, dispose_func)
+        # (key, entry) pairs in clock order. Pairs whose entry was replaced
+        # or deleted are skipped and pruned lazily.
+        self._clock = deque()
+
+    def __getitem__(self, key):
+        entry = self._container[key]
+        entry.referenced = True
+        return entry.value
+
+    def get(self, key, default=None):
+        entry = self._container.get(key)
+        if entry is None:
+            return default
+        entry.referenced = True
+        return entry.value
+
+    def __contains__(self, key):
+        return key in self._container
+
+    def __setitem__(self, key, value):
+        evicted_values = []
+        with self.lock:
+            old_entry = self._container.get(key)
+            if old_entry is not None:
+                evicted_values.append(old_entry.value)
+            else:
+                # Make room first so the new entry is never the one evicted
+                while self._container and len(self._container) >= self._maxsize:
+                    evicted_values.append(self._evict())
+
+            entry = _ClockEntry(value)
+            self._container[key] = entry
+            self._clock.append((key, entry))
+            while len(self._container) > self._maxsize:
+                evicted_values.append(self._evict())
+            self._prune()
+
+        if self.dispose_func:
+            for evicted_value in evicted_values:
+                self.dispose_func(evicted_value)
+
+    def _evict(self):
+        container = self._container
+        while True:
+            key, entry = self._clock.popleft()
+            if container.get(key) is not entry:
+                continue  # Replaced or deleted since it was queued
+            if entry.referenced:
+                entry.referenced = False
+                self._clock.append((key, entry))
+                continue
+            del container[key]
+            return entry.value
+
+    def _prune(self):
+        if len(self._clock) > 2 * len(self._container) + 16:
+            container = self._container
+            self._clock = deque(
+                (key, entry) for key, entry in self._clock if container.get(key) is entry
+            )
+
+    def __delitem__(self, key):
+        with self.lock:
+            value = self._container.pop(key).value
+            self._prune()
+
+        if self.dispose_func:
+            self.dispose_func(value)
+
+    def __len__(self):
+        return len(self._container)
+
+    def clear(self):
+        with self.lock:
+            values = [entry.value for entry in itervalues(self._container)]
+            self._container.clear()
+            self._clock.clear()
+
+        if self.dispose_func:
+            for value in values:
+                self.dispose_func(value)
+
+    def values(self):
+        with self.lock:
+            return [entry.value for entry in itervalues(self._container)]
+
 
 class HTTPHeaderDict(MutableMapping):
     """
@@ -138,9 +266,17 @@ class HTTPHeaderDict(MutableMapping):
     '7'
     """
 
+    __slots__ = ("_names", "_values", "_index")
+
     def __init__(self, headers=None, **kwargs):
         super(HTTPHeaderDict, self).__init__()
-        self._container = OrderedDict()
+        # One entry per header line in parallel lists. The lowercase index
+        # maps each field name to the position of its only line, or to the
+        # list of positions when it is repeated; it is built on the first
+        # lookup and dropped whenever lines are removed.
+        self._names = []
+        self._values = []
+        self._index = None
         if headers is not None:
             if isinstance(headers, HTTPHeaderDict):
                 self._copy_from(headers)
@@ -149,19 +285,73 @@ class HTTPHeaderDict(MutableMapping):
         if kwargs:
             self.extend(kwargs)
 
+    def _get_index(self):
+        index = self._index
+        if index is None:
+            index = {}
+            for pos, name in enumerate(self._names):
+                lower = name.lower()
+                found = index.get(lower)
+                if found is None:
+                    index[lower] = pos
+                elif type(found) is int:
+                    index[lower] = [found, pos]
+                else:
+                    found.append(pos)
+            self._index = index
+        return index
+
+    def _groups(self):
+        """Positions of the lines of each field, in order of first appearance."""
+        groups = [
+            [found] if type(found) is int else found
+            for found in self._get_index().values()
+        ]
+        groups.sort(key=_first)
+        return groups
+
+    def _remove(self, positions):
+        for pos in sorted(positions, reverse=True):
+            del self._names[pos]
+            del self._values[pos]
+        self._index = None
+
     def __setitem__(self, key, val):
-        self._container[key.lower()] = [key, val]
-        return self._container[key.lower()]
+        index = self._get_index()
+        lower = key.lower()
+        found = index.get(lower)
+        if found is None:
+            index[lower] = len(self._names)
+            self._names.append(key)
+            self._values.append(val)
+            return
+        if type(found) is not int:
+            # Keep the position of the first line and drop the others
+            self._remove(found[1:])
+            found = found[0]
+        self._names[found] = key
+        self._values[found] = val
 
     def __getitem__(self, key):
-        val = self._container[key.lower()]
-        return ", ".join(val[1:])
+        found = self._get_index()[key.lower()]
+        if type(found) is int:
+            return self._values[found]
+        return ", ".join(map(self._values.__getitem__, found))
+
+    def get(self, key, default=None):
+        found = self._get_index().get(key.lower())
+        if found is None:
+            return default
+        if type(found) is int:
+            return self._values[found]
+        return ", ".join(map(self._values.__getitem__, found))
 
     def __delitem__(self, key):
-        del self._container[key.lower()]
+        found = self._get_index()[key.lower()]
+        self._remove([found] if type(found) is int else found)
 
     def __contains__(self, key):
-        return key.lower() in self._container
+        return key.lower() in self._get_index()
 
     def __eq__(self, other):
         if not isinstance(other, Mapping) and not hasattr(other, "keys"):
@@ -182,12 +372,14 @@ class HTTPHeaderDict(MutableMapping):
     __marker = object()
 
     def __len__(self):
-        return len(self._container)
+        return len(self._get_index())
 
     def __iter__(self):
         # Only provide the originally cased names
-        for vals in self._container.values():
-            yield vals[0]
+        names = self._names
+        if len(self._get_index()) == len(names):
+            return iter(list(names))
+        return iter([names[group[0]] for group in self._groups()])
 
     def pop(self, key, default=__marker):
         """D.pop(k[,d]) -> v, remove specified key and return the corresponding value.
@@ -221,12 +413,19 @@ class HTTPHeaderDict(MutableMapping):
         >>> headers['foo']
         'bar, baz'
         """
-        key_lower = key.lower()
-        new_vals = [key, val]
-        # Keep the common case aka no item present as fast as possible
-        vals = self._container.setdefault(key_lower, new_vals)
-        if new_vals is not vals:
-            vals.append(val)
+        pos = len(self._names)
+        self._names.append(key)
+        self._values.append(val)
+        index = self._index
+        if index is not None:
+            lower = key.lower()
+            found = index.get(lower)
+            if found is None:
+                index[lower] = pos
+            elif type(found) is int:
+                index[lower] = [found, pos]
+            else:
+                found.append(pos)
 
     def extend(self, *args, **kwargs):
         """Generic import function for any type of header-like object.
@@ -249,6 +448,12 @@ class HTTPHeaderDict(MutableMapping):
         elif hasattr(other, "keys"):
             for key in other.keys():
                 self.add(key, other[key])
+        elif self._index is None:
+            # Raw header lines, the common case: no lowercasing needed yet
+            names, values = self._names, self._values
+            for key, value in other:
+                names.append(key)
+                values.append(value)
         else:
             for key, value in other:
                 self.add(key, value)
@@ -260,13 +465,15 @@ class HTTPHeaderDict(MutableMapping):
         """Returns a list of all the values for the named field. Returns an
         empty list if the key doesn't exist."""
         try:
-            vals = self._container[key.lower()]
+            found = self._get_index()[key.lower()]
         except KeyError:
             if default is self.__marker:
                 return []
             return default
         else:
-            return vals[1:]
+            if type(found) is int:
+                return [self._values[found]]
+            return list(map(self._values.__getitem__, found))
 
     # Backwards compatibility for httplib
     getheaders = getlist
@@ -280,30 +487,53 @@ class HTTPHeaderDict(MutableMapping):
         return "%s(%s)" % (type(self).__name__, dict(self.itermerged()))
 
     def _copy_from(self, other):
+        if isinstance(other, HTTPHeaderDict):
+            self._names = list(other._names)
+            self._values = list(other._values)
+            index = other._index
+            if index is not None:
+                self._index = dict(
+                    (lower, found if type(found) is int else list(found))
+                    for lower, found in index.items()
+                )
+            return
         for key in other:
-            val = other.getlist(key)
-            if isinstance(val, list):
-                # Don't need to convert tuples
-                val = list(val)
-            self._container[key.lower()] = [key] + val
+            for val in other.getlist(key):
+                self.add(key, val)
 
     def copy(self):
         clone = type(self)()
         clone._copy_from(self)
         return clone
 
+    # __slots__ classes need these to be pickled with protocols 0 and 1
+    def __getstate__(self):
+        return self._names, self._values
+
+    def __setstate__(self, state):
+        self._names, self._values = list(state[0]), list(state[1])
+        self._index = None
+
     def iteritems(self):
         """Iterate over all header lines, including duplicate ones."""
-        for key in self:
-            vals = self._container[key.lower()]
-            for val in vals[1:]:
-                yield vals[0], val
+        names, values = self._names, self._values
+        if len(self._get_index()) == len(names):
+            for item in list(zip(names, values)):
+                yield item
+            return
+        for group in self._groups():
+            name = names[group[0]]
+            for val in list(map(values.__getitem__, group)):
+                yield name, val
 
     def itermerged(self):
         """Iterate over all headers, merging duplicate ones together."""
-        for key in self:
-            val = self._container[key.lower()]
-            yield val[0], ", ".join(val[1:])
+        names, values = self._names, self._values
+        for group in self._groups():
+            if len(group) == 1:
+                yield names[group[0]], values[group[0]]
+            else:
+                yield names[group[0]], ", ".join(map(values.__getitem__, group))
 
     def items(self):
         return list(self.iteritems())
@@ -0,0 +1,1059 @@
+"""
+asyncio counterparts of :class:`~urllib3.connectionpool.HTTPConnectionPool`
+and :class:`~urllib3.poolmanager.PoolManager`.
+
+Connections are built on :func:`asyncio.open_connection` streams, so a single
+event loop can drive thousands of concurrent requests without a thread per
+request. Pools are keyed exactly like the blocking ``PoolManager`` (through
+``key_fn_by_scheme``), and requests follow the same
+:class:`~urllib3.util.retry.Retry` and :class:`~urllib3.util.timeout.Timeout`
+semantics, except that backoff waits with :func:`asyncio.sleep`::
+
+    async with AsyncPoolManager(maxsize=10, block=True) as http:
+        response = await http.request("GET", "http://localhost:8080/")
+        print(response.status, response.data)
+
+This module requires Python 3.7+.
+"""
+from __future__ import absolute_import
+
+import asyncio
+import collections
+import logging
+import socket
+import ssl
+import sys
+
+from ._collections import HTTPHeaderDict, RecentlyUsedContainer
+from ._version import __version__
+from .connectionpool import _normalize_host, port_by_scheme
+from .exceptions import (
+    ClosedPoolError,
+    ConnectTimeoutError,
+    DecodeError,
+    EmptyPoolError,
+    HostChangedError,
+    LocationValueError,
+    MaxRetryError,
+    NewConnectionError,
+    ProtocolError,
+    ReadTimeoutError,
+    SSLError,
+    TimeoutError,
+)
+from .packages import six
+from .packages.six.moves.urllib.parse import urljoin
+from .poolmanager import SSL_KEYWORDS, PoolManager
+from .request import RequestMethods
+from .response import HTTPResponse, _get_decoder
+from .util.request import set_file_position
+from .util.retry import Retry
+from .util.ssl_ import create_urllib3_context, resolve_cert_reqs, resolve_ssl_version
+from .util.timeout import Timeout
+from .util.url import _encode_target, get_host, parse_url
+
+__all__ = [
+    "AsyncHTTPConnection",
+    "AsyncHTTPSConnection",
+    "AsyncHTTPResponse",
+    "AsyncHTTPConnectionPool",
+    "AsyncHTTPSConnectionPool",
+    "AsyncPoolManager",
+]
+
+log = logging.getLogger(__name__)
+
+_Default = object()
+
+# Statuses whose responses never carry a body (RFC 7230, Section 3.3.3)
+_NO_BODY_STATUSES = frozenset([204, 304])
+
+_READ_CHUNK = 64 * 1024
+
+
+def _resolve_timeout(value):
+    """Turn a Timeout attribute into a value usable by asyncio.wait_for."""
+    if value is Timeout.DEFAULT_TIMEOUT:
+        return socket.getdefaulttimeout()
+    return value
+
+
+class _IdleAwareStreamReader(asyncio.StreamReader):
+    """
+    StreamReader that notes data or EOF arriving while its connection sits
+    idle in a pool, when the peer has no business sending anything.
+    """
+
+    idle = False
+    stale = False
+
+    def feed_data(self, data):
+        if self.idle:
+            self.stale = True
+        super(_IdleAwareStreamReader, self).feed_data(data)
+
+    def feed_eof(self):
+        if self.idle:
+            self.stale = True
+        super(_IdleAwareStreamReader, self).feed_eof()
+
+
+class AsyncHTTPConnection(object):
+    """
+    One HTTP/1.1 connection over asyncio streams.
+
+    :param ssl_context:
+        When given, the connection is wrapped in TLS using this context.
+    """
+
+    default_port = port_by_scheme["http"]
+
+    def __init__(
+        self,
+        host,
+        port=None,
+        timeout=Timeout.DEFAULT_TIMEOUT,
+        source_address=None,
+        ssl_context=None,
+        server_hostname=None,
+    ):
+        self.host = host
+        self.port = port or self.default_port
+        self.timeout = timeout
+        self.source_address = source_address
+        self.ssl_context = ssl_context
+        self.server_hostname = server_hostname
+        self.reader = None
+        self.writer = None
+        self.is_verified = False
+
+    async def connect(self):
+        kwargs = {}
+        if self.source_address:
+            kwargs["local_addr"] = self.source_address
+        if self.ssl_context is not None:
+            kwargs["ssl"] = self.ssl_context
+            kwargs["server_hostname"] = self.server_hostname or self.host
+
+        # What asyncio.open_connection does, with a reader that can tell
+        # whether the peer spoke while the connection was idle.
+        loop = asyncio.get_running_loop()
+        reader = _IdleAwareStreamReader()
+        protocol = asyncio.StreamReaderProtocol(reader)
+        try:
+            transport, _ = await asyncio.wait_for(
+                loop.create_connection(
+                    lambda: protocol, self.host, self.port, **kwargs
+                ),
+                _resolve_timeout(self.timeout),
+            )
+        except asyncio.TimeoutError:
+            raise ConnectTimeoutError(
+                self,
+                "Connection to %s timed out. (connect timeout=%s)"
+                % (self.host, self.timeout),
+            )
+        except ssl.SSLError as e:
+            raise SSLError(e)
+        except OSError as e:
+            raise NewConnectionError(
+                self, "Failed to establish a new connection: %s" % e
+            )
+        self.reader = reader
+        self.writer = asyncio.StreamWriter(transport, protocol, reader, loop)
+        self.is_verified = (
+            self.ssl_context is not None
+            and self.ssl_context.verify_mode == ssl.CERT_REQUIRED
+        )
+
+    @property
+    def is_connected(self):
+        return self.writer is not None and not self.writer.is_closing()
+
+    @property
+    def idle(self):
+        """Whether the connection sits unused in a pool."""
+        return self.reader is not None and self.reader.idle
+
+    @idle.setter
+    def idle(self, value):
+        if self.reader is not None:
+            self.reader.idle = value
+            self.reader.stale = False
+
+    def is_dropped(self):
+        """
+        Whether the peer closed the connection (or sent unsolicited data)
+        while it sat idle in the pool. This never blocks: the event loop has
+        already fed any pending data or EOF into the reader.
+        """
+        if not self.is_connected:
+            return True
+        return self.reader.at_eof() or self.reader.stale
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+        self.reader = self.writer = None
+
+    async def send_request(self, method, url, body=None, headers=None):
+        """Write the request line, headers and body."""
+        lines = ["%s %s HTTP/1.1" % (method, url)]
+        lowered = set()
+        for name, value in (headers or {}).items():
+            lowered.add(name.lower())
+            lines.append("%s: %s" % (name, value))
+
+        if "host" not in lowered:
+            host = self.host
+            if ":" in host:
+                host = "[%s]" % host
+            if self.port != self.default_port:
+                host = "%s:%d" % (host, self.port)
+            lines.append("Host: %s" % host)
+        if "user-agent" not in lowered:
+            lines.append("User-Agent: python-urllib3/%s" % __version__)
+
+        if isinstance(body, six.text_type):
+            body = body.encode("utf-8")
+        chunked = False
+        if body is None:
+            if method.upper() in ("POST", "PUT", "PATCH") and (
+                "content-length" not in lowered
+            ):
+                lines.append("Content-Length: 0")
+        elif isinstance(body, (bytes, bytearray, memoryview)):
+            if "content-length" not in lowered:
+                lines.append("Content-Length: %d" % len(body))
+        elif "content-length" not in lowered and "transfer-encoding" not in lowered:
+            chunked = True
+            lines.append("Transfer-Encoding: chunked")
+
+        head = ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+        self.writer.write(head)
+
+        if isinstance(body, (bytes, bytearray, memoryview)):
+            self.writer.write(body)
+        elif body is not None:
+            for chunk in _iter_body(body):
+                if isinstance(chunk, six.text_type):
+                    chunk = chunk.encode("utf-8")
+                if not chunk:
+                    continue
+                if chunked:
+                    self.writer.write(b"%x\r\n" % len(chunk))
+                    self.writer.write(chunk)
+                    self.writer.write(b"\r\n")
+                else:
+                    self.writer.write(chunk)
+                await self.writer.drain()
+            if chunked:
+                self.writer.write(b"0\r\n\r\n")
+        await self.writer.drain()
+
+    async def read_response_head(self):
+        """Return ``(version, status, reason, headers)``, skipping 1xx responses."""
+        while True:
+            line = await self.reader.readline()
+            if not line:
+                raise ProtocolError(
+                    "Connection aborted.",
+                    ConnectionResetError("Remote end closed connection without response"),
+                )
+            try:
+                version, status, reason = (
+                    line.decode("latin-1").rstrip("\r\n").split(" ", 2) + [""]
+                )[:3]
+                status = int(status)
+            except ValueError:
+                raise ProtocolError("Invalid status line: %r" % line)
+            if not version.startswith("HTTP/"):
+                raise ProtocolError("Invalid status line: %r" % line)
+
+            headers = HTTPHeaderDict()
+            while True:
+                line = await self.reader.readline()
+                if line in (b"\r\n", b"\n", b""):
+                    break
+                name, sep, value = line.decode("latin-1").partition(":")
+                if not sep:
+                    raise ProtocolError("Invalid header line: %r" % line)
+                headers.add(name.strip(), value.strip())
+
+            if 100 <= status < 200 and status != 101:
+                continue
+            return version, status, reason, headers
+
+
+def _iter_body(body):
+    """Yield chunks from a file-like object or an iterable body."""
+    read = getattr(body, "read", None)
+    if read is not None:
+        while True:
+            chunk = read(_READ_CHUNK)
+            if not chunk:
+                return
+            yield chunk
+    else:
+        for chunk in body:
+            yield chunk
+
+
+class AsyncHTTPSConnection(AsyncHTTPConnection):
+    default_port = port_by_scheme["https"]
+
+
+class AsyncHTTPResponse(object):
+    """
+    Response of an :class:`AsyncHTTPConnectionPool` request.
+
+    With ``preload_content=True`` (the default) the body is already read
+    and available as :attr:`data`; otherwise read it with
+    ``await response.read()`` and the connection is returned to the pool
+    once the body is exhausted (or on :meth:`release_conn`).
+    """
+
+    REDIRECT_STATUSES = [301, 302, 303, 307, 308]
+
+    def __init__(
+        self,
+        status,
+        reason,
+        version,
+        headers,
+        connection,
+        pool,
+        request_method=None,
+        request_url=None,
+        retries=None,
+        decode_content=True,
+        read_timeout=None,
+    ):
+        self.status = status
+        self.reason = reason
+        self.version = version
+        self.headers = headers
+        self.retries = retries
+        self.decode_content = decode_content
+        self.request_method = request_method
+        self.request_url = request_url
+        self.read_timeout = read_timeout
+        self._connection = connection
+        self._pool = pool
+        self._body = None
+        self._decoder = None
+        self._fp_bytes_read = 0
+
+        # Same rules as HTTPResponse, so "br" is only decoded with brotli
+        decoders = HTTPResponse.CONTENT_DECODERS
+        content_encoding = self.headers.get("content-encoding", "").lower()
+        if content_encoding in decoders:
+            self._decoder = _get_decoder(content_encoding)
+        elif "," in content_encoding and any(
+            e.strip() in decoders for e in content_encoding.split(",")
+        ):
+            self._decoder = _get_decoder(content_encoding)
+
+        self.will_close = (
+            headers.get("connection", "").lower() == "close" or version == "HTTP/1.0"
+        )
+        self._length = None
+        self._chunked = False
+        self._chunk_left = None
+        if (
+            (request_method or "").upper() == "HEAD"
+            or status in _NO_BODY_STATUSES
+            or 100 <= status < 200
+        ):
+            self._length = 0
+        elif "chunked" in headers.get("transfer-encoding", "").lower():
+            self._chunked = True
+        elif headers.get("content-length") is not None:
+            try:
+                lengths = set(int(v) for v in headers.getlist("content-length"))
+            except ValueError:
+                lengths = set()
+            if len(lengths) != 1 or min(lengths) < 0:
+                raise ProtocolError("Invalid Content-Length header")
+            self._length = lengths.pop()
+        else:
+            # Body is delimited by the server closing the connection
+            self.will_close = True
+        self._done = self._length == 0
+        if self._done:
+            self.release_conn()
+
+    @property
+    def data(self):
+        return self._body
+
+    def getheaders(self):
+        return self.headers
+
+    def getheader(self, name, default=None):
+        return self.headers.get(name, default)
+
+    def get_redirect_location(self):
+        """
+        Should we redirect and where to?
+
+        :returns: Truthy redirect location string if we got a redirect status
+            code and valid location. ``None`` if redirect status and no
+            location. ``False`` if not a redirect status code.
+        """
+        if self.status in self.REDIRECT_STATUSES:
+            return self.headers.get("location")
+        return False
+
+    async def _read_raw(self, amt):
+        reader = self._connection.reader
+        if self._chunked:
+            if self._chunk_left is None:
+                line = await reader.readline()
+                try:
+                    self._chunk_left = int(line.split(b";", 1)[0], 16)
+                except ValueError:
+                    raise ProtocolError("Invalid chunk header: %r" % line)
+                if self._chunk_left == 0:
+                    # Trailers end with an empty line
+                    while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                        pass
+                    self._done = True
+                    return b""
+            data = await reader.readexactly(min(amt, self._chunk_left))
+            self._chunk_left -= len(data)
+            if self._chunk_left == 0:
+                await reader.readexactly(2)
+                self._chunk_left = None
+            return data
+        if self._length is not None:
+            remaining = self._length - self._fp_bytes_read
+            data = await reader.readexactly(min(amt, remaining))
+            if self._fp_bytes_read + len(data) >= self._length:
+                self._done = True
+            return data
+        data = await reader.read(amt)
+        if not data:
+            self._done = True
+        return data
+
+    async def read(self, amt=None, decode_content=None):
+        """
+        Read up to ``amt`` bytes (or the whole remaining body) from the
+        connection, decoding gzip/deflate content unless disabled.
+        """
+        if decode_content is None:
+            decode_content = self.decode_content
+        if self._done or self._connection is None:
+            return b""
+
+        timeout = self.read_timeout
+        parts = []
+        remaining = amt
+        try:
+            while not self._done and (remaining is None or remaining > 0):
+                size = _READ_CHUNK if remaining is None else min(remaining, _READ_CHUNK)
+                data = await asyncio.wait_for(self._read_raw(size), timeout)
+                self._fp_bytes_read += len(data)
+                if remaining is not None:
+                    remaining -= len(data)
+                if data:
+                    parts.append(data)
+        except asyncio.TimeoutError:
+            self._discard_conn()
+            raise ReadTimeoutError(
+                self._pool, self.request_url, "Read timed out. (read timeout=%s)" % timeout
+            )
+        except (asyncio.IncompleteReadError, OSError) as e:
+            self._discard_conn()
+            raise ProtocolError("Connection broken: %r" % e, e)
+
+        data = b"".join(parts)
+        if decode_content and self._decoder is not None:
+            try:
+                data = self._decoder.decompress(data)
+                if self._done:
+                    data += self._decoder.flush()
+            except Exception as e:
+                raise DecodeError(
+                    "Received response with content-encoding: %s, but "
+                    "failed to decode it." % self.headers.get("content-encoding"),
+                    e,
+                )
+        if self._done:
+            self.release_conn()
+        return data
+
+    async def _preload(self):
+        self._body = await self.read()
+
+    async def drain_conn(self):
+        """Read and discard any remaining body so the connection can be reused."""
+        try:
+            await self.read(decode_content=False)
+        except (ProtocolError, ReadTimeoutError):
+            pass
+
+    def _discard_conn(self):
+        if self._connection is not None:
+            self._connection.close()
+            self._pool._put_conn(None)
+            self._connection = None
+
+    def release_conn(self):
+        """Return the connection to the pool (closing it if unread data remains)."""
+        if self._connection is None:
+            return
+        if not self._done or self.will_close:
+            self._discard_conn()
+            return
+        self._pool._put_conn(self._connection)
+        self._connection = None
+
+    def close(self):
+        self._discard_conn()
+
+
+class AsyncHTTPConnectionPool(RequestMethods):
+    """
+    asyncio connection pool for one host.
+
+    Accepts the same ``timeout``, ``maxsize``, ``block``, ``headers`` and
+    ``retries`` arguments as :class:`~urllib3.connectionpool.HTTPConnectionPool`.
+    With ``block=True`` no more than ``maxsize`` connections are open at a
+    time and further requests wait (up to ``pool_timeout``) for one to be
+    released; otherwise extra connections are created but only ``maxsize``
+    are kept for reuse.
+
+    Pools are bound to the event loop that first uses them.
+    """
+
+    scheme = "http"
+    ConnectionCls = AsyncHTTPConnection
+    ResponseCls = AsyncHTTPResponse
+
+    def __init__(
+        self,
+        host,
+        port=None,
+        timeout=Timeout.DEFAULT_TIMEOUT,
+        maxsize=1,
+        block=False,
+        headers=None,
+        retries=None,
+        **conn_kw
+    ):
+        if not host:
+            raise LocationValueError("No host specified.")
+        RequestMethods.__init__(self, headers)
+
+        self.host = _normalize_host(host, scheme=self.scheme)
+        self.port = port
+
+        if not isinstance(timeout, Timeout):
+            timeout = Timeout.from_float(timeout)
+        if retries is None:
+            retries = Retry.DEFAULT
+
+        self.timeout = timeout
+        self.retries = retries
+        self.maxsize = maxsize
+        self.block = block
+
+        self.pool = collections.deque()
+        # Created on first use so the pool binds to the loop that runs it
+        self._slots = None
+        self._closed = False
+
+        self.num_connections = 0
+        self.num_requests = 0
+        self.conn_kw = conn_kw
+        # Only a few of the blocking connection's keyword arguments apply here.
+        self.conn_kw.pop("strict", None)
+        self.conn_kw.pop("socket_options", None)
+
+    def __str__(self):
+        return "%s(host=%r, port=%r)" % (type(self).__name__, self.host, self.port)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+        return False
+
+    def _new_conn(self):
+        self.num_connections += 1
+        log.debug(
+            "Starting new asyncio HTTP connection (%d): %s:%s",
+            self.num_connections,
+            self.host,
+            self.port or "80",
+        )
+        return self.ConnectionCls(
+            host=self.host,
+            port=self.port,
+            timeout=self.timeout.connect_timeout,
+            **self.conn_kw
+        )
+
+    async def _get_conn(self, timeout=None):
+        """
+        Get a connection, reusing an idle one when available. With
+        ``block=True`` this waits up to ``timeout`` seconds for a free slot.
+        """
+        if self._closed:
+            raise ClosedPoolError(self, "Pool is closed.")
+
+        if self.block:
+            if self._slots is None:
+                self._slots = asyncio.Semaphore(self.maxsize)
+            try:
+                await asyncio.wait_for(self._slots.acquire(), timeout)
+            except asyncio.TimeoutError:
+                raise EmptyPoolError(
+                    self,
+                    "Pool reached maximum size and no more connections are allowed.",
+                )
+
+        while self.pool:
+            conn = self.pool.pop()
+            if not conn.is_dropped():
+                conn.idle = False
+                return conn
+            log.debug("Resetting dropped connection: %s", self.host)
+            conn.close()
+        return self._new_conn()
+
+    def _put_conn(self, conn):
+        """
+        Return a connection (or ``None`` for a discarded one) to the pool,
+        freeing its slot.
+        """
+        if self._slots is not None:
+            self._slots.release()
+        if conn is None:
+            return
+        if self._closed or not conn.is_connected:
+            conn.close()
+            return
+        if len(self.pool) >= self.maxsize:
+            log.warning(
+                "Connection pool is full, discarding connection: %s. Connection pool size: %s",
+                self.host,
+                len(self.pool),
+            )
+            conn.close()
+            return
+        conn.idle = True
+        self.pool.append(conn)
+
+    def _get_timeout(self, timeout):
+        if timeout is _Default:
+            return self.timeout.clone()
+        if isinstance(timeout, Timeout):
+            return timeout.clone()
+        return Timeout.from_float(timeout)
+
+    def close(self):
+        """Close all idle connections and disable the pool."""
+        self._closed = True
+        while self.pool:
+            self.pool.pop().close()
+
+    def is_same_host(self, url):
+        """
+        Check if the given ``url`` is a member of the same host as this
+        connection pool.
+        """
+        if url.startswith("/"):
+            return True
+
+        scheme, host, port = get_host(url)
+        if host is not None:
+            host = _normalize_host(host, scheme=scheme)
+
+        if self.port and not port:
+            port = port_by_scheme.get(scheme)
+        elif not self.port and port == port_by_scheme.get(scheme):
+            port = None
+
+        return (scheme, host, port) == (self.scheme, self.host, self.port)
+
+    async def _make_request(self, conn, method, url, timeout_obj, body, headers):
+        self.num_requests += 1
+        # Starts the clock of a total timeout, spanning connect and read
+        timeout_obj.start_connect()
+        if not conn.is_connected:
+            conn.timeout = timeout_obj.connect_timeout
+            await conn.connect()
+
+        # Like a blocking socket, sending is bounded by the connect timeout,
+        # or by what is left of a total timeout.
+        if timeout_obj.total is None:
+            send_timeout = _resolve_timeout(timeout_obj.connect_timeout)
+        else:
+            send_timeout = _resolve_timeout(timeout_obj.read_timeout)
+        try:
+            await asyncio.wait_for(
+                conn.send_request(method, url, body=body, headers=headers),
+                send_timeout,
+            )
+        except asyncio.TimeoutError:
+            raise ReadTimeoutError(
+                self, url, "Send timed out. (send timeout=%s)" % send_timeout
+            )
+        except (BrokenPipeError, ConnectionResetError):
+            # The server may legitimately close after sending a response.
+            pass
+
+        # What is left of a total timeout after connecting and sending
+        read_timeout = _resolve_timeout(timeout_obj.read_timeout)
+        try:
+            head = await asyncio.wait_for(conn.read_response_head(), read_timeout)
+        except asyncio.TimeoutError:
+            raise ReadTimeoutError(
+                self, url, "Read timed out. (read timeout=%s)" % read_timeout
+            )
+        log.debug(
+            '%s://%s:%s "%s %s %s" %s',
+            self.scheme,
+            self.host,
+            self.port,
+            method,
+            url,
+            head[0],
+            head[1],
+        )
+        return head, read_timeout
+
+    async def urlopen(
+        self,
+        method,
+        url,
+        body=None,
+        headers=None,
+        retries=None,
+        redirect=True,
+        assert_same_host=True,
+        timeout=_Default,
+        pool_timeout=None,
+        release_conn=None,
+        body_pos=None,
+        preload_content=True,
+        decode_content=True,
+        **response_kw
+    ):
+        """
+        Coroutine version of :meth:`urllib3.HTTPConnectionPool.urlopen`.
+
+        Retries, redirects, timeouts and ``pool_timeout`` behave the same;
+        waits between retries use :func:`asyncio.sleep` instead of
+        blocking. Returns an :class:`AsyncHTTPResponse`.
+
+        With ``preload_content=False`` the connection stays checked out
+        until the body has been read or :meth:`AsyncHTTPResponse.release_conn`
+        is called; ``release_conn`` is accepted for compatibility only.
+        """
+        if headers is None:
+            headers = self.headers
+
+        if not isinstance(retries, Retry):
+            retries = Retry.from_int(retries, redirect=redirect, default=self.retries)
+
+        while True:
+            if assert_same_host and not self.is_same_host(url):
+                raise HostChangedError(self, url, retries)
+
+            # Ensure that the URL we're connecting to is properly encoded
+            if url.startswith("/"):
+                url = six.ensure_str(_encode_target(url))
+            else:
+                url = six.ensure_str(parse_url(url).url)
+
+            body_pos = set_file_position(body, body_pos)
+            timeout_obj = self._get_timeout(timeout)
+            conn = await self._get_conn(timeout=pool_timeout)
+            response = None
+            try:
+                (version, status, reason, response_headers), read_timeout = (
+                    await self._make_request(
+                        conn, method, url, timeout_obj, body, headers
+                    )
+                )
+                # From here on the response owns (and releases) the connection
+                response = self.ResponseCls(
+                    status,
+                    reason,
+                    version,
+                    response_headers,
+                    connection=conn,
+                    pool=self,
+                    request_method=method,
+                    request_url=url,
+                    retries=retries,
+                    decode_content=decode_content,
+                    read_timeout=read_timeout,
+                )
+                if preload_content:
+                    await response._preload()
+            except (
+                TimeoutError,
+                ProtocolError,
+                SSLError,
+                OSError,
+                asyncio.IncompleteReadError,
+            ) as e:
+                self._discard(conn, response)
+                if isinstance(e, ssl.SSLError):
+                    e = SSLError(e)
+                elif isinstance(e, (OSError, asyncio.IncompleteReadError)):
+                    e = ProtocolError("Connection aborted.", e)
+
+                retries = retries.increment(
+                    method, url, error=e, _pool=self, _stacktrace=sys.exc_info()[2]
+                )
+                await asyncio.sleep(retries.get_backoff_time())
+                log.warning(
+                    "Retrying (%r) after connection broken by '%r': %s", retries, e, url
+                )
+                continue
+            except BaseException:
+                # Including cancellation: never leak the connection's slot
+                self._discard(conn, response)
+                raise
+
+            redirect_location = redirect and response.get_redirect_location()
+            if redirect_location:
+                if response.status == 303:
+                    method = "GET"
+                try:
+                    retries = retries.increment(
+                        method, url, response=response, _pool=self
+                    )
+                except MaxRetryError:
+                    if retries.raise_on_redirect:
+                        await response.drain_conn()
+                        raise
+                    return response
+
+                await response.drain_conn()
+                await asyncio.sleep(_retry_delay(retries, response))
+                log.debug("Redirecting %s -> %s", url, redirect_location)
+                url = redirect_location
+                continue
+
+            has_retry_after = bool(response.headers.get("Retry-After"))
+            if retries.is_retry(method, response.status, has_retry_after):
+                try:
+                    retries = retries.increment(
+                        method, url, response=response, _pool=self
+                    )
+                except MaxRetryError:
+                    if retries.raise_on_status:
+                        await response.drain_conn()
+                        raise
+                    return response
+
+                await response.drain_conn()
+                await asyncio.sleep(_retry_delay(retries, response))
+                log.debug("Retry: %s", url)
+                continue
+
+            return response
+
+    def _discard(self, conn, response):
+        """Close a connection after a failed request and free its slot."""
+        if response is not None:
+            response.close()
+        else:
+            conn.close()
+            self._put_conn(None)
+
+
+def _retry_delay(retries, response):
+    """How long to wait before the next attempt, honouring Retry-After."""
+    if retries.respect_retry_after_header and response is not None:
+        retry_after = retries.get_retry_after(response)
+        if retry_after:
+            return retry_after
+    return retries.get_backoff_time()
+
+
+class AsyncHTTPSConnectionPool(AsyncHTTPConnectionPool):
+    """
+    Same as :class:`AsyncHTTPConnectionPool`, but HTTPS.
+
+    Certificate options mirror :class:`~urllib3.connectionpool.HTTPSConnectionPool`;
+    one :class:`ssl.SSLContext` is built per pool and shared by its
+    connections.
+    """
+
+    scheme = "https"
+    ConnectionCls = AsyncHTTPSConnection
+
+    def __init__(
+        self,
+        host,
+        port=None,
+        timeout=Timeout.DEFAULT_TIMEOUT,
+        maxsize=1,
+        block=False,
+        headers=None,
+        retries=None,
+        key_file=None,
+        cert_file=None,
+        cert_reqs=None,
+        key_password=None,
+        ca_certs=None,
+        ssl_version=None,
+        assert_hostname=None,
+        ca_cert_dir=None,
+        ssl_context=None,
+        server_hostname=None,
+        **conn_kw
+    ):
+        AsyncHTTPConnectionPool.__init__(
+            self, host, port, timeout, maxsize, block, headers, retries, **conn_kw
+        )
+        if ssl_context is None:
+            ssl_context = create_urllib3_context(
+                ssl_version=resolve_ssl_version(ssl_version),
+                cert_reqs=resolve_cert_reqs(cert_reqs),
+            )
+            if ssl_context.verify_mode != ssl.CERT_NONE:
+                if ca_certs or ca_cert_dir:
+                    ssl_context.load_verify_locations(ca_certs, ca_cert_dir)
+                else:
+                    ssl_context.load_default_certs()
+                ssl_context.check_hostname = assert_hostname is not False
+            if cert_file:
+                ssl_context.load_cert_chain(cert_file, key_file, key_password)
+        self.ssl_context = ssl_context
+        self.conn_kw["ssl_context"] = ssl_context
+        self.conn_kw["server_hostname"] = server_hostname or (
+            assert_hostname if isinstance(assert_hostname, str) else None
+        )
+
+
+#: Keyword arguments of :class:`AsyncPoolManager` passed on to its pools.
+#: Options of the blocking pools not listed here have no asyncio equivalent
+#: and are left out.
+ASYNC_POOL_KEYWORDS = frozenset(
+    [
+        "timeout",
+        "maxsize",
+        "block",
+        "headers",
+        "retries",
+        "source_address",
+        "assert_hostname",
+    ]
+    + list(SSL_KEYWORDS)
+)
+
+async_pool_classes_by_scheme = {
+    "http": AsyncHTTPConnectionPool,
+    "https": AsyncHTTPSConnectionPool,
+}
+
+
+class AsyncPoolManager(PoolManager):
+    """
+    asyncio version of :class:`~urllib3.poolmanager.PoolManager`.
+
+    Pools are created and keyed exactly as in the blocking manager, so the
+    same ``connection_pool_kw`` (``maxsize``, ``block``, ``retries``,
+    ``timeout``, TLS options, ...) apply per host. :meth:`urlopen` and the
+    :class:`~urllib3.request.RequestMethods` helpers (``request``,
+    ``request_encode_body``, ...) return coroutines.
+
+    ``retry_budget``, ``circuit_breaker``, ``single_flight`` and ``cache``
+    are only supported by the blocking manager and raise :exc:`TypeError`.
+    """
+
+    def __init__(self, num_pools=10, headers=None, **connection_pool_kw):
+        unsupported = [
+            kw
+            for kw in ("retry_budget", "circuit_breaker", "single_flight", "cache")
+            if connection_pool_kw.get(kw) is not None
+        ]
+        if unsupported:
+            raise TypeError(
+                "AsyncPoolManager does not support %s" % ", ".join(unsupported)
+            )
+        super(AsyncPoolManager, self).__init__(num_pools, headers, **connection_pool_kw)
+        self.pools = RecentlyUsedContainer(num_pools, dispose_func=lambda p: p.close())
+        self.pool_classes_by_scheme = async_pool_classes_by_scheme
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        self.clear()
+        return False
+
+    def _new_pool(self, scheme, host, port, request_context=None):
+        pool_cls = self.pool_classes_by_scheme[scheme]
+        if request_context is None:
+            request_context = self.connection_pool_kw.copy()
+        allowed = ASYNC_POOL_KEYWORDS
+        if scheme == "http":
+            allowed = allowed - frozenset(SSL_KEYWORDS) - {"assert_hostname"}
+        kwargs = dict(
+            (kw, value) for kw, value in request_context.items() if kw in allowed
+        )
+        return pool_cls(host, port, **kwargs)
+
+    async def urlopen(self, method, url, redirect=True, **kw):
+        """
+        Same as :meth:`AsyncHTTPConnectionPool.urlopen` with cross-host
+        redirect handling; ``url`` must be absolute.
+        """
+        u = parse_url(url)
+        conn = self.connection_from_host(u.host, port=u.port, scheme=u.scheme)
+
+        kw["assert_same_host"] = False
+        kw["redirect"] = False
+
+        if "headers" not in kw:
+            kw["headers"] = self.headers.copy()
+
+        response = await conn.urlopen(method, u.request_uri, **kw)
+
+        redirect_location = redirect and response.get_redirect_location()
+        if not redirect_location:
+            return response
+
+        redirect_location = urljoin(url, redirect_location)
+
+        if response.status == 303:
+            method = "GET"
+
+        retries = kw.get("retries")
+        if not isinstance(retries, Retry):
+            retries = Retry.from_int(retries, redirect=redirect)
+
+        if retries.remove_headers_on_redirect and not conn.is_same_host(
+            redirect_location
+        ):
+            headers = list(six.iterkeys(kw["headers"]))
+            for header in headers:
+                if header.lower() in retries.remove_headers_on_redirect:
+                    kw["headers"].pop(header, None)
+
+        try:
+            retries = retries.increment(method, url, response=response, _pool=conn)
+        except MaxRetryError:
+            if retries.raise_on_redirect:
+                await response.drain_conn()
+                raise
+            return response
+
+        kw["retries"] = retries
+        kw["redirect"] = redirect
+
+        log.info("Redirecting %s -> %s", url, redirect_location)
+
+        await response.drain_conn()
+        return await self.urlopen(method, redirect_location, **kw)
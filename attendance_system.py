@@ -1,24 +1,66 @@
 import sys
-import cv2
-import numpy as np
 import os
 from datetime import datetime
-import pandas as pd
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
                            QHBoxLayout, QPushButton, QLabel, QFileDialog, 
-                           QMessageBox, QTableWidget, QTableWidgetItem, QInputDialog)
-from PyQt5.QtCore import Qt, QTimer
-from PyQt5.QtGui import QImage, QPixmap
+                           QMessageBox, QTableWidget, QTableWidgetItem, QInputDialog,
+                           QProgressBar, QShortcut)
+from PyQt5.QtCore import Qt, QTimer, QThread, pyqtSignal
+from PyQt5.QtGui import QImage, QPixmap, QKeySequence
+
+from latency import StageTimer
+
+# cv2, numpy, pandas and face_recognition (dlib) are imported where they are
+# first needed so the window can appear before they have loaded.
+
+
+class EncodingLoader(QThread):
+    """Load stored face encodings from the database off the GUI thread"""
+    progress = pyqtSignal(int, int)
+    loaded = pyqtSignal(list, object)
+    failed = pyqtSignal(str)
+
+    def __init__(self, db_file, parent=None):
+        super().__init__(parent)
+        self.db_file = db_file
+
+    def run(self):
+        try:
+            import numpy as np
+            from database import Database
+
+            rows = Database(self.db_file).get_face_encodings()
+            total = len(rows)
+            self.progress.emit(0, total)
+            students = []
+            encodings = np.empty((total, 128), dtype=np.float64)
+            for i, (student_id, name, encoding) in enumerate(rows):
+                students.append((student_id, name))
+                encodings[i] = np.frombuffer(encoding, dtype=np.float64)
+                if (i + 1) % 100 == 0:
+                    self.progress.emit(i + 1, total)
+            self.progress.emit(total, total)
+            self.loaded.emit(students, encodings)
+        except Exception as e:
+            self.failed.emit(str(e))
+
 
 class AttendanceSystem(QMainWindow):
-    def __init__(self):
+    def __init__(self, db_file="attendance.db"):
         super().__init__()
         self.setWindowTitle("Student Attendance System")
         self.setGeometry(100, 100, 1200, 800)
         
         # Initialize variables
+        self.db_file = db_file
         self.attendance_data = []
+        self.known_students = []
+        self.known_encodings = None
+        self.face_recognition = None
         self.camera = None
+        
+        # Per-stage latency; enable with ATTENDANCE_LATENCY=1 or F12
+        self.latency = StageTimer(enabled=os.environ.get("ATTENDANCE_LATENCY") == "1")
         self.timer = QTimer()
         self.timer.timeout.connect(self.update_frame)
         
@@ -37,6 +79,18 @@ class AttendanceSystem(QMainWindow):
         self.camera_label.setAlignment(Qt.AlignCenter)
         left_layout.addWidget(self.camera_label)
         
+        # Latency overlay drawn on top of the camera view
+        self.latency_overlay = QLabel(self.camera_label)
+        self.latency_overlay.setStyleSheet(
+            "background-color: rgba(0, 0, 0, 160); color: #00FF00; "
+            "font-family: monospace; padding: 4px;")
+        self.latency_overlay.move(8, 8)
+        self.latency_overlay.hide()
+        self.overlay_timer = QTimer()
+        self.overlay_timer.timeout.connect(self.update_latency_overlay)
+        QShortcut(QKeySequence("F12"), self, self.toggle_latency_overlay)
+        QShortcut(QKeySequence("Ctrl+Shift+L"), self, self.dump_latency)
+        
         # Control buttons
         button_layout = QHBoxLayout()
         self.start_button = QPushButton("Start Camera")
@@ -70,8 +124,52 @@ class AttendanceSystem(QMainWindow):
         # Add panels to main layout
         layout.addWidget(left_panel)
         layout.addWidget(right_panel)
+        
+        # Progress indicator for background loading
+        self.loading_progress = QProgressBar()
+        self.loading_progress.setMaximumWidth(200)
+        self.loading_progress.setFormat("Loading faces %v/%m")
+        self.loading_progress.hide()
+        self.statusBar().addPermanentWidget(self.loading_progress)
+        
+        # Start loading face encodings once the window is on screen
+        self.encoding_loader = None
+        QTimer.singleShot(0, self.load_face_encodings)
+    
+    def load_face_encodings(self):
+        self.statusBar().showMessage("Loading face data...")
+        self.loading_progress.show()
+        self.encoding_loader = EncodingLoader(self.db_file, self)
+        self.encoding_loader.progress.connect(self.on_encoding_progress)
+        self.encoding_loader.loaded.connect(self.on_encodings_loaded)
+        self.encoding_loader.failed.connect(self.on_encodings_failed)
+        self.encoding_loader.start()
+    
+    def on_encoding_progress(self, done, total):
+        self.loading_progress.setMaximum(max(total, 1))
+        self.loading_progress.setValue(done)
+    
+    def on_encodings_loaded(self, students, encodings):
+        self.known_students = students
+        self.known_encodings = encodings
+        self.loading_progress.hide()
+        self.statusBar().showMessage(f"Loaded {len(students)} face encodings", 5000)
+    
+    def on_encodings_failed(self, message):
+        self.loading_progress.hide()
+        self.statusBar().showMessage(f"Could not load face data: {message}", 10000)
     
     def start_camera(self):
+        import cv2
+        
+        # face_recognition pulls in dlib; it is optional for the camera view
+        if self.face_recognition is None:
+            try:
+                import face_recognition
+                self.face_recognition = face_recognition
+            except ImportError:
+                pass
+        
         # Try different camera indices
         for camera_index in [0, 1]:
             self.camera = cv2.VideoCapture(camera_index, cv2.CAP_DSHOW)  # Add CAP_DSHOW for Windows
@@ -98,21 +196,27 @@ class AttendanceSystem(QMainWindow):
         self.stop_button.setEnabled(False)
     
     def update_frame(self):
+        import cv2
+        
         if self.camera is None or not self.camera.isOpened():
             self.stop_camera()
             return
             
         try:
+            frame_start = t = self.latency.start()
             ret, frame = self.camera.read()
+            t = self.latency.lap("capture", t)
             if ret:
                 # Convert frame to RGB for display
                 rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+                self.latency.lap("convert", t)
                 
                 # Convert frame to QImage and display
                 height, width, channel = rgb_frame.shape
                 bytes_per_line = 3 * width
                 q_image = QImage(rgb_frame.data, width, height, bytes_per_line, QImage.Format_RGB888)
                 self.camera_label.setPixmap(QPixmap.fromImage(q_image))
+                self.latency.lap("total", frame_start)
             else:
                 self.stop_camera()
                 QMessageBox.critical(self, "Error", "Failed to grab frame from camera!")
@@ -120,6 +224,26 @@ class AttendanceSystem(QMainWindow):
             self.stop_camera()
             QMessageBox.critical(self, "Error", f"Camera error: {str(e)}")
     
+    def toggle_latency_overlay(self):
+        if self.latency_overlay.isVisible():
+            self.overlay_timer.stop()
+            self.latency_overlay.hide()
+            self.latency.enabled = os.environ.get("ATTENDANCE_LATENCY") == "1"
+        else:
+            self.latency.enabled = True
+            self.update_latency_overlay()
+            self.latency_overlay.show()
+            self.overlay_timer.start(500)
+    
+    def update_latency_overlay(self):
+        self.latency_overlay.setText(self.latency.format_overlay())
+        self.latency_overlay.adjustSize()
+    
+    def dump_latency(self):
+        file_name = datetime.now().strftime("latency-%Y%m%d-%H%M%S.json")
+        self.latency.dump_json(file_name)
+        self.statusBar().showMessage(f"Latency statistics written to {file_name}", 5000)
+    
     def mark_attendance(self):
         name, ok = QInputDialog.getText(self, "Mark Attendance", "Enter student name:")
         if ok and name:
@@ -127,6 +251,9 @@ class AttendanceSystem(QMainWindow):
             date = now.strftime("%Y-%m-%d")
             time = now.strftime("%H:%M:%S")
             
+            # Timed from the duplicate check to the stored entry
+            t = self.latency.start()
+            
             # Check if attendance already marked for today
             for entry in self.attendance_data:
                 if entry["name"] == name and entry["date"] == date:
@@ -139,9 +266,11 @@ class AttendanceSystem(QMainWindow):
                 "time": time,
                 "date": date
             })
+            t = self.latency.lap("mark_attendance", t)
             
             # Update table
             self.update_attendance_table()
+            self.latency.lap("table_update", t)
             
             QMessageBox.information(self, "Success", f"Attendance marked for {name}!")
     
@@ -162,9 +291,16 @@ class AttendanceSystem(QMainWindow):
         )
         
         if file_name:
+            import pandas as pd
             df = pd.DataFrame(self.attendance_data)
             df.to_csv(file_name, index=False)
             QMessageBox.information(self, "Success", "Attendance data exported successfully!")
+    
+    def closeEvent(self, event):
+        self.stop_camera()
+        if self.encoding_loader is not None:
+            self.encoding_loader.wait()
+        super().closeEvent(event)
 
 if __name__ == "__main__":
     app = QApplication(sys.argv)
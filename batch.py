@@ -0,0 +1,148 @@
+from __future__ import absolute_import
+
+import collections
+import threading
+
+from .exceptions import TimeoutError
+from .packages.six.moves import queue
+from .util.timeout import Timeout, current_time
+
+__all__ = ["BatchResult", "BatchTimeoutError", "run_batch"]
+
+
+class BatchTimeoutError(TimeoutError):
+    """Raised (as a result's ``error``) for requests that did not finish
+    before the timeout of their batch."""
+
+    pass
+
+
+class BatchResult(
+    collections.namedtuple(
+        "BatchResult", ["index", "method", "url", "response", "error"]
+    )
+):
+    """
+    Outcome of one request of a batch: ``index`` is its position in the
+    batch, and exactly one of ``response`` and ``error`` is set.
+    """
+
+    __slots__ = ()
+
+    @property
+    def ok(self):
+        return self.error is None
+
+
+def _limit_timeout(timeout, remaining):
+    """Return ``timeout`` with its total capped at ``remaining`` seconds."""
+    if isinstance(timeout, Timeout):
+        total = timeout.total
+        if total is None or total > remaining:
+            total = remaining
+        return Timeout(connect=timeout._connect, read=timeout._read, total=total)
+    if timeout is Timeout.DEFAULT_TIMEOUT or timeout is None:
+        return Timeout(total=remaining)
+    return Timeout(connect=timeout, read=timeout, total=min(timeout, remaining))
+
+
+def run_batch(manager, requests, timeout=None, max_workers=None, **request_kw):
+    """
+    Send ``requests`` through ``manager`` from a set of worker threads and
+    return an iterator over their :class:`BatchResult` in order of
+    completion. See :meth:`urllib3.PoolManager.request_batch`.
+    """
+    deadline = None if timeout is None else current_time() + timeout
+
+    # One queue of work per connection pool, served by at most maxsize
+    # threads so that every thread keeps reusing one pooled connection.
+    groups = collections.OrderedDict()
+    entries = []
+    done = queue.Queue()
+    for index, request in enumerate(requests):
+        if len(request) == 2:
+            method, url = request
+            kw = request_kw
+        else:
+            method, url, kw = request
+            kw = dict(request_kw, **kw)
+        entries.append((method, url))
+        try:
+            pool = manager.connection_from_url(url)
+        except Exception as e:
+            # A URL that can't be pooled fails alone, not the whole batch
+            done.put(BatchResult(index, method, url, None, e))
+            continue
+        group = groups.get(pool)
+        if group is None:
+            group = groups[pool] = collections.deque()
+        group.append((index, method, url, kw))
+
+    total = len(entries)
+    workers = []
+    for pool, group in groups.items():
+        maxsize = getattr(pool.pool, "maxsize", 0) or 1
+        workers.append([group, min(maxsize, len(group))])
+    if max_workers is not None:
+        # Trim the largest groups first, never below one thread per group
+        while sum(count for _, count in workers) > max(max_workers, len(workers)):
+            busiest = max(workers, key=lambda worker: worker[1])
+            busiest[1] -= 1
+
+    def work(group):
+        while True:
+            try:
+                index, method, url, kw = group.popleft()
+            except IndexError:
+                return
+            if deadline is not None:
+                remaining = deadline - current_time()
+                if remaining <= 0:
+                    done.put(
+                        BatchResult(
+                            index, method, url, None, BatchTimeoutError("Batch timed out")
+                        )
+                    )
+                    continue
+                kw = dict(kw)
+                kw["timeout"] = _limit_timeout(
+                    kw.get("timeout", Timeout.DEFAULT_TIMEOUT), remaining
+                )
+                kw.setdefault("pool_timeout", remaining)
+            try:
+                response = manager.request(method, url, **kw)
+            except Exception as e:
+                done.put(BatchResult(index, method, url, None, e))
+            else:
+                done.put(BatchResult(index, method, url, response, None))
+
+    for group, count in workers:
+        for _ in range(count):
+            thread = threading.Thread(target=work, args=(group,))
+            thread.daemon = True
+            thread.start()
+
+    def results():
+        pending = set(range(total))
+        while pending:
+            try:
+                if deadline is None:
+                    result = done.get()
+                else:
+                    result = done.get(timeout=max(deadline - current_time(), 0))
+            except queue.Empty:
+                break
+            pending.discard(result.index)
+            yield result
+
+        # The batch timed out. Requests that have not started are dropped;
+        # those still running finish on their own, unreported.
+        for group in groups.values():
+            group.clear()
+        for index in sorted(pending):
+            method, url = entries[index]
+            yield BatchResult(
+                index, method, url, None, BatchTimeoutError("Batch timed out")
+            )
+
+    return results()
@@ -0,0 +1,94 @@
+"""
+Microbenchmarks for HTTPHeaderDict.
+
+Times the operations every request and response goes through: building
+the dict from raw header lines, case-insensitive lookups, ``getlist`` and
+``copy``. Run it once per tree to compare implementations:
+
+    python benchmarks/header_dict.py
+"""
+from __future__ import print_function
+
+import argparse
+import timeit
+
+from urllib3._collections import HTTPHeaderDict
+
+RESPONSE_LINES = [
+    ("Date", "Mon, 19 Oct 2026 10:00:00 GMT"),
+    ("Content-Type", "application/json; charset=utf-8"),
+    ("Content-Length", "1234"),
+    ("Connection", "keep-alive"),
+    ("Cache-Control", "private, max-age=0"),
+    ("ETag", '"5f1c-1a2b3c"'),
+    ("Vary", "Accept-Encoding"),
+    ("Server", "nginx"),
+    ("Set-Cookie", "session=abc; Path=/; HttpOnly"),
+    ("Set-Cookie", "theme=dark; Path=/"),
+    ("X-Request-Id", "0f2d4c1e-9b7a-4d3e-8c6f-2a1b0e9d8c7b"),
+    ("Strict-Transport-Security", "max-age=31536000"),
+]
+REQUEST_HEADERS = {
+    "Host": "example.com",
+    "User-Agent": "python-urllib3/1.26",
+    "Accept-Encoding": "gzip, deflate",
+    "Accept": "*/*",
+}
+
+
+def build():
+    return HTTPHeaderDict(RESPONSE_LINES)
+
+
+def response_cycle():
+    # What HTTPResponse does with a fresh set of headers
+    headers = HTTPHeaderDict(RESPONSE_LINES)
+    headers.get("transfer-encoding", "")
+    headers.get("content-encoding", "")
+    headers.get("content-length")
+    headers.get("location")
+    return headers
+
+
+BUILT = build()
+BUILT.get("content-length")
+
+
+def lookup():
+    BUILT["content-type"]
+    BUILT["ETAG"]
+    "x-missing" in BUILT
+
+
+def getlist():
+    return BUILT.getlist("set-cookie")
+
+
+def copy():
+    return BUILT.copy()
+
+
+def merged():
+    return list(BUILT.itermerged())
+
+
+def request_headers():
+    return HTTPHeaderDict(REQUEST_HEADERS)
+
+
+CASES = [build, response_cycle, lookup, getlist, copy, merged, request_headers]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--number", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    for case in CASES:
+        best = min(timeit.repeat(case, number=args.number, repeat=args.repeat))
+        print("%-16s %8.2f us" % (case.__name__, best / args.number * 1e6))
+
+
+if __name__ == "__main__":
+    main()
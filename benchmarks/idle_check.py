@@ -0,0 +1,59 @@
+"""
+Cost of checking many idle connections for being dropped by the peer.
+
+Compares calling ``is_connection_dropped`` once per connection with one
+``dropped_connections`` call over all of them, for pools of connected
+socket pairs of several sizes; a tenth of the peers are closed.
+
+    python benchmarks/idle_check.py --sizes 10 100 1000
+"""
+from __future__ import print_function
+
+import argparse
+import socket
+import timeit
+
+from urllib3.util.connection import dropped_connections, is_connection_dropped
+
+
+class Conn(object):
+    def __init__(self, sock):
+        self.sock = sock
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 500])
+    parser.add_argument("--number", type=int, default=200)
+    args = parser.parse_args()
+
+    print("%6s %14s %14s %8s" % ("conns", "per-conn us", "batched us", "speedup"))
+    for size in args.sizes:
+        pairs = [socket.socketpair() for _ in range(size)]
+        conns = [Conn(ours) for ours, _ in pairs]
+        for _, peer in pairs[:: 10]:
+            peer.close()
+
+        expected = [c for c in conns if is_connection_dropped(c)]
+        assert len(dropped_connections(conns)) == len(expected)
+
+        one_by_one = timeit.timeit(
+            lambda: [c for c in conns if is_connection_dropped(c)], number=args.number
+        )
+        batched = timeit.timeit(lambda: dropped_connections(conns), number=args.number)
+        print(
+            "%6d %14.1f %14.1f %7.1fx"
+            % (
+                size,
+                one_by_one / args.number * 1e6,
+                batched / args.number * 1e6,
+                one_by_one / batched,
+            )
+        )
+        for ours, peer in pairs:
+            ours.close()
+            peer.close()
+
+
+if __name__ == "__main__":
+    main()
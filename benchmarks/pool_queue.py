@@ -0,0 +1,114 @@
+"""
+Contention benchmark for the connection queues of blocking pools.
+
+Many threads share a small pool the way ``HTTPConnectionPool(block=True)``
+does: take an item with ``get(timeout=...)``, hold it for a simulated
+request, put it back. Reports throughput, checkout wait percentiles,
+timeouts (what the pool turns into ``EmptyPoolError``) and how evenly the
+checkouts were spread over the threads.
+
+    python benchmarks/pool_queue.py --threads 64 --maxsize 4
+"""
+from __future__ import print_function
+
+import argparse
+import threading
+import time
+
+from urllib3.packages.six.moves import queue
+from urllib3.util.queue import FairLifoQueue, LifoQueue
+
+clock = getattr(time, "perf_counter", time.time)
+
+
+def run(queue_cls, threads, maxsize, duration, hold, timeout):
+    pool = queue_cls(maxsize)
+    for _ in range(maxsize):
+        pool.put(None)
+
+    checkouts = [0] * threads
+    timeouts = [0] * threads
+    waits = [[] for _ in range(threads)]
+    start = threading.Event()
+    stop = threading.Event()
+
+    def worker(n):
+        start.wait()
+        while not stop.is_set():
+            began = clock()
+            try:
+                item = pool.get(block=True, timeout=timeout)
+            except queue.Empty:
+                timeouts[n] += 1
+                continue
+            waits[n].append(clock() - began)
+            checkouts[n] += 1
+            if hold:
+                time.sleep(hold)
+            pool.put(item, block=False)
+
+    workers = [threading.Thread(target=worker, args=(n,)) for n in range(threads)]
+    for t in workers:
+        t.start()
+    started = clock()
+    start.set()
+    time.sleep(duration)
+    stop.set()
+    for t in workers:
+        t.join()
+    elapsed = clock() - started
+
+    all_waits = sorted(w for per_thread in waits for w in per_thread)
+    total = sum(checkouts)
+    mean = float(total) / threads
+    spread = (sum((c - mean) ** 2 for c in checkouts) / threads) ** 0.5
+
+    def pct(q):
+        if not all_waits:
+            return float("nan")
+        return all_waits[int(round(q * (len(all_waits) - 1)))] * 1000.0
+
+    return {
+        "ops_per_s": total / elapsed,
+        "p50_ms": pct(0.50),
+        "p99_ms": pct(0.99),
+        "max_ms": pct(1.0),
+        "timeouts": sum(timeouts),
+        "starved": sum(1 for c in checkouts if c == 0),
+        "cv": spread / mean if mean else float("nan"),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--threads", type=int, nargs="+", default=[4, 16, 64])
+    parser.add_argument("--maxsize", type=int, default=4)
+    parser.add_argument("--duration", type=float, default=2.0)
+    parser.add_argument(
+        "--hold", type=float, default=0.001, help="seconds an item is held"
+    )
+    parser.add_argument(
+        "--timeout", type=float, default=0.5, help="pool_timeout of each get()"
+    )
+    args = parser.parse_args()
+
+    print(
+        "%-14s %7s %10s %9s %9s %9s %8s %7s %6s"
+        % ("queue", "threads", "ops/s", "p50 ms", "p99 ms", "max ms",
+           "timeouts", "starved", "cv")
+    )
+    for threads in args.threads:
+        for queue_cls in (LifoQueue, FairLifoQueue):
+            r = run(
+                queue_cls, threads, args.maxsize, args.duration, args.hold,
+                args.timeout,
+            )
+            print(
+                "%-14s %7d %10.0f %9.3f %9.3f %9.3f %8d %7d %6.3f"
+                % (queue_cls.__name__, threads, r["ops_per_s"], r["p50_ms"],
+                   r["p99_ms"], r["max_ms"], r["timeouts"], r["starved"], r["cv"])
+            )
+
+
+if __name__ == "__main__":
+    main()
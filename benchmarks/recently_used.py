@@ -0,0 +1,90 @@
+"""
+Concurrency benchmark for the containers behind ``PoolManager.pools``.
+
+Threads look up keys the way ``PoolManager.connection_from_pool_key`` does
+on every request: mostly hits, with an occasional insert of a new key that
+forces an eviction. Reports lookups per second for each container at each
+thread count.
+
+    python benchmarks/recently_used.py --threads 1 4 16 64
+"""
+from __future__ import print_function
+
+import argparse
+import random
+import threading
+import time
+
+from urllib3._collections import (
+    ConcurrentRecentlyUsedContainer,
+    RecentlyUsedContainer,
+)
+
+clock = getattr(time, "perf_counter", time.time)
+
+
+def run(container_cls, threads, maxsize, keys, duration, miss_ratio):
+    disposed = []
+    container = container_cls(maxsize, dispose_func=disposed.append)
+    for key in range(maxsize):
+        container[key] = key
+
+    counts = [0] * threads
+    start = threading.Event()
+    stop = threading.Event()
+
+    def worker(n):
+        rng = random.Random(n)
+        lookups = [rng.randrange(keys) for _ in range(4096)]
+        misses = [rng.random() < miss_ratio for _ in range(4096)]
+        get = container.get
+        done = 0
+        start.wait()
+        while not stop.is_set():
+            for i in range(4096):
+                key = lookups[i]
+                if get(key) is None and misses[i]:
+                    with container.lock:
+                        if get(key) is None:
+                            container[key] = key
+            done += 4096
+        counts[n] = done
+
+    workers = [threading.Thread(target=worker, args=(n,)) for n in range(threads)]
+    for t in workers:
+        t.start()
+    started = clock()
+    start.set()
+    time.sleep(duration)
+    stop.set()
+    for t in workers:
+        t.join()
+    elapsed = clock() - started
+    assert len(container) <= maxsize
+    return sum(counts) / elapsed, len(disposed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 2, 4, 8, 16, 32, 64])
+    parser.add_argument("--maxsize", type=int, default=10, help="num_pools")
+    parser.add_argument("--keys", type=int, default=11, help="distinct keys looked up")
+    parser.add_argument("--duration", type=float, default=1.0)
+    parser.add_argument(
+        "--miss-ratio", type=float, default=0.01,
+        help="share of misses that insert the key",
+    )
+    args = parser.parse_args()
+
+    print("%7s %32s %32s %7s" % ("threads", "RecentlyUsedContainer lookups/s",
+                                 "ConcurrentRecentlyUsed lookups/s", "speedup"))
+    for threads in args.threads:
+        base, _ = run(RecentlyUsedContainer, threads, args.maxsize, args.keys,
+                      args.duration, args.miss_ratio)
+        fast, _ = run(ConcurrentRecentlyUsedContainer, threads, args.maxsize,
+                      args.keys, args.duration, args.miss_ratio)
+        print("%7d %32.0f %32.0f %6.2fx" % (threads, base, fast, fast / base))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""
+Download throughput through a local HTTPS proxy (TLS in TLS).
+
+Starts an HTTPS origin server that streams ``--size`` MiB and an HTTPS
+proxy that tunnels CONNECT requests, each in a child process, then
+downloads the body through ``ProxyManager`` several times and reports
+throughput and the client's CPU time per MiB. Needs a certificate valid
+for ``localhost``, e.g.:
+
+    openssl req -x509 -newkey rsa:2048 -nodes -days 30 -subj /CN=localhost \\
+        -addext subjectAltName=DNS:localhost -keyout key.pem -out cert.pem
+    python benchmarks/tls_in_tls.py --cert cert.pem --key key.pem
+
+Run it once per tree to compare implementations.
+"""
+from __future__ import print_function
+
+import argparse
+import multiprocessing
+import select
+import socket
+import ssl
+import time
+
+from urllib3 import ProxyManager
+from urllib3.packages.six.moves import BaseHTTPServer, socketserver
+
+clock = getattr(time, "perf_counter", time.time)
+cpu_clock = getattr(time, "process_time", None) or time.clock
+
+MiB = 1024 * 1024
+CHUNK = b"x" * 65536
+
+
+class OriginHandler(BaseHTTPServer.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    size = 0
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Length", str(self.size))
+        self.end_headers()
+        remaining = self.size
+        while remaining:
+            chunk = CHUNK[: min(remaining, len(CHUNK))]
+            self.wfile.write(chunk)
+            remaining -= len(chunk)
+
+    def log_message(self, *args):
+        pass
+
+
+class ProxyHandler(BaseHTTPServer.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_CONNECT(self):
+        host, port = self.path.rsplit(":", 1)
+        upstream = socket.create_connection((host, int(port)))
+        self.send_response(200)
+        self.end_headers()
+        client = self.connection
+        sockets = [client, upstream]
+        while True:
+            readable, _, _ = select.select(sockets, [], [])
+            for sock in readable:
+                # The client side is TLS, drain what it has buffered too
+                data = sock.recv(262144)
+                if not data:
+                    upstream.close()
+                    return
+                (upstream if sock is client else client).sendall(data)
+                while sock is client and client.pending():
+                    upstream.sendall(client.recv(client.pending()))
+
+    def log_message(self, *args):
+        pass
+
+
+class ThreadingServer(socketserver.ThreadingMixIn, BaseHTTPServer.HTTPServer):
+    daemon_threads = True
+
+
+def serve(handler, cert, key, ready):
+    context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    context.load_cert_chain(cert, key)
+    server = ThreadingServer(("127.0.0.1", 0), handler)
+    server.socket = context.wrap_socket(server.socket, server_side=True)
+    ready.put(server.server_address[1])
+    server.serve_forever()
+
+
+def start(handler, args):
+    ready = multiprocessing.Queue()
+    process = multiprocessing.Process(
+        target=serve, args=(handler, args.cert, args.key, ready)
+    )
+    process.daemon = True
+    process.start()
+    return process, ready.get()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--cert", required=True)
+    parser.add_argument("--key", required=True)
+    parser.add_argument("--size", type=int, default=64, help="MiB per download")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--chunk", type=int, default=65536, help="read size")
+    args = parser.parse_args()
+
+    OriginHandler.size = args.size * MiB
+    origin, origin_port = start(OriginHandler, args)
+    proxy, proxy_port = start(ProxyHandler, args)
+
+    manager = ProxyManager(
+        "https://localhost:%d" % proxy_port,
+        ca_certs=args.cert,
+        proxy_ssl_context=ssl.create_default_context(cafile=args.cert),
+    )
+    url = "https://localhost:%d/" % origin_port
+
+    for run in range(args.repeat):
+        started, cpu_started = clock(), cpu_clock()
+        response = manager.request("GET", url, preload_content=False)
+        received = 0
+        for chunk in response.stream(args.chunk):
+            received += len(chunk)
+        response.release_conn()
+        elapsed, cpu = clock() - started, cpu_clock() - cpu_started
+        assert received == args.size * MiB, received
+        print(
+            "run %d: %7.1f MiB/s, client CPU %5.2f ms/MiB"
+            % (run, args.size / elapsed, cpu * 1000.0 / args.size)
+        )
+
+    origin.terminate()
+    proxy.terminate()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Client CPU cost of HTTPS requests that each need a new connection.
+
+Starts a local HTTPS server in a child process that closes the connection
+after every response, then sends requests to it through one PoolManager
+and reports the client's CPU time per request and how many handshakes
+resumed a TLS session. Needs a certificate valid for ``localhost``, e.g.:
+
+    openssl req -x509 -newkey rsa:2048 -nodes -days 30 -subj /CN=localhost \\
+        -addext subjectAltName=DNS:localhost -keyout key.pem -out cert.pem
+    python benchmarks/tls_reconnect.py --cert cert.pem --key key.pem
+
+Pass a full CA bundle with the certificate appended as ``--ca-certs`` to
+include the cost of loading real-world trust stores. Run it once per tree
+to compare implementations.
+"""
+from __future__ import print_function
+
+import argparse
+import multiprocessing
+import ssl
+import time
+
+from urllib3 import PoolManager
+from urllib3.packages.six.moves import BaseHTTPServer
+
+cpu_clock = getattr(time, "process_time", None) or time.clock
+
+
+class Handler(BaseHTTPServer.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Length", "2")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.wfile.write(b"ok")
+
+    def log_message(self, *args):
+        pass
+
+
+def serve(cert, key, tls_version, ready):
+    context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    context.load_cert_chain(cert, key)
+    if tls_version == "1.2":
+        context.maximum_version = ssl.TLSVersion.TLSv1_2
+    server = BaseHTTPServer.HTTPServer(("127.0.0.1", 0), Handler)
+    server.socket = context.wrap_socket(server.socket, server_side=True)
+    ready.put(server.server_address[1])
+    server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--cert", required=True)
+    parser.add_argument("--key", required=True)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--tls-version", choices=("1.2", "1.3"), default="1.3")
+    parser.add_argument(
+        "--ca-certs", help="CA bundle to verify with, defaults to --cert"
+    )
+    args = parser.parse_args()
+
+    ready = multiprocessing.Queue()
+    server = multiprocessing.Process(
+        target=serve, args=(args.cert, args.key, args.tls_version, ready)
+    )
+    server.daemon = True
+    server.start()
+    url = "https://localhost:%d/" % ready.get()
+
+    manager = PoolManager(ca_certs=args.ca_certs or args.cert)
+    manager.request("GET", url)  # warm up
+
+    resumed = 0
+    started = cpu_clock()
+    for _ in range(args.requests):
+        response = manager.request("GET", url, preload_content=False)
+        sock = getattr(response._connection, "_pool_tls_socket", None)
+        if sock is not None and sock.session_reused:
+            resumed += 1
+        response.read()
+        response.release_conn()
+    elapsed = cpu_clock() - started
+    server.terminate()
+
+    print(
+        "%d requests, client CPU %.3f ms/request, %d handshakes resumed"
+        % (args.requests, elapsed * 1000.0 / args.requests, resumed)
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,198 @@
+from __future__ import absolute_import
+
+import io
+import sys
+import threading
+
+from .exceptions import TimeoutError
+from .packages import six
+from .response import HTTPResponse
+from .util.timeout import Timeout
+
+__all__ = ["SingleFlight"]
+
+
+class _Call(object):
+    """An upstream request in progress and, once ``done``, its outcome."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.exc_info = None
+
+
+def _wait_timeout(timeout):
+    """
+    Return how long a caller with ``timeout`` may wait for an identical
+    request, in seconds, or None to wait as long as it takes.
+    """
+    if isinstance(timeout, Timeout):
+        if timeout.total is not None:
+            return timeout.total
+        connect, read = timeout.connect_timeout, timeout.read_timeout
+        if read is None or read is Timeout.DEFAULT_TIMEOUT:
+            return None
+        if connect is None or connect is Timeout.DEFAULT_TIMEOUT:
+            return read
+        return connect + read
+    if timeout is Timeout.DEFAULT_TIMEOUT:
+        return None
+    return timeout
+
+
+def _retries_key(retries):
+    """Return a hashable key that is equal for equally configured retries."""
+    if retries is None or isinstance(retries, six.integer_types):
+        return type(retries), retries  # False and 0 differ
+    settings = []
+    for name, value in sorted(vars(retries).items()):
+        if name == "history":
+            continue
+        if isinstance(value, (list, tuple, set, frozenset)):
+            # status_forcelist, allowed_methods...: only membership counts
+            value = frozenset(value)
+        try:
+            hash(value)
+        except TypeError:
+            value = id(value)  # Alive as long as retries is
+        settings.append((name, value))
+    return type(retries), tuple(settings)
+
+
+class SingleFlight(object):
+    """
+    Lets concurrent identical requests share one upstream request, so a
+    burst of threads asking for the same resource at once, e.g. on a cache
+    miss, costs a single round trip. Enable it with
+    ``PoolManager(single_flight=SingleFlight())``.
+
+    Requests are identical if they have the same method and URL, the same
+    values for ``key_headers`` and the same ``redirect`` and ``retries``
+    arguments; requests with a body are always sent on their own. The first
+    of them is sent and its body is read into memory, undecoded; every
+    caller, that one included, then gets a response of its own over that
+    buffer, decoded and preloaded as it asked for. An error is raised to
+    all of them. Callers waiting for the first one give up with a
+    :class:`~urllib3.exceptions.TimeoutError` once their own ``timeout``
+    (its total, or connect and read) has passed.
+
+    :param methods:
+        Methods that may be coalesced. Only add idempotent ones.
+
+    :param key_headers:
+        Request headers that tell otherwise identical requests apart,
+        compared case-insensitively.
+    """
+
+    #: Default methods to be used for ``methods``
+    DEFAULT_METHODS = frozenset(["GET", "HEAD"])
+
+    #: Default headers to be used for ``key_headers``
+    DEFAULT_KEY_HEADERS = frozenset(
+        [
+            "Accept",
+            "Accept-Encoding",
+            "Accept-Language",
+            "Authorization",
+            "Cookie",
+            "Range",
+        ]
+    )
+
+    def __init__(self, methods=DEFAULT_METHODS, key_headers=DEFAULT_KEY_HEADERS):
+        self.methods = frozenset(method.upper() for method in methods)
+        self.key_headers = frozenset(name.lower() for name in key_headers)
+        self.coalesced = 0
+        self._calls = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    @property
+    def leading(self):
+        """
+        Whether this thread is sending a request for others. Requests it
+        makes meanwhile, such as the redirects it follows, must be sent on
+        their own.
+        """
+        return getattr(self._local, "leading", False)
+
+    def key(self, method, url, headers=None, body=None, redirect=True, retries=None):
+        """
+        Return the key identical requests share, or None if the request
+        must be sent on its own.
+
+        ``Retry`` objects are compared by their settings, so callers that
+        each pass an equal ``Retry(...)`` share their requests.
+        """
+        method = method.upper()
+        if body is not None or method not in self.methods:
+            return None
+        selected = sorted(
+            (name.lower(), value)
+            for name, value in six.iteritems(headers or {})
+            if name.lower() in self.key_headers
+        )
+        return method, url, tuple(selected), bool(redirect), _retries_key(retries)
+
+    def urlopen(self, urlopen, method, url, **kw):
+        """
+        Send the request with ``urlopen(method, url, **kw)``, or wait for an
+        identical one in progress, and return a response of its own.
+        """
+        key = self.key(
+            method,
+            url,
+            kw.get("headers"),
+            kw.get("body"),
+            kw.get("redirect", True),
+            kw.get("retries"),
+        )
+        if key is None:
+            return urlopen(method, url, **kw)
+
+        with self._lock:
+            call = self._calls.get(key)
+            leading = call is None
+            if leading:
+                call = self._calls[key] = _Call()
+            else:
+                self.coalesced += 1
+
+        if leading:
+            self._local.leading = True
+            try:
+                response = urlopen(method, url, **dict(kw, preload_content=False))
+                try:
+                    data = response.read(decode_content=False)
+                finally:
+                    response.release_conn()
+                call.result = response, data
+            except BaseException:
+                call.exc_info = sys.exc_info()
+            finally:
+                self._local.leading = False
+                with self._lock:
+                    del self._calls[key]
+                call.done.set()
+        elif not call.done.wait(_wait_timeout(kw.get("timeout"))):
+            raise TimeoutError(
+                "Timed out waiting for an identical request to %s" % url
+            )
+
+        if call.exc_info is not None:
+            six.reraise(*call.exc_info)
+        response, data = call.result
+        return HTTPResponse(
+            body=io.BytesIO(data),
+            headers=response.headers.copy(),
+            status=response.status,
+            version=response.version,
+            reason=response.reason,
+            strict=response.strict,
+            preload_content=kw.get("preload_content", True),
+            decode_content=kw.get("decode_content", True),
+            retries=response.retries,
+            enforce_content_length=kw.get("enforce_content_length", False),
+            request_method=method,
+            request_url=response._request_url,
+        )
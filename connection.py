@@ -1,11 +1,143 @@
 from __future__ import absolute_import
 
+import errno
+import os
 import socket
+import threading
+import time
 
+from .._collections import ConcurrentRecentlyUsedContainer
 from ..contrib import _appengine_environ
 from ..exceptions import LocationParseError
 from ..packages import six
-from .wait import NoWayToWaitForSocketError, wait_for_read
+from ..packages.six.moves import zip_longest
+from .timeout import current_time
+from .wait import NoWayToWaitForSocketError, wait_for_any, wait_for_read
+
+_clock = getattr(time, "perf_counter", time.time)
+
+#: Durations in seconds of the name resolution (``dns``) and TCP handshake
+#: (``tcp``) of the last :func:`create_connection` call on this thread, and
+#: of the SOCKS negotiation (``socks_handshake``, ``socks_connect``) when
+#: :mod:`urllib3.contrib.socks` connected. Read by the pool metrics, which
+#: reset them all to None before connecting.
+connect_timings = threading.local()
+
+#: Per-thread settings of the :func:`create_connection` and
+#: :func:`~urllib3.util.ssl_.ssl_wrap_socket` calls a pool makes while it
+#: connects one of its connections: ``resolver`` is the pool's resolver, or
+#: None, ``happy_eyeballs_delay`` the pool's setting of the same name and
+#: ``tls_session`` an ``(ssl_context, session)`` pair to resume. Set by the
+#: pool around ``conn.connect()``.
+connect_context = threading.local()
+
+#: The "Connection Attempt Delay" recommended by RFC 8305, in seconds.
+HAPPY_EYEBALLS_DELAY = 0.25
+
+# connect_ex() results of a non-blocking connect that is under way
+_CONNECT_IN_PROGRESS = frozenset(
+    getattr(errno, name)
+    for name in ("EINPROGRESS", "EWOULDBLOCK", "EAGAIN", "WSAEWOULDBLOCK")
+    if hasattr(errno, name)
+)
+
+
+class Resolver(object):
+    """
+    Name resolution used by :func:`create_connection`. Subclasses override
+    :meth:`resolve`; the base class asks the system with
+    :func:`socket.getaddrinfo`.
+    """
+
+    def resolve(self, host, port, family=0, type=socket.SOCK_STREAM):
+        """
+        Return the addresses of ``host`` as a list of ``(family, type,
+        proto, canonname, sockaddr)`` tuples, like :func:`socket.getaddrinfo`,
+        or raise :class:`socket.gaierror`.
+        """
+        return socket.getaddrinfo(host, port, family, type)
+
+
+class CachingResolver(Resolver):
+    """
+    :class:`Resolver` that remembers the answers of another one.
+
+    Answers are kept for ``ttl`` seconds and failed lookups for
+    ``negative_ttl`` seconds, in a least recently used cache of ``maxsize``
+    entries. Share one instance between pools, for instance by passing it
+    as ``resolver`` to a :class:`~urllib3.PoolManager`, so a host is not
+    resolved again for every new connection.
+
+    :param resolver:
+        The :class:`Resolver` asked on cache misses. Defaults to the system
+        resolver.
+
+    :param hosts:
+        Static entries that take precedence over the resolver and never
+        expire, as a mapping of host names to an IP address or a list of IP
+        addresses, like ``/etc/hosts``.
+    """
+
+    def __init__(
+        self, resolver=None, ttl=60, negative_ttl=5, maxsize=256, hosts=None
+    ):
+        self.resolver = resolver or Resolver()
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.hosts = {}
+        for host, addresses in (hosts or {}).items():
+            if isinstance(addresses, six.string_types):
+                addresses = [addresses]
+            self.hosts[host.lower()] = list(addresses)
+        self._cache = ConcurrentRecentlyUsedContainer(maxsize)
+
+    def resolve(self, host, port, family=0, type=socket.SOCK_STREAM):
+        addresses = self.hosts.get(host.lower())
+        if addresses is not None:
+            return self._resolve_static(addresses, port, family, type)
+
+        key = (host.lower(), port, family, type)
+        now = current_time()
+        entry = self._cache.get(key)
+        if entry is not None and entry[0] > now:
+            result = entry[1]
+            if isinstance(result, socket.gaierror):
+                # A fresh instance, re-raising one would grow its traceback
+                raise socket.gaierror(*result.args)
+            return result
+
+        try:
+            result = self.resolver.resolve(host, port, family, type)
+        except socket.gaierror as e:
+            if self.negative_ttl:
+                self._cache[key] = (now + self.negative_ttl, e)
+            raise
+        if self.ttl:
+            self._cache[key] = (now + self.ttl, result)
+        return result
+
+    def _resolve_static(self, addresses, port, family, type):
+        result = []
+        for address in addresses:
+            try:
+                # Numeric addresses only, this never queries DNS
+                result.extend(
+                    socket.getaddrinfo(
+                        address, port, family, type, 0, socket.AI_NUMERICHOST
+                    )
+                )
+            except socket.gaierror:
+                # Wrong family for this lookup, e.g. an IPv6 entry for AF_INET
+                continue
+        if not result:
+            raise socket.gaierror(
+                socket.EAI_NONAME, "No static address of the requested family"
+            )
+        return result
+
+    def clear(self):
+        """Forget all cached answers; static entries are kept."""
+        self._cache.clear()
 
 
 def is_connection_dropped(conn):  # Platform-specific
@@ -30,6 +162,30 @@ def is_connection_dropped(conn):  # Platform-specific
         return False
 
 
+def dropped_connections(conns):
+    """
+    Returns those of ``conns`` that are dropped, as
+    :func:`is_connection_dropped` would, checking all of their sockets with
+    a single system call.
+    """
+    dropped = []
+    socks = {}
+    for conn in conns:
+        sock = getattr(conn, "sock", False)
+        if sock is False:  # Platform-specific: AppEngine
+            continue
+        if sock is None:
+            dropped.append(conn)
+        else:
+            socks[sock] = conn
+    try:
+        readable = wait_for_any(list(socks), read=True, timeout=0.0)
+    except NoWayToWaitForSocketError:  # Platform-specific: AppEngine
+        return dropped
+    dropped.extend(socks[sock] for sock in readable)
+    return dropped
+
+
 # This function is copied from socket.py in the Python 2.7 standard
 # library test suite. Added to its signature is only `socket_options`.
 # One additional modification is that we avoid binding to IPv6 servers
@@ -39,6 +195,8 @@ def create_connection(
     timeout=socket._GLOBAL_DEFAULT_TIMEOUT,
     source_address=None,
     socket_options=None,
+    resolver=None,
+    happy_eyeballs_delay=None,
 ):
     """Connect to *address* and return the socket object.
 
@@ -50,6 +208,17 @@ def create_connection(
     is used.  If *source_address* is set it must be a tuple of (host, port)
     for the socket to bind as a source address before making the connection.
     An host of '' or port 0 tells the OS to use the default.
+    *resolver* is the :class:`Resolver` used to look up *host*; it defaults
+    to the one of the pool connecting, if any, then to the system resolver.
+
+    With *happy_eyeballs_delay* (seconds, see :data:`HAPPY_EYEBALLS_DELAY`),
+    a host with several addresses is connected to as described in RFC 8305:
+    the addresses are tried alternating between IPv6 and IPv4, a new attempt
+    starts every *happy_eyeballs_delay* seconds or as soon as the previous
+    one failed, and the first attempt to succeed wins while the others are
+    closed. *timeout* then applies to all attempts together rather than to
+    each of them. Like the resolver, it defaults to the setting of the pool
+    connecting.
     """
 
     host, port = address
@@ -69,7 +238,33 @@ def create_connection(
             LocationParseError(u"'%s', label empty or too long" % host), None
         )
 
-    for res in socket.getaddrinfo(host, port, family, socket.SOCK_STREAM):
+    if resolver is None:
+        resolver = getattr(connect_context, "resolver", None)
+    if happy_eyeballs_delay is None:
+        happy_eyeballs_delay = getattr(
+            connect_context, "happy_eyeballs_delay", None
+        )
+
+    started = _clock()
+    if resolver is None:
+        addresses = socket.getaddrinfo(host, port, family, socket.SOCK_STREAM)
+    else:
+        addresses = resolver.resolve(host, port, family, socket.SOCK_STREAM)
+    resolved = _clock()
+    connect_timings.dns = resolved - started
+
+    if happy_eyeballs_delay is not None and len(addresses) > 1:
+        sock = _staggered_connect(
+            _interleave_families(addresses),
+            timeout,
+            source_address,
+            socket_options,
+            happy_eyeballs_delay,
+        )
+        connect_timings.tcp = _clock() - resolved
+        return sock
+
+    for res in addresses:
         af, socktype, proto, canonname, sa = res
         sock = None
         try:
@@ -83,6 +278,7 @@ def create_connection(
             if source_address:
                 sock.bind(source_address)
             sock.connect(sa)
+            connect_timings.tcp = _clock() - resolved
             return sock
 
         except socket.error as e:
@@ -97,6 +293,98 @@ def create_connection(
     raise socket.error("getaddrinfo returns an empty list")
 
 
+def _interleave_families(addresses):
+    """
+    Reorder ``getaddrinfo`` results so that address families alternate,
+    starting with the family of the first result (RFC 8305, section 4).
+    """
+    first_family = addresses[0][0]
+    preferred = [res for res in addresses if res[0] == first_family]
+    others = [res for res in addresses if res[0] != first_family]
+    return [
+        res for pair in zip_longest(preferred, others) for res in pair if res
+    ]
+
+
+def _staggered_connect(addresses, timeout, source_address, socket_options, delay):
+    """
+    Race non-blocking connects to ``addresses``, starting one every
+    ``delay`` seconds or as soon as any attempt fails, and return the first
+    connected socket.
+    """
+    if timeout is socket._GLOBAL_DEFAULT_TIMEOUT:
+        timeout = socket.getdefaulttimeout()
+    deadline = None if timeout is None else _clock() + timeout
+
+    pending = {}  # socket -> sockaddr
+    remaining = list(reversed(addresses))
+    next_attempt = _clock()
+    err = None
+    winner = None
+    try:
+        while winner is None:
+            now = _clock()
+            if deadline is not None and now >= deadline:
+                raise socket.timeout("timed out")
+
+            if remaining and (now >= next_attempt or not pending):
+                af, socktype, proto, canonname, sa = remaining.pop()
+                sock = None
+                try:
+                    sock = socket.socket(af, socktype, proto)
+                    _set_socket_options(sock, socket_options)
+                    sock.setblocking(False)
+                    if source_address:
+                        sock.bind(source_address)
+                    code = sock.connect_ex(sa)
+                except socket.error as e:
+                    err = e
+                    if sock is not None:
+                        sock.close()
+                    next_attempt = now
+                    continue
+                if code == 0:
+                    winner = sock
+                elif code in _CONNECT_IN_PROGRESS:
+                    pending[sock] = sa
+                    next_attempt = now + delay
+                else:
+                    err = socket.error(code, os.strerror(code))
+                    sock.close()
+                    next_attempt = now
+                continue
+
+            if not pending:
+                break
+
+            wait = None if deadline is None else deadline - now
+            if remaining:
+                until_next = next_attempt - now
+                wait = until_next if wait is None else min(wait, until_next)
+            for sock in wait_for_any(list(pending), write=True, timeout=wait):
+                code = sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR)
+                del pending[sock]
+                if code == 0 and winner is None:
+                    winner = sock
+                else:
+                    if code:
+                        # A failed attempt starts the next one right away,
+                        # even while others are still pending (RFC 8305)
+                        err = socket.error(code, os.strerror(code))
+                        next_attempt = now
+                    sock.close()
+    finally:
+        for sock in pending:
+            sock.close()
+
+    if winner is None:
+        if err is not None:
+            raise err
+        raise socket.error("getaddrinfo returns an empty list")
+    winner.settimeout(timeout)
+    return winner
+
+
 def _set_socket_options(sock, options):
     if options is None:
         return
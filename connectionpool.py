@@ -1,10 +1,12 @@
 from __future__ import absolute_import
 
 import errno
+import functools
 import logging
 import re
 import socket
 import sys
+import threading
 import warnings
 from socket import error as SocketError
 from socket import timeout as SocketTimeout
@@ -34,18 +36,29 @@ from .exceptions import (
     SSLError,
     TimeoutError,
 )
+from .metrics import PoolMetrics, clock
 from .packages import six
 from .packages.six.moves import queue
 from .request import RequestMethods
 from .response import HTTPResponse
-from .util.connection import is_connection_dropped
+from .util.connection import (
+    connect_context,
+    connect_timings,
+    dropped_connections,
+    is_connection_dropped,
+)
 from .util.proxy import connection_requires_http_tunnel
 from .util.queue import LifoQueue
 from .util.request import set_file_position
 from .util.response import assert_header_parsing
-from .util.retry import Retry
+from .util.retry import Retry, RetryAt
+from .util.ssl_ import (
+    cached_urllib3_context,
+    resolve_cert_reqs,
+    resolve_ssl_version,
+)
 from .util.ssl_match_hostname import CertificateError
-from .util.timeout import Timeout
+from .util.timeout import Timeout, current_time
 from .util.url import Url, _encode_target
 from .util.url import _normalize_host as normalize_host
 from .util.url import get_host, parse_url
@@ -79,6 +92,10 @@ class ConnectionPool(object):
     scheme = None
     QueueCls = LifoQueue
 
+    #: The :class:`~urllib3.util.retry.CircuitBreaker` of this pool's host,
+    #: set by a :class:`~urllib3.PoolManager` created with one.
+    circuit_breaker = None
+
     def __init__(self, host, port=None):
         if not host:
             raise LocationValueError("No host specified.")
@@ -147,7 +164,9 @@ class HTTPConnectionPool(ConnectionPool, RequestMethods):
         a time. When no free connections are available, the call will block
         until a connection has been released. This is a useful side effect for
         particular multithreaded situations where one does not want to use more
-        than maxsize connections per host to prevent flooding.
+        than maxsize connections per host to prevent flooding. Waiting threads
+        are served first come, first served if :attr:`QueueCls` is
+        :class:`~urllib3.util.queue.FairLifoQueue`.
 
     :param headers:
         Headers to include with all requests, unless other headers are given
@@ -156,6 +175,48 @@ class HTTPConnectionPool(ConnectionPool, RequestMethods):
     :param retries:
         Retry configuration to use by default with requests in this pool.
 
+    :param max_idle_time:
+        Seconds a connection may sit idle in the pool before it is closed
+        instead of being reused. Servers and middleboxes usually drop idle
+        keep-alive connections after a while; evicting them first avoids
+        paying for a failed request on a dead socket. None disables the check.
+
+    :param max_lifetime:
+        Seconds after which a connection is retired, however busy it is,
+        so long-lived connections eventually pick up DNS and load balancer
+        changes. None disables the check.
+
+    :param min_connections:
+        Number of connections :meth:`prewarm` opens ahead of time. Ignored
+        for pools that go through a proxy.
+
+    :param maintenance_interval:
+        If set, a daemon thread evicts stale connections and tops the pool
+        up to ``min_connections`` every ``maintenance_interval`` seconds, so
+        requests never have to wait for that work. Without it, stale
+        connections are evicted whenever a connection is returned to the
+        pool and no connections are opened in advance.
+
+    :param event_hooks:
+        Callables that receive every instrumentation event of this pool, see
+        :class:`urllib3.metrics.PoolMetrics`. Counters and timings are kept
+        in ``pool.metrics`` either way.
+
+    :param resolver:
+        The :class:`urllib3.util.connection.Resolver` used to look up the
+        host of new connections, for instance a shared
+        :class:`~urllib3.util.connection.CachingResolver`. Defaults to
+        :func:`socket.getaddrinfo`. Through a SOCKS proxy, it looks up the
+        proxy, and the target unless the proxy resolves names remotely.
+
+    :param happy_eyeballs_delay:
+        If set, hosts with several addresses are connected to by racing
+        staggered attempts over IPv6 and IPv4, a new one every
+        ``happy_eyeballs_delay`` seconds (RFC 8305 recommends
+        :data:`urllib3.util.connection.HAPPY_EYEBALLS_DELAY`), so a broken
+        route to one address family costs that delay instead of the whole
+        connect timeout. By default addresses are tried one after another.
+
     :param _proxy:
         Parsed proxy URL, should not be used directly, instead, see
         :class:`urllib3.ProxyManager`
@@ -186,6 +247,13 @@ class HTTPConnectionPool(ConnectionPool, RequestMethods):
         _proxy=None,
         _proxy_headers=None,
         _proxy_config=None,
+        max_idle_time=None,
+        max_lifetime=None,
+        min_connections=0,
+        maintenance_interval=None,
+        event_hooks=None,
+        resolver=None,
+        happy_eyeballs_delay=None,
         **conn_kw
     ):
         ConnectionPool.__init__(self, host, port)
@@ -217,6 +285,9 @@ class HTTPConnectionPool(ConnectionPool, RequestMethods):
         self.num_connections = 0
         self.num_requests = 0
         self.conn_kw = conn_kw
+        self.metrics = PoolMetrics(event_hooks)
+        self.resolver = resolver
+        self.happy_eyeballs_delay = happy_eyeballs_delay
 
         if self.proxy:
             # Enable Nagle's algorithm for proxies, to avoid packet fragmentation.
@@ -237,6 +308,27 @@ class HTTPConnectionPool(ConnectionPool, RequestMethods):
         # HTTPConnectionPool object is garbage collected.
         weakref_finalize(self, _close_pool_connections, pool)
 
+        self.max_idle_time = max_idle_time
+        self.max_lifetime = max_lifetime
+        self.min_connections = min(min_connections, maxsize)
+        self.maintenance_interval = maintenance_interval
+        limits = [t for t in (max_idle_time, max_lifetime) if t is not None]
+        # Without a maintenance thread, sweep at most this often from _put_conn
+        self._sweep_interval = min(limits) / 2.0 if limits else None
+        self._last_sweep = current_time()
+        self._maintenance_stop = None
+        if maintenance_interval is not None:
+            self._maintenance_stop = threading.Event()
+            thread = threading.Thread(
+                target=_maintain_pool,
+                args=(weakref.ref(self), self._maintenance_stop, maintenance_interval),
+                name="urllib3-pool-maintenance",
+            )
+            thread.daemon = True
+            thread.start()
+            # Stop the thread when the pool is garbage collected without close()
+            weakref_finalize(self, self._maintenance_stop.set)
+
     def _new_conn(self):
         """
         Return a fresh :class:`HTTPConnection`.
@@ -271,6 +363,7 @@ class HTTPConnectionPool(ConnectionPool, RequestMethods):
             :prop:`.block` is ``True``.
         """
         conn = None
+        started = clock()
         try:
             conn = self.pool.get(block=self.block, timeout=timeout)
 
@@ -279,23 +372,58 @@ class HTTPConnectionPool(ConnectionPool, RequestMethods):
 
         except queue.Empty:
             if self.block:
+                self.metrics.record(
+                    "checkout",
+                    self,
+                    counters=("checkout_timeouts",),
+                    timings={"checkout_wait": clock() - started},
+                )
                 raise EmptyPoolError(
                     self,
                     "Pool reached maximum size and no more connections are allowed.",
                 )
             pass  # Oh well, we'll create a new connection then
 
+        self.metrics.record(
+            "checkout",
+            self,
+            counters=("checkouts",),
+            timings={"checkout_wait": clock() - started},
+        )
+
         # If this is a persistent connection, check if it got disconnected
         if conn and is_connection_dropped(conn):
             log.debug("Resetting dropped connection: %s", self.host)
+            if getattr(conn, "sock", None) is not None:
+                self.metrics.record(
+                    "connection_dropped",
+                    self,
+                    counters=("connections_dropped",),
+                    reason="dropped",
+                )
             conn.close()
             if getattr(conn, "auto_open", 1) == 0:
                 # This is a proxied connection that has been mutated by
                 # http.client._tunnel() and cannot be reused (since it would
                 # attempt to bypass the proxy)
                 conn = None
+        elif conn and self._is_stale(conn, current_time()):
+            log.debug("Retiring stale connection: %s", self.host)
+            self.metrics.record(
+                "connection_dropped",
+                self,
+                counters=("connections_dropped",),
+                reason="stale",
+            )
+            conn.close()
 
-        return conn or self._new_conn()
+        if not conn:
+            conn = self._new_conn()
+        if getattr(conn, "sock", None) is None:
+            # The connection (re)connects on its next request
+            conn._pool_created_at = current_time()
+        conn._pool_checked_out_at = started
+        return conn
 
     def _put_conn(self, conn):
         """
@@ -311,12 +439,13 @@ class HTTPConnectionPool(ConnectionPool, RequestMethods):
 
         If the pool is closed, then the connection will be closed and discarded.
         """
+        if conn is not None:
+            conn._pool_idle_since = current_time()
         try:
             self.pool.put(conn, block=False)
-            return  # Everything is dandy, done.
         except AttributeError:
             # self.pool is None.
-            pass
+            reason = "pool closed"
         except queue.Full:
             # This should never happen if self.block == True
             log.warning(
@@ -324,10 +453,183 @@ class HTTPConnectionPool(ConnectionPool, RequestMethods):
                 self.host,
                 self.pool.qsize(),
             )
+            reason = "pool full"
+        else:
+            if (
+                conn is not None
+                and self._sweep_interval is not None
+                and self._maintenance_stop is None
+                and conn._pool_idle_since - self._last_sweep >= self._sweep_interval
+            ):
+                self.evict_stale()
+            return  # Everything is dandy, done.
         # Connection never got put back into the pool, close it.
         if conn:
+            self.metrics.record(
+                "connection_discarded",
+                self,
+                counters=("connections_discarded",),
+                reason=reason,
+            )
             conn.close()
 
+    def _is_stale(self, conn, now):
+        """Has ``conn`` exceeded ``max_idle_time`` or ``max_lifetime``?"""
+        if getattr(conn, "sock", None) is None:
+            return False  # Nothing to retire, it reconnects on its next use.
+        if self.max_idle_time is not None:
+            idle_since = getattr(conn, "_pool_idle_since", None)
+            if idle_since is not None and now - idle_since > self.max_idle_time:
+                return True
+        if self.max_lifetime is not None:
+            created_at = getattr(conn, "_pool_created_at", None)
+            if created_at is not None and now - created_at > self.max_lifetime:
+                return True
+        return False
+
+    def evict_stale(self):
+        """
+        Close idle connections that exceeded ``max_idle_time`` or
+        ``max_lifetime``, or that the server has closed, and return how many
+        were closed.
+
+        Stale connections are swapped for ``None`` placeholders under the
+        queue's lock, so the pool keeps its size and no waiter is woken up;
+        the sockets are closed after the lock has been released. The
+        sockets of all idle connections are checked with a single system
+        call, made outside the lock on a snapshot of the queue.
+        """
+        pool = self.pool
+        if pool is None:
+            return 0
+        now = current_time()
+        self._last_sweep = now
+        with pool.mutex:
+            idle = dict(
+                (c, c.sock) for c in pool.queue if getattr(c, "sock", None) is not None
+            )
+        try:
+            dropped = set(dropped_connections(list(idle)))
+        except (ValueError, SocketError):
+            # A connection was checked out and closed while polling, the
+            # next sweep will check again.
+            dropped = set()
+        stale = []
+        with pool.mutex:
+            for i, conn in enumerate(pool.queue):
+                if conn is None:
+                    continue
+                # Only the socket that was polled, the connection may have
+                # been checked out and reconnected meanwhile.
+                if conn in dropped and conn.sock is idle[conn]:
+                    reason = "dropped"
+                elif self._is_stale(conn, now):
+                    reason = "stale"
+                else:
+                    continue
+                pool.queue[i] = None
+                stale.append((conn, reason))
+        for conn, reason in stale:
+            self.metrics.record(
+                "connection_dropped",
+                self,
+                counters=("connections_dropped",),
+                reason=reason,
+            )
+            conn.close()
+        if stale:
+            log.debug("Evicted %d stale connections: %s", len(stale), self.host)
+        return len(stale)
+
+    def prewarm(self, count=None):
+        """
+        Open connections ahead of time until ``count`` (by default
+        ``min_connections``) idle connections are pooled, and return how
+        many were opened.
+
+        Connections are established outside the queue's lock and then take
+        the place of ``None`` placeholders, so a pool whose connections are
+        all checked out is not grown beyond ``maxsize``.
+        """
+        if count is None:
+            count = self.min_connections
+        pool = self.pool
+        if pool is None or count <= 0 or self.proxy is not None:
+            return 0
+        with pool.mutex:
+            ready = sum(
+                1 for c in pool.queue if getattr(c, "sock", None) is not None
+            )
+        opened = 0
+        for _ in xrange(count - ready):
+            conn = self._new_conn()
+            try:
+                self._connect(conn)
+            except (SocketError, HTTPException, BaseSSLError, TimeoutError) as e:
+                # NewConnectionError and ConnectTimeoutError are TimeoutErrors
+                log.debug("Failed to pre-warm connection to %s: %r", self.host, e)
+                conn.close()
+                break
+            conn._pool_created_at = conn._pool_idle_since = current_time()
+            placed = False
+            with pool.mutex:
+                # From the top of the LIFO, so the next checkout gets it
+                for i in reversed(range(len(pool.queue))):
+                    if pool.queue[i] is None:
+                        pool.queue[i] = conn
+                        placed = True
+                        break
+            if not placed:
+                conn.close()
+                break
+            opened += 1
+        return opened
+
+    def _connect(self, conn):
+        """
+        Connect ``conn`` and record how long name resolution, the TCP
+        handshake, the SOCKS negotiation and the TLS handshake took.
+        """
+        connect_timings.dns = connect_timings.tcp = None
+        connect_timings.socks_handshake = connect_timings.socks_connect = None
+        connect_context.resolver = self.resolver
+        connect_context.happy_eyeballs_delay = self.happy_eyeballs_delay
+        started = clock()
+        try:
+            conn.connect()
+        except Exception as e:
+            self.metrics.record(
+                "connect_failed", self, counters=("connect_failures",), error=e
+            )
+            raise
+        finally:
+            connect_context.resolver = None
+            connect_context.happy_eyeballs_delay = None
+        elapsed = clock() - started
+
+        dns, tcp, tls = connect_timings.dns, connect_timings.tcp, None
+        socks_handshake = connect_timings.socks_handshake
+        socks_connect = connect_timings.socks_connect
+        if dns is None or tcp is None:
+            # Connected without util.connection.create_connection() or
+            # contrib.socks (App Engine...), the phases can't be told apart.
+            dns, tcp = None, elapsed
+        elif self.scheme == "https":
+            socks = (socks_handshake or 0.0) + (socks_connect or 0.0)
+            tls = max(elapsed - dns - tcp - socks, 0.0)
+        self.metrics.record(
+            "connection_created",
+            self,
+            counters=("connections_created",),
+            timings={
+                "dns": dns,
+                "connect": tcp,
+                "socks_handshake": socks_handshake,
+                "socks_connect": socks_connect,
+                "tls": tls,
+            },
+        )
+
     def _validate_conn(self, conn):
         """
         Called right before a request is made, after the socket is created.
@@ -400,6 +702,12 @@ class HTTPConnectionPool(ConnectionPool, RequestMethods):
 
         # Trigger any extra validation we need to do.
         try:
+            if getattr(conn, "sock", False) is None:
+                self._connect(conn)
+            else:
+                self.metrics.record(
+                    "connection_reused", self, counters=("connections_reused",)
+                )
             self._validate_conn(conn)
         except (SocketTimeout, BaseSSLError) as e:
             # Py2 raises this as a BaseSSLError, Py3 raises it as socket timeout.
@@ -451,6 +759,7 @@ class HTTPConnectionPool(ConnectionPool, RequestMethods):
                 conn.sock.settimeout(read_timeout)
 
         # Receive the response from the server
+        sent = clock()
         try:
             try:
                 # Python 2.7, use buffering of HTTP responses
@@ -468,6 +777,20 @@ class HTTPConnectionPool(ConnectionPool, RequestMethods):
             self._raise_timeout(err=e, url=url, timeout_value=read_timeout)
             raise
 
+        received = clock()
+        self.metrics.record(
+            "request",
+            self,
+            counters=("requests",),
+            timings={
+                "first_byte": received - sent,
+                "total": received - getattr(conn, "_pool_checked_out_at", sent),
+            },
+            method=method,
+            url=url,
+            status=httplib_response.status,
+        )
+
         # AppEngine doesn't have a version attr.
         http_version = getattr(conn, "_http_vsn_str", "HTTP/?")
         log.debug(
@@ -503,6 +826,8 @@ class HTTPConnectionPool(ConnectionPool, RequestMethods):
         """
         if self.pool is None:
             return
+        if self._maintenance_stop is not None:
+            self._maintenance_stop.set()
         # Disable access to the pool
         old_pool, self.pool = self.pool, None
 
@@ -530,6 +855,19 @@ class HTTPConnectionPool(ConnectionPool, RequestMethods):
 
         return (scheme, host, port) == (self.scheme, self.host, self.port)
 
+    def _retry(self, delay, method, url, body, headers, retries, *args, **kwargs):
+        """
+        Make the next attempt of :meth:`urlopen`, or, if it has to wait
+        ``delay`` seconds and ``retries`` defers waiting to the caller,
+        return a :class:`~urllib3.util.retry.RetryAt` that makes it.
+        """
+        if retries.defer and delay > 0:
+            attempt = functools.partial(
+                self.urlopen, method, url, body, headers, retries, *args, **kwargs
+            )
+            return RetryAt(current_time() + delay, retries, attempt)
+        return self.urlopen(method, url, body, headers, retries, *args, **kwargs)
+
     def urlopen(
         self,
         method,
@@ -592,6 +930,9 @@ class HTTPConnectionPool(ConnectionPool, RequestMethods):
             immediately. Also, instead of raising a MaxRetryError on redirects,
             the redirect response will be returned.
 
+            With ``Retry(defer=True)``, a :class:`~urllib3.util.retry.RetryAt`
+            is returned instead of sleeping before a retry.
+
         :type retries: :class:`~urllib3.util.retry.Retry`, False, or an int.
 
         :param redirect:
@@ -689,6 +1030,9 @@ class HTTPConnectionPool(ConnectionPool, RequestMethods):
         # complains about UnboundLocalError.
         err = None
 
+        # Backoff before the next attempt, left to the caller by Retry(defer=True)
+        delay = 0
+
         # Keep track of whether we cleanly exited the except block. This
         # ensures we do proper cleanup in finally.
         clean_exit = False
@@ -798,7 +1142,10 @@ class HTTPConnectionPool(ConnectionPool, RequestMethods):
             retries = retries.increment(
                 method, url, error=e, _pool=self, _stacktrace=sys.exc_info()[2]
             )
-            retries.sleep()
+            if retries.defer:
+                delay = retries.get_sleep_time()
+            else:
+                retries.sleep()
 
             # Keep track of the error for the retry warning.
             err = e
@@ -823,7 +1170,8 @@ class HTTPConnectionPool(ConnectionPool, RequestMethods):
             log.warning(
                 "Retrying (%r) after connection broken by '%r': %s", retries, err, url
             )
-            return self.urlopen(
+            return self._retry(
+                delay,
                 method,
                 url,
                 body,
@@ -854,9 +1202,13 @@ class HTTPConnectionPool(ConnectionPool, RequestMethods):
                 return response
 
             response.drain_conn()
-            retries.sleep_for_retry(response)
+            if retries.defer:
+                delay = retries.get_retry_after(response) or 0
+            else:
+                retries.sleep_for_retry(response)
             log.debug("Redirecting %s -> %s", url, redirect_location)
-            return self.urlopen(
+            return self._retry(
+                delay,
                 method,
                 redirect_location,
                 body,
@@ -884,9 +1236,13 @@ class HTTPConnectionPool(ConnectionPool, RequestMethods):
                 return response
 
             response.drain_conn()
-            retries.sleep(response)
+            if retries.defer:
+                delay = retries.get_sleep_time(response)
+            else:
+                retries.sleep(response)
             log.debug("Retry: %s", url)
-            return self.urlopen(
+            return self._retry(
+                delay,
                 method,
                 url,
                 body,
@@ -917,6 +1273,12 @@ class HTTPSConnectionPool(HTTPConnectionPool):
     ``ca_cert_dir``, ``ssl_version``, ``key_password`` are only used if :mod:`ssl`
     is available and are fed into :meth:`urllib3.util.ssl_wrap_socket` to upgrade
     the connection socket into an SSL socket.
+
+    Unless an ``ssl_context`` is given, connections share a context from
+    :func:`urllib3.util.ssl_.cached_urllib3_context`, so certificates are
+    loaded once per set of settings rather than once per connection. New
+    connections resume the TLS session of the last connection of the pool
+    when the server allows it, which saves a full handshake.
     """
 
     scheme = "https"
@@ -970,6 +1332,47 @@ class HTTPSConnectionPool(HTTPConnectionPool):
         self.ssl_version = ssl_version
         self.assert_hostname = assert_hostname
         self.assert_fingerprint = assert_fingerprint
+        # (ssl_context, ssl.SSLSession) of the last connection
+        self._tls_session = None
+
+    def _ssl_context(self):
+        """Return the shared context for the settings of this pool."""
+        return cached_urllib3_context(
+            ssl_version=resolve_ssl_version(self.ssl_version),
+            cert_reqs=resolve_cert_reqs(self.cert_reqs),
+            ca_certs=self.ca_certs,
+            ca_cert_dir=self.ca_cert_dir,
+            ca_cert_data=self.conn_kw.get("ca_cert_data"),
+            certfile=self.cert_file,
+            keyfile=self.key_file,
+            key_password=self.key_password,
+        )
+
+    def _connect(self, conn):
+        # Offer the last session to util.ssl_.ssl_wrap_socket()
+        connect_context.tls_session = self._tls_session
+        try:
+            super(HTTPSConnectionPool, self)._connect(conn)
+        finally:
+            connect_context.tls_session = None
+        # Kept because httplib drops conn.sock as soon as it has read the
+        # headers of a response that closes the connection.
+        conn._pool_tls_socket = conn.sock
+        self._remember_tls_session(conn)
+
+    def _make_request(self, conn, *args, **kwargs):
+        response = super(HTTPSConnectionPool, self)._make_request(
+            conn, *args, **kwargs
+        )
+        # TLS 1.3 servers send their session tickets after the handshake,
+        # they have been read along with the response headers.
+        self._remember_tls_session(conn)
+        return response
+
+    def _remember_tls_session(self, conn):
+        session = getattr(getattr(conn, "_pool_tls_socket", None), "session", None)
+        if session is not None:
+            self._tls_session = (conn.ssl_context, session)
 
     def _prepare_conn(self, conn):
         """
@@ -1004,7 +1407,7 @@ class HTTPSConnectionPool(HTTPConnectionPool):
         if self.proxy.scheme == "https":
             conn.tls_in_tls_required = True
 
-        conn.connect()
+        self._connect(conn)
 
     def _new_conn(self):
         """
@@ -1029,6 +1432,10 @@ class HTTPSConnectionPool(HTTPConnectionPool):
             actual_host = self.proxy.host
             actual_port = self.proxy.port
 
+        conn_kw = self.conn_kw
+        if conn_kw.get("ssl_context") is None:
+            conn_kw = dict(conn_kw, ssl_context=self._ssl_context())
+
         conn = self.ConnectionCls(
             host=actual_host,
             port=actual_port,
@@ -1037,7 +1444,7 @@ class HTTPSConnectionPool(HTTPConnectionPool):
             cert_file=self.cert_file,
             key_file=self.key_file,
             key_password=self.key_password,
-            **self.conn_kw
+            **conn_kw
         )
 
         return self._prepare_conn(conn)
@@ -1050,7 +1457,7 @@ class HTTPSConnectionPool(HTTPConnectionPool):
 
         # Force connect early to allow us to validate the connection.
         if not getattr(conn, "sock", None):  # AppEngine might not have  `.sock`
-            conn.connect()
+            self._connect(conn)
 
         if not conn.is_verified:
             warnings.warn(
@@ -1121,6 +1528,23 @@ def _normalize_host(host, scheme):
     return host
 
 
+def _maintain_pool(pool_ref, stop, interval):
+    """
+    Body of the maintenance thread of a pool. Only a weak reference to the
+    pool is held between rounds so the thread never keeps it alive.
+    """
+    while not stop.wait(interval):
+        pool = pool_ref()
+        if pool is None or pool.pool is None:
+            return
+        try:
+            pool.evict_stale()
+            pool.prewarm()
+        except Exception:
+            log.debug("Pool maintenance failed: %s", pool.host, exc_info=True)
+        del pool
+
+
 def _close_pool_connections(pool):
     """Drains a queue of connections and closes each one."""
     try:
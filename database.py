@@ -1,7 +1,6 @@
 import sqlite3
 from datetime import datetime
 import os
-import cv2
 
 class Database:
     def __init__(self, db_file="attendance.db"):
@@ -13,6 +12,10 @@ class Database:
         conn = sqlite3.connect(self.db_file)
         cursor = conn.cursor()
 
+        # Let maintenance return deleted pages without a full VACUUM
+        # (only takes effect on a new database)
+        cursor.execute("PRAGMA auto_vacuum = INCREMENTAL")
+
         # Create students table
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS students (
@@ -48,6 +51,21 @@ class Database:
             )
         ''')
 
+        # Index attendance by date for range reports
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_attendance_date
+            ON attendance (date)
+        ''')
+
+        # Create face encodings table (one 128-d encoding per student)
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS face_encodings (
+                student_id TEXT PRIMARY KEY,
+                encoding BLOB NOT NULL,
+                FOREIGN KEY (student_id) REFERENCES students(id)
+            )
+        ''')
+
         conn.commit()
         conn.close()
 
@@ -252,6 +270,7 @@ class Database:
             
             # Delete attendance records first (due to foreign key constraint)
             cursor.execute("DELETE FROM attendance WHERE student_id = ?", (student_id,))
+            cursor.execute("DELETE FROM face_encodings WHERE student_id = ?", (student_id,))
             
             # Delete student
             cursor.execute("DELETE FROM students WHERE id = ?", (student_id,))
@@ -264,6 +283,19 @@ class Database:
         finally:
             conn.close()
 
+    def get_face_encodings(self):
+        """Get stored face encodings as (student_id, name, encoding bytes)"""
+        conn = sqlite3.connect(self.db_file)
+        cursor = conn.cursor()
+        cursor.execute('''
+            SELECT f.student_id, s.name, f.encoding
+            FROM face_encodings f
+            JOIN students s ON s.id = f.student_id
+        ''')
+        encodings = cursor.fetchall()
+        conn.close()
+        return encodings
+
     def get_student_by_user_id(self, user_id):
         """Get student information by user ID"""
         conn = sqlite3.connect(self.db_file)
@@ -286,6 +318,7 @@ class Database:
                     os.makedirs('photos')
                 
                 # Save photo to file
+                import cv2
                 photo_path = f'photos/{student_id}.jpg'
                 cv2.imwrite(photo_path, photo)
                 
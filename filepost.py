@@ -2,6 +2,7 @@ from __future__ import absolute_import
 
 import binascii
 import codecs
+import io
 import os
 from io import BytesIO
 
@@ -96,3 +97,196 @@ def encode_multipart_formdata(fields, boundary=None):
     content_type = str("multipart/form-data; boundary=%s" % boundary)
 
     return body.getvalue(), content_type
+
+
+def _remaining_length(fileobj):
+    """
+    Number of bytes left to read from ``fileobj``, which must be a binary
+    file-like object that supports ``tell()``.
+    """
+    position = fileobj.tell()
+    try:
+        return os.fstat(fileobj.fileno()).st_size - position
+    except (AttributeError, OSError, io.UnsupportedOperation):
+        pass
+    fileobj.seek(0, 2)
+    end = fileobj.tell()
+    fileobj.seek(position)
+    return end - position
+
+
+class _FilePart(object):
+    """
+    A file field payload that is read lazily when the body is streamed.
+    """
+
+    def __init__(self, fileobj):
+        self.fileobj = fileobj
+        self.start = fileobj.tell()
+        self.length = _remaining_length(fileobj)
+
+    def __len__(self):
+        return self.length
+
+    def iter_chunks(self, chunk_size):
+        self.fileobj.seek(self.start)
+        remaining = self.length
+        while remaining > 0:
+            chunk = self.fileobj.read(min(chunk_size, remaining))
+            if not chunk:
+                raise ValueError(
+                    "File field %r ended %d bytes before its declared length."
+                    % (getattr(self.fileobj, "name", self.fileobj), remaining)
+                )
+            remaining -= len(chunk)
+            yield chunk
+
+
+class MultipartEncoder(object):
+    """
+    A multipart/form-data body that is produced while it is being sent.
+
+    Unlike :func:`encode_multipart_formdata`, file payloads are not copied
+    into memory: any field whose data is a binary file-like object (for
+    example ``('archive.zip', open('archive.zip', 'rb'))``) is read in
+    ``chunk_size`` pieces only when the body is consumed. The total size is
+    computed up front so the request can be sent with a ``Content-Length``
+    instead of chunked encoding.
+
+    The encoder is file-like (``read``, ``tell`` and ``seek``) so it can be
+    passed directly as ``body`` to
+    :meth:`~urllib3.connectionpool.HTTPConnectionPool.urlopen`, which will
+    rewind it on retries and redirects::
+
+        body = MultipartEncoder({"archive": ("archive.zip", open(path, "rb"))})
+        pool.urlopen("POST", "/upload", body=body, headers=body.headers)
+
+    :param fields:
+        Dictionary of fields or list of (key, :class:`~urllib3.fields.RequestField`).
+
+    :param boundary:
+        If not specified, then a random boundary will be generated using
+        :func:`urllib3.filepost.choose_boundary`.
+
+    :param chunk_size:
+        How many bytes to read from file payloads at a time.
+    """
+
+    def __init__(self, fields, boundary=None, chunk_size=64 * 1024):
+        if boundary is None:
+            boundary = choose_boundary()
+        self.boundary = boundary
+        self.chunk_size = chunk_size
+        self.content_type = str("multipart/form-data; boundary=%s" % boundary)
+
+        # Consecutive in-memory pieces are merged into one bytes part so
+        # that only file payloads are read lazily.
+        self._parts = []
+        pending = BytesIO()
+        for field in iter_field_objects(fields):
+            pending.write(b("--%s\r\n" % (boundary)))
+            writer(pending).write(field.render_headers())
+            data = field.data
+
+            if isinstance(data, int):
+                data = str(data)  # Backwards compatibility
+
+            if isinstance(data, six.text_type):
+                writer(pending).write(data)
+            elif hasattr(data, "read"):
+                self._parts.append(pending.getvalue())
+                self._parts.append(_FilePart(data))
+                pending = BytesIO()
+            else:
+                pending.write(data)
+
+            pending.write(b"\r\n")
+
+        pending.write(b("--%s--\r\n" % (boundary)))
+        self._parts.append(pending.getvalue())
+
+        self.content_length = sum(len(part) for part in self._parts)
+        self._rewind()
+
+    @property
+    def headers(self):
+        """
+        The ``Content-Type`` and ``Content-Length`` headers for this body.
+        """
+        return {
+            "Content-Type": self.content_type,
+            "Content-Length": str(self.content_length),
+        }
+
+    def __len__(self):
+        return self.content_length
+
+    def _iter_parts(self):
+        for part in self._parts:
+            if isinstance(part, _FilePart):
+                for chunk in part.iter_chunks(self.chunk_size):
+                    yield chunk
+            elif part:
+                yield part
+
+    def _rewind(self):
+        self._chunks = self._iter_parts()
+        self._pending = memoryview(b"")
+        self._position = 0
+
+    def read(self, amt=-1):
+        """
+        Read up to ``amt`` bytes of the encoded body, or all of the remaining
+        body when ``amt`` is negative or ``None``.
+        """
+        if amt is None or amt < 0:
+            amt = self.content_length - self._position
+
+        pieces = []
+        needed = amt
+        while needed > 0:
+            if not len(self._pending):
+                chunk = next(self._chunks, None)
+                if chunk is None:
+                    break
+                self._pending = memoryview(chunk)
+            piece = self._pending[:needed]
+            self._pending = self._pending[needed:]
+            pieces.append(piece.tobytes())
+            needed -= len(piece)
+
+        data = b"".join(pieces)
+        self._position += len(data)
+        return data
+
+    def __iter__(self):
+        while True:
+            chunk = self.read(self.chunk_size)
+            if not chunk:
+                return
+            yield chunk
+
+    def tell(self):
+        return self._position
+
+    def seek(self, offset, whence=0):
+        """
+        Move to ``offset``. Seeking backwards restarts the body, which
+        requires file payloads to be seekable.
+        """
+        if whence == 1:
+            offset += self._position
+        elif whence == 2:
+            offset += self.content_length
+        if offset < 0:
+            raise ValueError("Negative seek position %d" % offset)
+
+        if offset < self._position:
+            for part in self._parts:
+                if isinstance(part, _FilePart):
+                    part.fileobj.seek(part.start)
+            self._rewind()
+        while self._position < offset:
+            if not self.read(min(self.chunk_size, offset - self._position)):
+                break
+        return self._position
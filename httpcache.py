@@ -0,0 +1,554 @@
+from __future__ import absolute_import
+
+import collections
+import email.utils
+import hashlib
+import io
+import json
+import logging
+import os
+import re
+import tempfile
+import threading
+import time
+
+from ._collections import HTTPHeaderDict
+from .packages import six
+from .response import HTTPResponse
+from .util.retry import RetryAt
+
+__all__ = ["CachedResponse", "FileCache", "HTTPCache", "MemoryCache"]
+
+
+log = logging.getLogger(__name__)
+
+#: Statuses of responses that may be stored, RFC 7231, Section 6.1
+CACHEABLE_STATUSES = frozenset([200, 203, 300, 301, 308, 404, 410])
+
+#: Methods that do not invalidate a stored response, RFC 7234, Section 4.4
+SAFE_METHODS = frozenset(["GET", "HEAD", "OPTIONS", "TRACE"])
+
+#: Cap of the heuristic freshness of responses with only a Last-Modified
+HEURISTIC_FRESHNESS_MAX = 24 * 60 * 60
+
+# Headers of a 304 that must not replace those of the stored response
+_NOT_UPDATED_HEADERS = frozenset(
+    ["content-encoding", "content-length", "content-range", "transfer-encoding"]
+)
+
+# Request headers that make the caller handle validation or ranges itself
+_BYPASS_HEADERS = (
+    "If-Match",
+    "If-Modified-Since",
+    "If-None-Match",
+    "If-Range",
+    "Range",
+)
+
+_CACHE_CONTROL_RE = re.compile(
+    r'\s*([^\s=,]+)\s*(?:=\s*("[^"]*"|[^\s,]*))?\s*(?:,|$)'
+)
+
+
+def parse_cache_control(value):
+    """
+    Parse a Cache-Control header into a dict of lower-case directives and
+    their values, None for directives without one.
+    """
+    directives = {}
+    for name, argument in _CACHE_CONTROL_RE.findall(value or ""):
+        directives[name.lower()] = argument.strip('"') if argument else None
+    return directives
+
+
+def _parse_date(value):
+    """Return an HTTP date as a timestamp, or None if it is invalid."""
+    parsed = email.utils.parsedate_tz(value) if value else None
+    if parsed is None:
+        return None
+    return email.utils.mktime_tz(parsed)
+
+
+def _parse_int(value):
+    """Return a non-negative integer value, or None if it is invalid."""
+    try:
+        return max(int(value), 0)
+    except (TypeError, ValueError):
+        return None
+
+
+class _PrefixedBody(object):
+    """
+    The body of a response of which ``prefix`` was already read, to be read
+    again from the start. Does not expose ``fp``, so that the response
+    reads through :meth:`read` rather than parsing chunks itself.
+    """
+
+    def __init__(self, prefix, fp):
+        self._prefix = prefix
+        self._fp = fp
+
+    def read(self, amt=None):
+        if not self._prefix:
+            return self._fp.read() if amt is None else self._fp.read(amt)
+        if amt is None:
+            data, self._prefix = self._prefix + self._fp.read(), b""
+        else:
+            data, self._prefix = self._prefix[:amt], self._prefix[amt:]
+        return data
+
+    def isclosed(self):
+        return not self._prefix and self._fp.isclosed()
+
+    def close(self):
+        self._prefix = b""
+        self._fp.close()
+
+    def fileno(self):
+        return self._fp.fileno()
+
+    def flush(self):
+        return self._fp.flush()
+
+
+class CachedResponse(
+    collections.namedtuple(
+        "CachedResponse",
+        ["status", "reason", "version", "headers", "body", "vary", "response_time"],
+    )
+):
+    """
+    A stored response: ``headers`` is a list of ``(name, value)`` pairs,
+    ``body`` the undecoded body, ``vary`` the request header values it was
+    selected with and ``response_time`` the time it was received or last
+    revalidated, as a timestamp.
+    """
+
+    __slots__ = ()
+
+    @property
+    def size(self):
+        return len(self.body)
+
+
+class MemoryCache(object):
+    """
+    Least-recently-used store of responses in memory, bounded by the size
+    of their bodies.
+
+    :param int max_bytes:
+        Bytes of bodies kept. Larger responses are not stored.
+    """
+
+    def __init__(self, max_bytes=64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                self._entries[key] = entry
+            return entry
+
+    def set(self, key, entry):
+        with self._lock:
+            self._discard(key)
+            if entry.size > self.max_bytes:
+                return
+            self._entries[key] = entry
+            self.size += entry.size
+            while self.size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.size -= evicted.size
+
+    def delete(self, key):
+        with self._lock:
+            self._discard(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+    def _discard(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.size -= entry.size
+
+
+class FileCache(object):
+    """
+    Store of responses in a directory, one file per response, so they
+    outlive the process and can be shared between processes. The least
+    recently used files are removed once they take more than
+    ``max_bytes``.
+
+    :param str directory:
+        Where to keep the files; created if missing.
+
+    :param int max_bytes:
+        Bytes of files kept. Larger responses are not stored.
+    """
+
+    suffix = ".entry"
+
+    def __init__(self, directory, max_bytes=256 * 1024 * 1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        try:
+            os.makedirs(directory)
+        except OSError:
+            if not os.path.isdir(directory):
+                raise
+        self.size = sum(size for _, size, _ in self._files())
+
+    def _path(self, key):
+        digest = hashlib.sha256(six.ensure_binary(key)).hexdigest()
+        return os.path.join(self.directory, digest + self.suffix)
+
+    def _files(self):
+        """List the ``(mtime, size, path)`` of the stored files."""
+        files = []
+        for name in os.listdir(self.directory):
+            if not name.endswith(self.suffix):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, path))
+        return files
+
+    def get(self, key):
+        path = self._path(key)
+        try:
+            with open(path, "rb") as fp:
+                meta = json.loads(fp.readline().decode("utf-8"))
+                body = fp.read()
+            os.utime(path, None)
+        except (IOError, OSError, ValueError):
+            return None
+        if meta.get("key") != key:
+            return None
+        return CachedResponse(
+            status=meta["status"],
+            reason=meta["reason"],
+            version=meta["version"],
+            headers=[tuple(header) for header in meta["headers"]],
+            body=body,
+            vary=[tuple(value) for value in meta["vary"]],
+            response_time=meta["response_time"],
+        )
+
+    def set(self, key, entry):
+        meta = dict(entry._asdict(), key=key)
+        del meta["body"]
+        data = json.dumps(meta).encode("utf-8") + b"\n" + entry.body
+        if len(data) > self.max_bytes:
+            self.delete(key)
+            return
+
+        path = self._path(key)
+        fd, temp = tempfile.mkstemp(dir=self.directory)
+        try:
+            with os.fdopen(fd, "wb") as fp:
+                fp.write(data)
+            with self._lock:
+                replaced = self._size_of(path)
+                getattr(os, "replace", os.rename)(temp, path)
+                self.size += len(data) - replaced
+                if self.size > self.max_bytes:
+                    self._evict()
+        except (IOError, OSError):
+            log.warning("Could not store a response in %s", self.directory)
+            try:
+                os.remove(temp)
+            except OSError:
+                pass
+
+    def delete(self, key):
+        path = self._path(key)
+        with self._lock:
+            size = self._size_of(path)
+            try:
+                os.remove(path)
+            except OSError:
+                return
+            self.size -= size
+
+    def clear(self):
+        with self._lock:
+            for _, _, path in self._files():
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            self.size = 0
+
+    def _size_of(self, path):
+        try:
+            return os.path.getsize(path)
+        except OSError:
+            return 0
+
+    def _evict(self):
+        # Other processes may write to the directory too, so start over
+        # from what is on disk.
+        files = sorted(self._files())
+        self.size = sum(size for _, size, _ in files)
+        for _, size, path in files:
+            if self.size <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            self.size -= size
+
+
+class HTTPCache(object):
+    """
+    Private HTTP cache in front of :meth:`urllib3.PoolManager.urlopen`,
+    enabled with ``PoolManager(cache=HTTPCache())``.
+
+    GET responses are stored per URL and, for as long as they are fresh
+    according to their Cache-Control ``max-age`` or Expires header, or
+    heuristically for a tenth of the time since their Last-Modified date,
+    requests are answered from the store without contacting the server.
+    Stale responses with an ETag or Last-Modified header are revalidated
+    with a conditional request, and a 304 answer refreshes them. Vary,
+    ``no-store``, ``no-cache`` and request ``max-age`` are honoured, and
+    requests with their own validators or a Range header are sent as they
+    are. Successful requests with other methods than GET, HEAD, OPTIONS
+    and TRACE remove the stored response of their URL.
+
+    Responses answered from the store without contacting the server have
+    their ``from_cache`` attribute set to True.
+
+    :param backend:
+        Where to store responses: a :class:`MemoryCache` (the default), a
+        :class:`FileCache` or any object with the same ``get``, ``set``,
+        ``delete`` and ``clear`` methods.
+    """
+
+    def __init__(self, backend=None):
+        self.backend = MemoryCache() if backend is None else backend
+        self.hits = 0
+        self.misses = 0
+        self.revalidated = 0
+
+    def urlopen(self, send, method, url, **kw):
+        """
+        Answer a request for ``url`` from the store, or send it with
+        ``send(**kw)``, revalidating the stored response if there is one.
+        """
+        method = method.upper()
+        if method != "GET":
+            response = send(**kw)
+            if (
+                method not in SAFE_METHODS
+                and not isinstance(response, RetryAt)
+                and response.status < 400
+            ):
+                self.backend.delete(url)
+            return response
+
+        headers = HTTPHeaderDict(kw.get("headers") or {})
+        request_cc = parse_cache_control(headers.get("Cache-Control"))
+        if "no-store" in request_cc or any(
+            name in headers for name in _BYPASS_HEADERS
+        ):
+            return send(**kw)
+
+        entry = self.backend.get(url)
+        if entry is not None and not all(
+            headers.get(name) == value for name, value in entry.vary
+        ):
+            entry = None
+        if entry is not None:
+            if "no-cache" not in request_cc and self._is_fresh(entry, request_cc):
+                self.hits += 1
+                response = self._response(entry, method, url, kw)
+                response.from_cache = True
+                return response
+            stored = HTTPHeaderDict(entry.headers)
+            if "ETag" in stored:
+                headers["If-None-Match"] = stored["ETag"]
+            if "Last-Modified" in stored:
+                headers["If-Modified-Since"] = stored["Last-Modified"]
+            if "If-None-Match" in headers or "If-Modified-Since" in headers:
+                kw = dict(kw, headers=headers)
+            else:
+                entry = None
+
+        response = send(**dict(kw, preload_content=False))
+        if isinstance(response, RetryAt):
+            return response
+
+        if entry is not None and response.status == 304:
+            response.drain_conn()
+            response.release_conn()
+            entry = self._refresh(entry, response)
+            self.backend.set(url, entry)
+            self.revalidated += 1
+            return self._response(entry, method, url, kw)
+
+        self.misses += 1
+        if self._is_storable(response, headers, request_cc):
+            body = self._read_body(response)
+            if body is None:
+                # Too large to store, pass it on as it is
+                if kw.get("preload_content", True):
+                    response.read(
+                        decode_content=kw.get("decode_content", True),
+                        cache_content=True,
+                    )
+                return response
+            vary = [
+                (name.strip().lower(), headers.get(name.strip()))
+                for name in response.headers.get("Vary", "").split(",")
+                if name.strip()
+            ]
+            entry = CachedResponse(
+                status=response.status,
+                reason=response.reason,
+                version=response.version,
+                headers=list(response.headers.iteritems()),
+                body=body,
+                vary=vary,
+                response_time=time.time(),
+            )
+            self.backend.set(url, entry)
+            return self._response(entry, method, url, kw)
+
+        if kw.get("preload_content", True):
+            response.read(
+                decode_content=kw.get("decode_content", True), cache_content=True
+            )
+        return response
+
+    def _is_storable(self, response, headers, request_cc):
+        if response.status not in CACHEABLE_STATUSES:
+            return False
+        cc = parse_cache_control(response.headers.get("Cache-Control"))
+        if "no-store" in cc:
+            return False
+        if "Authorization" in headers and not (
+            "public" in cc or "must-revalidate" in cc or "s-maxage" in cc
+        ):
+            return False
+        if "*" in response.headers.get("Vary", ""):
+            return False
+        length = _parse_int(response.headers.get("Content-Length"))
+        max_bytes = getattr(self.backend, "max_bytes", None)
+        if length is not None and max_bytes is not None and length > max_bytes:
+            return False
+        return (
+            "max-age" in cc
+            or "Expires" in response.headers
+            or "ETag" in response.headers
+            or "Last-Modified" in response.headers
+        )
+
+    def _read_body(self, response):
+        """
+        Read the undecoded body of ``response`` and release its connection,
+        or return None if it would not fit in the backend. Then the body is
+        left to be read from the response, from the start.
+        """
+        max_bytes = getattr(self.backend, "max_bytes", None)
+        if max_bytes is None:
+            try:
+                return response.read(decode_content=False)
+            finally:
+                response.release_conn()
+
+        chunks = []
+        size = 0
+        try:
+            while size <= max_bytes:
+                amt = min(max_bytes - size + 1, 65536)
+                chunk = response.read(amt, decode_content=False)
+                if not chunk:
+                    response.release_conn()
+                    return b"".join(chunks)
+                chunks.append(chunk)
+                size += len(chunk)
+        except BaseException:
+            response.release_conn()
+            raise
+
+        prefix = b"".join(chunks)
+        response._fp = _PrefixedBody(prefix, response._fp)
+        response._fp_bytes_read -= len(prefix)
+        if response.length_remaining is not None:
+            response.length_remaining += len(prefix)
+        return None
+
+    def _is_fresh(self, entry, request_cc):
+        headers = HTTPHeaderDict(entry.headers)
+        age = self._age(entry, headers)
+        if "max-age" in request_cc:
+            max_age = _parse_int(request_cc["max-age"])
+            if max_age is None or age > max_age:
+                return False
+        return self._lifetime(entry, headers) > age
+
+    def _lifetime(self, entry, headers):
+        """Seconds a response stays fresh, RFC 7234, Section 4.2.1."""
+        cc = parse_cache_control(headers.get("Cache-Control"))
+        if "no-cache" in cc:
+            return 0
+        if "max-age" in cc:
+            return _parse_int(cc["max-age"]) or 0
+        date = _parse_date(headers.get("Date")) or entry.response_time
+        if "Expires" in headers:
+            expires = _parse_date(headers["Expires"])
+            return 0 if expires is None else expires - date
+        last_modified = _parse_date(headers.get("Last-Modified"))
+        if last_modified is not None:
+            return min((date - last_modified) / 10.0, HEURISTIC_FRESHNESS_MAX)
+        return 0
+
+    def _age(self, entry, headers):
+        """Current age of a response, RFC 7234, Section 4.2.3."""
+        date = _parse_date(headers.get("Date")) or entry.response_time
+        apparent_age = max(entry.response_time - date, 0)
+        age = max(apparent_age, _parse_int(headers.get("Age")) or 0)
+        return age + time.time() - entry.response_time
+
+    def _refresh(self, entry, response):
+        """Update a stored response with the headers of a 304 for it."""
+        headers = HTTPHeaderDict(entry.headers)
+        for name in set(response.headers):
+            if name.lower() in _NOT_UPDATED_HEADERS:
+                continue
+            headers.discard(name)
+            for value in response.headers.getlist(name):
+                headers.add(name, value)
+        return entry._replace(
+            headers=list(headers.iteritems()), response_time=time.time()
+        )
+
+    def _response(self, entry, method, url, kw):
+        return HTTPResponse(
+            body=io.BytesIO(entry.body),
+            headers=HTTPHeaderDict(entry.headers),
+            status=entry.status,
+            version=entry.version,
+            reason=entry.reason,
+            preload_content=kw.get("preload_content", True),
+            decode_content=kw.get("decode_content", True),
+            enforce_content_length=kw.get("enforce_content_length", False),
+            request_method=method,
+            request_url=url,
+        )
+
+    def clear(self):
+        """Remove all stored responses."""
+        self.backend.clear()
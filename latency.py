@@ -0,0 +1,91 @@
+import json
+import time
+from collections import deque
+
+PIPELINE_STAGES = (
+    "capture",
+    "convert",
+    "detect",
+    "encode",
+    "match",
+    "mark_attendance",
+    "table_update",
+    "total",
+)
+
+
+class StageTimer:
+    """Rolling latency statistics for the stages of the kiosk pipeline.
+
+    Hot paths thread a timestamp through the stages::
+
+        t = timer.start()
+        ...capture...
+        t = timer.lap("capture", t)
+
+    Timestamps come from time.perf_counter(), which is monotonic. While the
+    timer is disabled start() and lap() return immediately without reading
+    the clock, so instrumented code costs one method call per stage.
+    """
+
+    def __init__(self, stages=PIPELINE_STAGES, window=1000, enabled=False):
+        self.stages = tuple(stages)
+        self.window = window
+        self.enabled = enabled
+        self._samples = {stage: deque(maxlen=window) for stage in self.stages}
+
+    def start(self):
+        if not self.enabled:
+            return 0.0
+        return time.perf_counter()
+
+    def lap(self, stage, started):
+        """Record the time since ``started`` for ``stage`` and return the current time"""
+        if not self.enabled:
+            return 0.0
+        now = time.perf_counter()
+        self.record(stage, now - started)
+        return now
+
+    def record(self, stage, seconds):
+        if not self.enabled:
+            return
+        samples = self._samples.get(stage)
+        if samples is None:
+            samples = self._samples[stage] = deque(maxlen=self.window)
+        samples.append(seconds)
+
+    def reset(self):
+        for samples in self._samples.values():
+            samples.clear()
+
+    def percentiles(self, stage):
+        """Return (p50, p95, p99) for a stage in milliseconds, or None without samples"""
+        samples = sorted(self._samples.get(stage, ()))
+        if not samples:
+            return None
+        last = len(samples) - 1
+        return tuple(samples[round(q * last)] * 1000.0 for q in (0.50, 0.95, 0.99))
+
+    def snapshot(self):
+        """Return per-stage sample counts and percentiles in milliseconds"""
+        result = {}
+        for stage, samples in self._samples.items():
+            values = self.percentiles(stage)
+            if values is None:
+                continue
+            p50, p95, p99 = values
+            result[stage] = {"count": len(samples), "p50_ms": p50, "p95_ms": p95, "p99_ms": p99}
+        return result
+
+    def dump_json(self, path):
+        """Write the current snapshot to a JSON file"""
+        with open(path, "w") as f:
+            json.dump({"window": self.window, "stages": self.snapshot()}, f, indent=2)
+
+    def format_overlay(self):
+        """Render the snapshot as text for the on-screen overlay"""
+        lines = ["stage            p50     p95     p99 ms"]
+        for stage, values in self.snapshot().items():
+            lines.append(f"{stage:<15}{values['p50_ms']:6.1f}  {values['p95_ms']:6.1f}  {values['p99_ms']:6.1f}")
+        return "\n".join(lines)
@@ -0,0 +1,263 @@
+import argparse
+import os
+import sqlite3
+import sys
+import threading
+import time
+from datetime import datetime
+
+AUTO_VACUUM_MODES = {0: "none", 1: "full", 2: "incremental"}
+
+
+class DatabaseMaintenance:
+    """Backup, compaction and health checks for the attendance database.
+
+    Every operation opens its own short-lived connection with a busy
+    timeout, so it waits for kiosks that are writing instead of failing,
+    and never holds a lock longer than one step.
+    """
+
+    def __init__(self, db_file="attendance.db", busy_timeout=30.0):
+        self.db_file = db_file
+        self.busy_timeout = busy_timeout
+
+    def _connect(self):
+        return sqlite3.connect(self.db_file, timeout=self.busy_timeout, isolation_level=None)
+
+    def stats(self):
+        """Return page usage and auto_vacuum mode of the database"""
+        conn = self._connect()
+        try:
+            page_size = conn.execute("PRAGMA page_size").fetchone()[0]
+            page_count = conn.execute("PRAGMA page_count").fetchone()[0]
+            freelist_count = conn.execute("PRAGMA freelist_count").fetchone()[0]
+            auto_vacuum = conn.execute("PRAGMA auto_vacuum").fetchone()[0]
+        finally:
+            conn.close()
+        return {
+            "page_size": page_size,
+            "page_count": page_count,
+            "freelist_count": freelist_count,
+            "file_size": page_size * page_count,
+            "free_bytes": page_size * freelist_count,
+            "auto_vacuum": AUTO_VACUUM_MODES.get(auto_vacuum, str(auto_vacuum)),
+        }
+
+    def backup(self, dest_file, pages=256, sleep=0.01, progress=None):
+        """Copy the live database to dest_file with the sqlite3 backup API.
+
+        The copy is made ``pages`` pages at a time, sleeping ``sleep``
+        seconds between steps so writers get the lock in between. If the
+        source changes during the backup SQLite restarts the copy, so the
+        result is always a consistent snapshot. ``progress`` receives
+        (remaining, total) page counts after each step.
+        """
+        tmp_file = dest_file + ".part"
+        if os.path.exists(tmp_file):
+            os.remove(tmp_file)
+
+        def report(status, remaining, total):
+            if progress is not None:
+                progress(remaining, total)
+
+        source = self._connect()
+        target = sqlite3.connect(tmp_file)
+        try:
+            source.backup(target, pages=pages, progress=report, sleep=sleep)
+        except Exception:
+            target.close()
+            os.remove(tmp_file)
+            raise
+        finally:
+            source.close()
+        target.close()
+        os.replace(tmp_file, dest_file)
+        return dest_file
+
+    def enable_incremental_vacuum(self):
+        """Switch the database to auto_vacuum=INCREMENTAL.
+
+        Changing the mode of an existing database needs one full VACUUM,
+        which rewrites the file and blocks writers while it runs, so this is
+        meant to be done once outside school hours.
+        """
+        conn = self._connect()
+        try:
+            conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+            if conn.execute("PRAGMA auto_vacuum").fetchone()[0] != 2:
+                conn.execute("VACUUM")
+        finally:
+            conn.close()
+
+    def incremental_vacuum(self, pages=None):
+        """Return free pages to the filesystem and the number released.
+
+        Without incremental auto_vacuum this does nothing; call
+        enable_incremental_vacuum() first.
+        """
+        conn = self._connect()
+        try:
+            before = conn.execute("PRAGMA freelist_count").fetchone()[0]
+            # incremental_vacuum frees one page per step; executescript()
+            # steps the pragma to completion where execute() would stop early
+            if pages is None:
+                conn.executescript("PRAGMA incremental_vacuum;")
+            else:
+                conn.executescript(f"PRAGMA incremental_vacuum({int(pages)});")
+            after = conn.execute("PRAGMA freelist_count").fetchone()[0]
+        finally:
+            conn.close()
+        return before - after
+
+    def vacuum(self):
+        """Rebuild the whole database file (blocks writers while running)"""
+        conn = self._connect()
+        try:
+            conn.execute("VACUUM")
+        finally:
+            conn.close()
+
+    def analyze(self):
+        """Recollect query planner statistics for all tables and indexes"""
+        conn = self._connect()
+        try:
+            conn.execute("ANALYZE")
+        finally:
+            conn.close()
+
+    def optimize(self):
+        """Run PRAGMA optimize, which only re-analyzes tables that need it"""
+        conn = self._connect()
+        try:
+            conn.execute("PRAGMA optimize").fetchall()
+        finally:
+            conn.close()
+
+    def integrity_check(self, quick=False):
+        """Return a list of problems found; an empty list means the database is healthy"""
+        pragma = "quick_check" if quick else "integrity_check"
+        conn = self._connect()
+        try:
+            results = [row[0] for row in conn.execute(f"PRAGMA {pragma}")]
+            results += ["foreign key violation in {0} (rowid {1}) -> {2}".format(*row)
+                        for row in conn.execute("PRAGMA foreign_key_check")]
+        finally:
+            conn.close()
+        return [result for result in results if result != "ok"]
+
+    def run_routine(self, vacuum_pages=None):
+        """Run the routine maintenance pass: quick check, compaction, optimize"""
+        problems = self.integrity_check(quick=True)
+        if problems:
+            return {"problems": problems, "pages_released": 0}
+        released = self.incremental_vacuum(vacuum_pages)
+        self.optimize()
+        return {"problems": [], "pages_released": released}
+
+
+class MaintenanceScheduler(threading.Thread):
+    """Background thread that runs the routine pass and backups periodically.
+
+    Intended for the kiosk or GUI process: routine maintenance runs every
+    ``interval`` seconds and, when ``backup_dir`` is given, a timestamped
+    backup is written every ``backup_interval`` seconds.
+    """
+
+    def __init__(self, db_file="attendance.db", interval=3600, backup_dir=None,
+                 backup_interval=24 * 3600, on_error=None):
+        super().__init__(name="db-maintenance", daemon=True)
+        self.maintenance = DatabaseMaintenance(db_file)
+        self.interval = interval
+        self.backup_dir = backup_dir
+        self.backup_interval = backup_interval
+        self.on_error = on_error
+        self._stopped = threading.Event()
+
+    def stop(self):
+        self._stopped.set()
+
+    def run(self):
+        next_backup = time.monotonic()
+        while not self._stopped.wait(self.interval):
+            try:
+                self.maintenance.run_routine()
+                if self.backup_dir and time.monotonic() >= next_backup:
+                    os.makedirs(self.backup_dir, exist_ok=True)
+                    stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+                    self.maintenance.backup(os.path.join(self.backup_dir, f"attendance-{stamp}.db"))
+                    next_backup = time.monotonic() + self.backup_interval
+            except Exception as e:
+                if self.on_error is not None:
+                    self.on_error(e)
+                else:
+                    print(f"Error during database maintenance: {e}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Maintain the attendance database")
+    parser.add_argument("--db", default="attendance.db", help="database file (default: attendance.db)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    backup_parser = commands.add_parser("backup", help="online backup to a file")
+    backup_parser.add_argument("dest", help="backup file to write")
+    backup_parser.add_argument("--pages", type=int, default=256, help="pages copied per step")
+    backup_parser.add_argument("--sleep", type=float, default=0.01, help="seconds to pause between steps")
+
+    vacuum_parser = commands.add_parser("vacuum", help="release free pages")
+    vacuum_parser.add_argument("--pages", type=int, default=None, help="maximum pages to release")
+    vacuum_parser.add_argument("--full", action="store_true", help="rebuild the whole file (blocks writers)")
+
+    commands.add_parser("enable-incremental", help="switch to auto_vacuum=INCREMENTAL (runs VACUUM once)")
+    commands.add_parser("analyze", help="recollect query planner statistics")
+    commands.add_parser("optimize", help="run PRAGMA optimize")
+    check_parser = commands.add_parser("check", help="run an integrity check")
+    check_parser.add_argument("--quick", action="store_true", help="use quick_check")
+    commands.add_parser("stats", help="show page usage")
+    commands.add_parser("routine", help="quick check, incremental vacuum and optimize (for cron)")
+    args = parser.parse_args(argv)
+
+    maintenance = DatabaseMaintenance(args.db)
+    if args.command == "backup":
+        def show_progress(remaining, total):
+            done = total - remaining
+            sys.stderr.write(f"\rcopied {done}/{total} pages")
+            sys.stderr.flush()
+        maintenance.backup(args.dest, pages=args.pages, sleep=args.sleep, progress=show_progress)
+        sys.stderr.write("\n")
+        print(f"Backup written to {args.dest}")
+    elif args.command == "vacuum":
+        if args.full:
+            maintenance.vacuum()
+            print("Database rebuilt")
+        else:
+            released = maintenance.incremental_vacuum(args.pages)
+            print(f"Released {released} pages")
+    elif args.command == "enable-incremental":
+        maintenance.enable_incremental_vacuum()
+        print("auto_vacuum set to incremental")
+    elif args.command == "analyze":
+        maintenance.analyze()
+        print("Statistics updated")
+    elif args.command == "optimize":
+        maintenance.optimize()
+        print("Optimize finished")
+    elif args.command == "check":
+        problems = maintenance.integrity_check(quick=args.quick)
+        for problem in problems:
+            print(problem)
+        print("ok" if not problems else f"{len(problems)} problems found")
+        return 1 if problems else 0
+    elif args.command == "stats":
+        for key, value in maintenance.stats().items():
+            print(f"{key}: {value}")
+    elif args.command == "routine":
+        result = maintenance.run_routine()
+        for problem in result["problems"]:
+            print(problem)
+        print(f"Released {result['pages_released']} pages")
+        return 1 if result["problems"] else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
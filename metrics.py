@@ -0,0 +1,152 @@
+from __future__ import absolute_import
+
+import logging
+import threading
+import time
+from collections import deque
+
+__all__ = ["PoolMetrics"]
+
+log = logging.getLogger(__name__)
+
+clock = getattr(time, "perf_counter", time.time)
+
+#: Counters kept by every pool.
+COUNTERS = (
+    "connections_created",  # a socket was connected
+    "connections_reused",  # a request went out on an already connected socket
+    "connections_dropped",  # a pooled connection was found dead or stale
+    "connections_discarded",  # a connection could not be returned to the pool
+    "connect_failures",  # connecting raised an error
+    "checkouts",
+    "checkout_timeouts",  # no connection became free within pool_timeout
+    "requests",
+    "retries",
+    "retries_exhausted",
+)
+
+#: Timings kept by every pool, in seconds.
+TIMINGS = (
+    "checkout_wait",  # waiting for a connection from the pool
+    "dns",  # name resolution
+    "connect",  # TCP handshake, with the proxy for SOCKS
+    "socks_handshake",  # SOCKS greeting and authentication
+    "socks_connect",  # the SOCKS proxy connecting to the target
+    "tls",  # TLS handshake, including a proxy tunnel if any
+    "first_byte",  # request sent until the response headers are parsed
+    "total",  # checkout until the response headers are parsed
+)
+
+
+class _Timing(object):
+    __slots__ = ("count", "total", "max", "recent")
+
+    def __init__(self, window):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.recent = deque(maxlen=window)
+
+    def add(self, seconds):
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+        self.recent.append(seconds)
+
+    def summary(self):
+        result = {
+            "count": self.count,
+            "mean": self.total / self.count if self.count else 0.0,
+            "max": self.max,
+        }
+        recent = sorted(self.recent)
+        if recent:
+            last = len(recent) - 1
+            for name, q in (("p50", 0.50), ("p95", 0.95), ("p99", 0.99)):
+                result[name] = recent[int(round(q * last))]
+        return result
+
+
+class PoolMetrics(object):
+    """
+    Counters, timings and event hooks of a single connection pool.
+
+    Every pool owns one instance as ``pool.metrics``. Counters and timings
+    are always collected; they cost a lock acquisition per update.
+    Percentiles are computed over the last ``window`` samples of each
+    timing.
+
+    :param hooks:
+        Callables invoked as ``hook(event, pool, data)`` for every event,
+        where ``data`` is a dict describing it. Events are
+        ``"connection_created"``, ``"connection_reused"``,
+        ``"connection_dropped"``, ``"connection_discarded"``,
+        ``"connect_failed"``, ``"checkout"``, ``"request"`` and ``"retry"``.
+        Hooks run synchronously on the requesting thread, so they should be
+        quick; exceptions raised by a hook are logged and ignored.
+
+    :param window:
+        Number of recent samples kept per timing for percentiles.
+    """
+
+    def __init__(self, hooks=None, window=1024):
+        self.hooks = tuple(hooks or ())
+        self.window = window
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Zero all counters and drop all timing samples."""
+        with self._lock:
+            self.counters = dict.fromkeys(COUNTERS, 0)
+            self.timings = dict((name, _Timing(self.window)) for name in TIMINGS)
+
+    def record(self, event, pool, counters=(), timings=None, **data):
+        """
+        Bump ``counters``, add ``timings`` (a dict of seconds) and run the
+        hooks for ``event``.
+        """
+        with self._lock:
+            for name in counters:
+                self.counters[name] += 1
+            if timings:
+                for name, seconds in timings.items():
+                    if seconds is not None:
+                        self.timings[name].add(seconds)
+        if self.hooks:
+            if timings:
+                data.update(timings)
+            for hook in self.hooks:
+                try:
+                    hook(event, pool, data)
+                except Exception:
+                    log.warning("Metrics hook %r failed", hook, exc_info=True)
+
+    def snapshot(self, pool=None):
+        """
+        Return the counters and timing summaries as a plain dict. With
+        ``pool``, its identity and current occupancy are included.
+        """
+        with self._lock:
+            result = {
+                "counters": dict(self.counters),
+                "timings": dict(
+                    (name, timing.summary())
+                    for name, timing in self.timings.items()
+                    if timing.count
+                ),
+            }
+        if pool is not None:
+            result["scheme"] = pool.scheme
+            result["host"] = pool.host
+            result["port"] = pool.port
+            queue = pool.pool
+            if queue is not None:
+                with queue.mutex:
+                    result["idle_connections"] = sum(
+                        1 for conn in queue.queue if conn is not None
+                    )
+                    result["free_slots"] = len(queue.queue)
+                result["maxsize"] = queue.maxsize
+        return result
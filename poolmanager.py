@@ -4,7 +4,8 @@ import collections
 import functools
 import logging
 
-from ._collections import RecentlyUsedContainer
+from ._collections import ConcurrentRecentlyUsedContainer
+from .batch import run_batch
 from .connectionpool import HTTPConnectionPool, HTTPSConnectionPool, port_by_scheme
 from .exceptions import (
     LocationValueError,
@@ -17,7 +18,7 @@ from .packages import six
 from .packages.six.moves.urllib.parse import urljoin
 from .request import RequestMethods
 from .util.proxy import connection_requires_http_tunnel
-from .util.retry import Retry
+from .util.retry import CircuitOpenError, Retry, RetryAt
 from .util.url import parse_url
 
 __all__ = ["PoolManager", "ProxyManager", "proxy_from_url"]
@@ -25,6 +26,10 @@ __all__ = ["PoolManager", "ProxyManager", "proxy_from_url"]
 
 log = logging.getLogger(__name__)
 
+#: Number of circuit breakers a PoolManager keeps, so that a host's breaker
+#: outlives its connection pool being discarded.
+CIRCUIT_BREAKER_CACHE_SIZE = 1000
+
 SSL_KEYWORDS = (
     "key_file",
     "cert_file",
@@ -66,6 +71,13 @@ _key_fields = (
     "key_assert_hostname",  # bool or string
     "key_assert_fingerprint",  # str
     "key_server_hostname",  # str
+    "key_max_idle_time",  # int or float
+    "key_max_lifetime",  # int or float
+    "key_min_connections",  # int
+    "key_maintenance_interval",  # int or float
+    "key_event_hooks",  # tuple of callables
+    "key_resolver",  # instance of urllib3.util.connection.Resolver
+    "key_happy_eyeballs_delay",  # int or float
 )
 
 #: The namedtuple class used to construct keys for the connection pool.
@@ -112,6 +124,11 @@ def _default_key_normalizer(key_class, request_context):
     if socket_opts is not None:
         context["socket_options"] = tuple(socket_opts)
 
+    # Likewise for the list of metrics hooks.
+    event_hooks = context.get("event_hooks")
+    if event_hooks is not None:
+        context["event_hooks"] = tuple(event_hooks)
+
     # Map the kwargs to the names in the namedtuple - this is necessary since
     # namedtuples can't have fields starting with '_'.
     for key in list(context.keys()):
@@ -144,12 +161,38 @@ class PoolManager(RequestMethods):
 
     :param num_pools:
         Number of connection pools to cache before discarding the least
-        recently used pool.
+        recently used pool. Recency is approximated, see
+        :class:`urllib3._collections.ConcurrentRecentlyUsedContainer`.
 
     :param headers:
         Headers to include with all requests, unless other headers are given
         explicitly.
 
+    :param retry_budget:
+        A :class:`urllib3.util.retry.RetryBudget` shared by all requests of
+        this manager. It is attached to every request's
+        :class:`~urllib3.util.retry.Retry` and credited for every response
+        that is neither a 5xx nor a 429, so retries stay a bounded fraction
+        of the traffic during an upstream brownout.
+
+    :param circuit_breaker:
+        A :class:`urllib3.util.retry.CircuitBreaker` to copy for every
+        connection pool key. While the breaker of a host is open, requests
+        to it raise a :class:`~urllib3.exceptions.MaxRetryError` with a
+        :class:`~urllib3.util.retry.CircuitOpenError` as reason without
+        being sent.
+
+    :param single_flight:
+        A :class:`urllib3.coalesce.SingleFlight` through which concurrent
+        identical GET and HEAD requests share one upstream request and its
+        buffered body. Requests retried with ``Retry(defer=True)`` are
+        always sent on their own.
+
+    :param cache:
+        A :class:`urllib3.httpcache.HTTPCache` that answers GET requests
+        with stored responses while they are fresh and revalidates them
+        once stale. Every hop of a redirect is cached on its own.
+
     :param \\**connection_pool_kw:
         Additional parameters are used to create fresh
         :class:`urllib3.connectionpool.ConnectionPool` instances.
@@ -167,11 +210,31 @@ class PoolManager(RequestMethods):
 
     proxy = None
     proxy_config = None
+    retry_budget = None
+    circuit_breaker = None
+    single_flight = None
+    cache = None
 
-    def __init__(self, num_pools=10, headers=None, **connection_pool_kw):
+    def __init__(
+        self,
+        num_pools=10,
+        headers=None,
+        retry_budget=None,
+        circuit_breaker=None,
+        single_flight=None,
+        cache=None,
+        **connection_pool_kw
+    ):
         RequestMethods.__init__(self, headers)
         self.connection_pool_kw = connection_pool_kw
-        self.pools = RecentlyUsedContainer(num_pools)
+        self.retry_budget = retry_budget
+        self.circuit_breaker = circuit_breaker
+        self.single_flight = single_flight
+        self.cache = cache
+        self.pools = ConcurrentRecentlyUsedContainer(num_pools)
+        self.circuit_breakers = ConcurrentRecentlyUsedContainer(
+            CIRCUIT_BREAKER_CACHE_SIZE
+        )
 
         # Locally set the pool classes and keys so other PoolManagers can
         # override them.
@@ -222,6 +285,66 @@ class PoolManager(RequestMethods):
         """
         self.pools.clear()
 
+    def pool_metrics(self):
+        """
+        Return a list with a :meth:`urllib3.metrics.PoolMetrics.snapshot`
+        of every pool currently held, including the pool's scheme, host,
+        port and occupancy. The least-recently-used order of the pools is
+        not affected.
+        """
+        return [
+            pool.metrics.snapshot(pool)
+            for pool in self.pools.values()
+            if getattr(pool, "metrics", None) is not None
+        ]
+
+    def request_batch(
+        self, requests, timeout=None, max_workers=None, as_completed=False, **kw
+    ):
+        """
+        Send many requests concurrently and collect a
+        :class:`urllib3.batch.BatchResult` for each of them.
+
+        Requests are grouped by connection pool and every group is served by
+        up to ``maxsize`` threads of its pool, so each thread keeps reusing
+        one keep-alive connection and a host never sees more concurrent
+        connections than its pool allows. Errors, including
+        :class:`~urllib3.exceptions.MaxRetryError`, are returned in the
+        result rather than raised.
+
+        :param requests:
+            Iterable of ``(method, url)`` or ``(method, url, kwargs)`` tuples;
+            ``kwargs`` are passed to :meth:`request` on top of ``**kw``.
+
+        :param timeout:
+            Seconds the whole batch may take. Each request's timeout and
+            ``pool_timeout`` are capped by the time left, requests not
+            started in time are not sent, and results still missing at the
+            deadline are reported with a
+            :class:`~urllib3.batch.BatchTimeoutError`.
+
+        :param max_workers:
+            Upper bound on the number of threads for the whole batch. Every
+            pool still gets at least one.
+
+        :param as_completed:
+            If True, return an iterator yielding results as they finish
+            instead of a list in request order.
+
+        :param \\**kw:
+            Passed to :meth:`request` for every request, e.g. a ``retries``
+            policy shared by the batch or ``headers``.
+        """
+        results = run_batch(
+            self, requests, timeout=timeout, max_workers=max_workers, **kw
+        )
+        if as_completed:
+            return results
+        ordered = {}
+        for result in results:
+            ordered[result.index] = result
+        return [ordered[index] for index in range(len(ordered))]
+
     def connection_from_host(self, host, port=None, scheme="http", pool_kwargs=None):
         """
         Get a :class:`urllib3.connectionpool.ConnectionPool` based on the host, port, and scheme.
@@ -268,9 +391,15 @@ class PoolManager(RequestMethods):
         objects. At a minimum it must have the ``scheme``, ``host``, and
         ``port`` fields.
         """
+        # Existing pools are found without taking the lock.
+        pool = self.pools.get(pool_key)
+        if pool:
+            return pool
+
         with self.pools.lock:
             # If the scheme, host, or port doesn't match existing open
-            # connections, open a new ConnectionPool.
+            # connections, open a new ConnectionPool. Check again, another
+            # thread may have created it while we waited for the lock.
             pool = self.pools.get(pool_key)
             if pool:
                 return pool
@@ -280,6 +409,12 @@ class PoolManager(RequestMethods):
             host = request_context["host"]
             port = request_context["port"]
             pool = self._new_pool(scheme, host, port, request_context=request_context)
+            if self.circuit_breaker is not None:
+                breaker = self.circuit_breakers.get(pool_key)
+                if breaker is None:
+                    breaker = self.circuit_breaker.new()
+                    self.circuit_breakers[pool_key] = breaker
+                pool.circuit_breaker = breaker
             self.pools[pool_key] = pool
 
         return pool
@@ -359,6 +494,17 @@ class PoolManager(RequestMethods):
         The given ``url`` parameter must be absolute, such that an appropriate
         :class:`urllib3.connectionpool.ConnectionPool` can be chosen for it.
         """
+        if self.single_flight is not None and not self.single_flight.leading:
+            retries = kw.get("retries", self.connection_pool_kw.get("retries"))
+            if not getattr(retries, "defer", False):
+                kw.setdefault("headers", self.headers.copy())
+                if "timeout" in self.connection_pool_kw:
+                    # Waits for an identical request end with the timeout
+                    kw.setdefault("timeout", self.connection_pool_kw["timeout"])
+                return self.single_flight.urlopen(
+                    self.urlopen, method, url, redirect=redirect, **kw
+                )
+
         u = parse_url(url)
         self._validate_proxy_scheme_url_selection(u.scheme)
 
@@ -370,10 +516,52 @@ class PoolManager(RequestMethods):
         if "headers" not in kw:
             kw["headers"] = self.headers.copy()
 
+        breaker = conn.circuit_breaker
+        if self.retry_budget is not None or breaker is not None:
+            retries = kw.get("retries", conn.retries)
+            if not isinstance(retries, Retry):
+                retries = Retry.from_int(retries, redirect=redirect)
+            if self.retry_budget is not None and retries.budget is None:
+                retries = retries.new(budget=self.retry_budget)
+            if breaker is not None:
+                retries = retries.new(circuit_breaker=breaker)
+            kw["retries"] = retries
+
         if self._proxy_requires_url_absolute_form(u):
-            response = conn.urlopen(method, url, **kw)
+            target = url
         else:
-            response = conn.urlopen(method, u.request_uri, **kw)
+            target = u.request_uri
+
+        def send(**kw):
+            # Checked only once a request must be sent: fresh responses are
+            # still served from the cache while the circuit is open.
+            if breaker is not None and not breaker.allow():
+                raise MaxRetryError(
+                    conn, url, CircuitOpenError("circuit breaker open: %r" % breaker)
+                )
+            return conn.urlopen(method, target, **kw)
+
+        if self.cache is not None:
+            response = self.cache.urlopen(send, method, url, **kw)
+        else:
+            response = send(**kw)
+
+        if isinstance(response, RetryAt):
+            # Resume through this manager so that cross-host redirects of
+            # the eventual response are still followed.
+            kw = dict(kw, retries=response.retries)
+            del kw["redirect"]
+            attempt = functools.partial(
+                self.urlopen, method, url, redirect=redirect, **kw
+            )
+            return RetryAt(response.retry_at, response.retries, attempt)
+
+        from_cache = getattr(response, "from_cache", False)
+        if response.status < 500 and response.status != 429 and not from_cache:
+            if self.retry_budget is not None:
+                self.retry_budget.deposit()
+            if breaker is not None:
+                breaker.record_success()
 
         redirect_location = redirect and response.get_redirect_location()
         if not redirect_location:
@@ -1,4 +1,5 @@
 import collections
+import threading
 
 from ..packages import six
 from ..packages.six.moves import queue
@@ -20,3 +21,89 @@ class LifoQueue(queue.Queue):
 
     def _get(self):
         return self.queue.pop()
+
+
+class _Waiter(object):
+    __slots__ = ("event", "item", "served")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.item = None
+        self.served = False
+
+
+class FairLifoQueue(object):
+    """
+    Connection queue for blocking pools that serves waiting threads in
+    arrival order.
+
+    Items are still handed out last-in first-out so the most recently used
+    connection is reused first, but a thread that has to wait gets its own
+    event in a FIFO of waiters and :meth:`put` hands the item straight to the
+    oldest waiter. Waiters never re-compete for the lock after waking, no
+    late-comer can overtake them, and each one waits exactly until its own
+    deadline. The mutex is only held to push or pop, never while waiting.
+
+    Implements the subset of :class:`queue.Queue` used by the pool
+    (``get``, ``put``, ``qsize``, ``mutex``, ``queue`` and ``maxsize``) and
+    raises the same :class:`queue.Empty` and :class:`queue.Full`.
+
+    Pools keep using :class:`LifoQueue`, which has the higher throughput when
+    threads rarely wait. Opt in by setting it as a pool's ``QueueCls``::
+
+        class FairHTTPConnectionPool(HTTPConnectionPool):
+            QueueCls = FairLifoQueue
+    """
+
+    def __init__(self, maxsize=0):
+        self.maxsize = maxsize
+        self.mutex = threading.Lock()
+        self.queue = collections.deque()
+        self._waiters = collections.deque()
+
+    def qsize(self):
+        return len(self.queue)
+
+    def empty(self):
+        return not self.queue
+
+    def full(self):
+        return 0 < self.maxsize <= len(self.queue)
+
+    def put(self, item, block=True, timeout=None):
+        # Never blocks: a pool only ever puts back what it took out.
+        with self.mutex:
+            if self._waiters:
+                waiter = self._waiters.popleft()
+                waiter.item = item
+                waiter.served = True
+                waiter.event.set()
+                return
+            if 0 < self.maxsize <= len(self.queue):
+                raise queue.Full
+            self.queue.append(item)
+
+    def put_nowait(self, item):
+        return self.put(item, block=False)
+
+    def get(self, block=True, timeout=None):
+        with self.mutex:
+            if self.queue:
+                return self.queue.pop()
+            if not block:
+                raise queue.Empty
+            if timeout is not None and timeout < 0:
+                raise ValueError("'timeout' must be a non-negative number")
+            waiter = _Waiter()
+            self._waiters.append(waiter)
+
+        if waiter.event.wait(timeout):
+            return waiter.item
+        with self.mutex:
+            if waiter.served:  # put() won the race against the deadline
+                return waiter.item
+            self._waiters.remove(waiter)
+        raise queue.Empty
+
+    def get_nowait(self):
+        return self.get(block=False)
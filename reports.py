@@ -0,0 +1,227 @@
+import sqlite3
+import threading
+from collections import OrderedDict
+from datetime import date
+
+import numpy as np
+
+# Status codes stored in the attendance matrix
+NOT_MARKED = -1
+ABSENT = 0
+PRESENT = 1
+LATE = 2
+
+STATUS_CODES = {"absent": ABSENT, "present": PRESENT, "late": LATE}
+
+NO_TIME = -1
+
+
+class AttendanceMatrix:
+    """Attendance for a date range as dense NumPy arrays.
+
+    ``status`` is an int8 matrix of shape (students, days) holding the
+    status codes above, ``minutes`` holds the arrival time as minutes after
+    midnight (int16, NO_TIME when unknown). Students are sorted by class so
+    that each class occupies a contiguous block of rows starting at
+    ``class_starts``.
+    """
+
+    def __init__(self, start_date, student_ids, student_classes, status, minutes):
+        self.start_date = start_date
+        self.student_ids = student_ids
+        self.student_classes = student_classes
+        self.status = status
+        self.minutes = minutes
+        self.classes, self.class_starts = np.unique(student_classes, return_index=True)
+        self._memo = {}
+
+    @property
+    def days(self):
+        """The calendar days covered by the matrix columns"""
+        return np.datetime64(self.start_date, "D") + np.arange(self.status.shape[1])
+
+    def _cached(self, key, compute):
+        if key not in self._memo:
+            self._memo[key] = compute()
+        return self._memo[key]
+
+    @property
+    def attended(self):
+        """Boolean matrix of present-or-late marks"""
+        return self._cached("attended", lambda: self.status >= PRESENT)
+
+    @property
+    def school_days(self):
+        """Boolean mask of days on which any attendance was taken"""
+        return self._cached("school_days", lambda: (self.status != NOT_MARKED).any(axis=0))
+
+    def attendance_rates(self):
+        """Per-student share of school days attended, in percent"""
+        def compute():
+            total = int(self.school_days.sum())
+            if total == 0:
+                return np.zeros(len(self.student_ids))
+            return self.attended.sum(axis=1) * (100.0 / total)
+        return self._cached("rates", compute)
+
+    def status_counts(self):
+        """Per-student counts of (absent, present, late) marks"""
+        def compute():
+            codes = (ABSENT, PRESENT, LATE)
+            return np.stack([(self.status == code).sum(axis=1) for code in codes], axis=1)
+        return self._cached("counts", compute)
+
+    def streaks(self):
+        """Per-student (longest, current) runs of consecutive attended school days"""
+        def compute():
+            attended = self.attended[:, self.school_days]
+            n_students, n_days = attended.shape
+            longest = np.zeros(n_students, dtype=np.int32)
+            if n_days == 0:
+                return longest, longest.copy()
+
+            # Pad every row with False on both sides so runs never cross rows,
+            # then find run boundaries in the flattened array.
+            padded = np.zeros((n_students, n_days + 2), dtype=np.int8)
+            padded[:, 1:-1] = attended
+            edges = np.diff(padded.ravel())
+            starts = np.flatnonzero(edges == 1)
+            ends = np.flatnonzero(edges == -1)
+            np.maximum.at(longest, starts // (n_days + 2), (ends - starts).astype(np.int32))
+
+            missed = ~attended[:, ::-1]
+            current = np.where(missed.any(axis=1), missed.argmax(axis=1), n_days).astype(np.int32)
+            return longest, current
+        return self._cached("streaks", compute)
+
+    def late_distribution(self, bin_minutes=5):
+        """Histogram of late arrival times as (bin start minutes, counts)"""
+        def compute():
+            late_minutes = self.minutes[(self.status == LATE) & (self.minutes != NO_TIME)]
+            if late_minutes.size == 0:
+                return np.array([], dtype=np.int32), np.array([], dtype=np.int64)
+            first = int(late_minutes.min()) // bin_minutes * bin_minutes
+            counts = np.bincount((late_minutes - first) // bin_minutes)
+            return first + bin_minutes * np.arange(counts.size, dtype=np.int32), counts
+        return self._cached(("late", bin_minutes), compute)
+
+    def class_heatmap(self):
+        """Attendance rate in percent per (class, day); NaN where no class members"""
+        def compute():
+            if len(self.student_ids) == 0:
+                return np.zeros((0, self.status.shape[1]))
+            attended = np.add.reduceat(self.attended, self.class_starts, axis=0, dtype=np.int32)
+            sizes = np.diff(np.append(self.class_starts, len(self.student_ids)))
+            heatmap = attended * (100.0 / sizes[:, None])
+            heatmap[:, ~self.school_days] = np.nan
+            return heatmap
+        return self._cached("heatmap", compute)
+
+    def daily_trend(self):
+        """Overall attendance rate in percent per day; NaN on days without marks"""
+        def compute():
+            if len(self.student_ids) == 0:
+                return np.full(self.status.shape[1], np.nan)
+            trend = self.attended.sum(axis=0) * (100.0 / len(self.student_ids))
+            trend[~self.school_days] = np.nan
+            return trend
+        return self._cached("trend", compute)
+
+
+class ReportEngine:
+    """Build and cache AttendanceMatrix objects for report date ranges.
+
+    Matrices are cached by (start, end, data version). The data version is
+    SQLite's ``PRAGMA data_version`` on a connection held by the engine, so
+    any commit from another connection (a kiosk marking attendance, an
+    import) invalidates cached ranges without polling the tables.
+    """
+
+    def __init__(self, db_file="attendance.db", cache_size=8):
+        self.db_file = db_file
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_file, check_same_thread=False)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+            self._cache.clear()
+
+    def data_version(self):
+        with self._lock:
+            return self._conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def matrix(self, start_date, end_date):
+        """Return the AttendanceMatrix for an inclusive 'YYYY-MM-DD' date range"""
+        start = date.fromisoformat(str(start_date))
+        end = date.fromisoformat(str(end_date))
+        if end < start:
+            raise ValueError("end_date must not be before start_date")
+
+        with self._lock:
+            version = self._conn.execute("PRAGMA data_version").fetchone()[0]
+            key = (start, end, version)
+            matrix = self._cache.get(key)
+            if matrix is not None:
+                self._cache.move_to_end(key)
+                return matrix
+
+            matrix = self._load(start, end)
+            # Entries for older data versions can never be hit again
+            for stale in [k for k in self._cache if k[2] != version]:
+                del self._cache[stale]
+            self._cache[key] = matrix
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+            return matrix
+
+    def _load(self, start, end):
+        cursor = self._conn.cursor()
+        cursor.execute("SELECT id, class FROM students ORDER BY class, id")
+        students = cursor.fetchall()
+        student_ids = np.array([row[0] for row in students], dtype=str)
+        student_classes = np.array([row[1] for row in students], dtype=str)
+
+        n_days = (end - start).days + 1
+        status = np.full((len(students), n_days), NOT_MARKED, dtype=np.int8)
+        minutes = np.full((len(students), n_days), NO_TIME, dtype=np.int16)
+        if not students:
+            return AttendanceMatrix(start, student_ids, student_classes, status, minutes)
+
+        # Let SQLite turn dates, times and statuses into integers so the
+        # rows can be scattered into the matrix without a Python loop. Empty
+        # or truncated times become NO_TIME rather than minute 0.
+        cursor.execute('''
+            SELECT a.student_id,
+                   CAST(julianday(a.date) - julianday(?) AS INTEGER),
+                   CASE lower(a.status)
+                       WHEN 'absent' THEN ? WHEN 'present' THEN ? WHEN 'late' THEN ?
+                       ELSE ? END,
+                   CASE WHEN length(a.time) >= 5
+                       THEN CAST(substr(a.time, 1, 2) AS INTEGER) * 60
+                            + CAST(substr(a.time, 4, 2) AS INTEGER)
+                       ELSE ? END
+            FROM attendance a
+            WHERE a.date BETWEEN ? AND ?
+        ''', (start.isoformat(), ABSENT, PRESENT, LATE, NOT_MARKED, NO_TIME,
+              start.isoformat(), end.isoformat()))
+        rows = cursor.fetchall()
+        if not rows:
+            return AttendanceMatrix(start, student_ids, student_classes, status, minutes)
+
+        row_ids, day_offsets, codes, times = zip(*rows)
+        order = np.argsort(student_ids)
+        sorted_ids = student_ids[order]
+        row_ids = np.array(row_ids, dtype=str)
+        positions = np.searchsorted(sorted_ids, row_ids)
+        positions[positions == len(sorted_ids)] = 0
+        known = sorted_ids[positions] == row_ids
+
+        student_index = order[positions[known]]
+        day_index = np.array(day_offsets, dtype=np.int64)[known]
+        status[student_index, day_index] = np.array(codes, dtype=np.int8)[known]
+        minutes[student_index, day_index] = np.array(times, dtype=np.int16)[known]
+        return AttendanceMatrix(start, student_ids, student_classes, status, minutes)
+
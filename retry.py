@@ -1,8 +1,11 @@
 from __future__ import absolute_import
 
+import collections
 import email
 import logging
+import random
 import re
+import threading
 import time
 import warnings
 from collections import namedtuple
@@ -10,6 +13,7 @@ from itertools import takewhile
 
 from ..exceptions import (
     ConnectTimeoutError,
+    HTTPError,
     InvalidHeader,
     MaxRetryError,
     ProtocolError,
@@ -18,6 +22,7 @@ from ..exceptions import (
     ResponseError,
 )
 from ..packages import six
+from .timeout import current_time
 
 log = logging.getLogger(__name__)
 
@@ -32,6 +37,268 @@ RequestHistory = namedtuple(
 _Default = object()
 
 
+class RetryBudgetExhaustedError(ResponseError):
+    """The reason of a :class:`~urllib3.exceptions.MaxRetryError` raised
+    because the shared :class:`RetryBudget` allowed no more retries."""
+
+    pass
+
+
+class RetryBudget(object):
+    """
+    Token bucket that caps the retries of many requests to a fraction of
+    their successes, so a struggling upstream is not hit with a multiple of
+    its normal load. Share one instance, e.g. through
+    ``PoolManager(retry_budget=...)``.
+
+    Every successful request deposits ``ratio`` tokens and every retry
+    withdraws one; the bucket holds at most ``max_tokens``. On top of that
+    ``min_per_second`` retries per second are always allowed, so clients
+    with little traffic can still retry.
+
+    :param float ratio:
+        Retries allowed per successful request.
+
+    :param float min_per_second:
+        Retries allowed per second regardless of the bucket.
+
+    :param float max_tokens:
+        Capacity of the bucket, i.e. the largest burst of retries a long
+        healthy period can pay for.
+    """
+
+    def __init__(self, ratio=0.2, min_per_second=10, max_tokens=100):
+        self.ratio = ratio
+        self.min_per_second = min_per_second
+        self.max_tokens = max_tokens
+        self.rejected = 0
+        self._tokens = 0.0
+        self._reserve = float(min_per_second)
+        self._refilled_at = current_time()
+        self._lock = threading.Lock()
+
+    def deposit(self):
+        """Record a successful request."""
+        with self._lock:
+            self._tokens = min(self.max_tokens, self._tokens + self.ratio)
+
+    def withdraw(self):
+        """Take the allowance for one retry; return False if there is none."""
+        with self._lock:
+            now = current_time()
+            self._reserve = min(
+                self.min_per_second,
+                self._reserve + (now - self._refilled_at) * self.min_per_second,
+            )
+            self._refilled_at = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return True
+            if self._reserve >= 1:
+                self._reserve -= 1
+                return True
+            self.rejected += 1
+            return False
+
+    @property
+    def available(self):
+        """Retries the bucket can pay for right now, without the reserve."""
+        return int(self._tokens)
+
+    def __repr__(self):
+        return "%s(ratio=%r, min_per_second=%r, max_tokens=%r, available=%d)" % (
+            type(self).__name__,
+            self.ratio,
+            self.min_per_second,
+            self.max_tokens,
+            self.available,
+        )
+
+
+class RetryAt(object):
+    """
+    A retry that is due later, returned by ``urlopen`` in place of a
+    response when its :class:`Retry` has ``defer=True``.
+
+    :ivar retry_at:
+        When the next attempt is due, on the clock of
+        :func:`urllib3.util.timeout.current_time`.
+
+    :ivar retries:
+        The :class:`Retry` the next attempt continues with.
+    """
+
+    def __init__(self, retry_at, retries, attempt):
+        self.retry_at = retry_at
+        self.retries = retries
+        self._attempt = attempt
+
+    @property
+    def delay(self):
+        """Seconds left until the next attempt is due."""
+        return max(self.retry_at - current_time(), 0.0)
+
+    def resume(self):
+        """
+        Make the next attempt now and return its outcome: a response, or
+        another :class:`RetryAt`. Waiting for :attr:`retry_at` first is up
+        to the caller.
+        """
+        return self._attempt()
+
+    def __repr__(self):
+        return "%s(delay=%.3f, retries=%r)" % (
+            type(self).__name__,
+            self.delay,
+            self.retries,
+        )
+
+
+class CircuitOpenError(HTTPError):
+    """The reason of a :class:`~urllib3.exceptions.MaxRetryError` raised
+    because the :class:`CircuitBreaker` of the host is open."""
+
+    pass
+
+
+class CircuitBreaker(object):
+    """
+    Stops sending requests to a host that keeps failing, so a dead upstream
+    does not hold the threads and connect timeouts of healthy traffic.
+    ``PoolManager(circuit_breaker=...)`` gives every connection pool key its
+    own copy of the breaker passed in.
+
+    The breaker starts *closed*. Every attempt that :meth:`Retry.increment`
+    sees failing, for an error or a retried status, counts as a failure and
+    every successful request as a success. Once the last ``window`` seconds
+    hold at least ``min_requests`` outcomes of which a share of
+    ``failure_ratio`` or more failed, the breaker *opens*: requests fail
+    with a :class:`CircuitOpenError` without being sent and retries in
+    progress stop. After ``recovery_time`` seconds it is *half-open* and
+    lets ``probes`` requests through; it closes once they all succeed and
+    opens again on the first failure.
+
+    :param float failure_ratio:
+        Share of failed outcomes that opens the breaker.
+
+    :param int min_requests:
+        Outcomes needed in the window before the breaker can open.
+
+    :param int window:
+        Length of the window, in seconds.
+
+    :param float recovery_time:
+        Seconds the breaker stays open before probing the host. A probe
+        that never reports back frees its slot after the same time.
+
+    :param int probes:
+        Requests let through while half-open.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half-open"
+
+    def __init__(
+        self, failure_ratio=0.5, min_requests=20, window=10, recovery_time=30, probes=1
+    ):
+        self.failure_ratio = failure_ratio
+        self.min_requests = min_requests
+        self.window = window
+        self.recovery_time = recovery_time
+        self.probes = probes
+        self.state = self.CLOSED
+        self.rejected = 0
+        # [second, outcomes, failures] for each second of the window
+        self._buckets = collections.deque()
+        self._opened_at = None
+        self._probes_sent = 0
+        self._probes_passed = 0
+        self._probed_at = None
+        self._lock = threading.Lock()
+
+    def new(self):
+        """Return a closed breaker with the same settings."""
+        return type(self)(
+            failure_ratio=self.failure_ratio,
+            min_requests=self.min_requests,
+            window=self.window,
+            recovery_time=self.recovery_time,
+            probes=self.probes,
+        )
+
+    def allow(self):
+        """Return whether a request may be sent now."""
+        with self._lock:
+            now = current_time()
+            if self.state == self.OPEN:
+                if now - self._opened_at < self.recovery_time:
+                    self.rejected += 1
+                    return False
+                self.state = self.HALF_OPEN
+                self._probes_sent = self._probes_passed = 0
+            if self.state == self.HALF_OPEN:
+                if self._probes_sent >= self.probes:
+                    if now - self._probed_at < self.recovery_time:
+                        self.rejected += 1
+                        return False
+                    self._probes_sent = self._probes_passed
+                self._probes_sent += 1
+                self._probed_at = now
+            return True
+
+    def record_success(self):
+        """Record a successful request."""
+        with self._lock:
+            if self.state == self.HALF_OPEN:
+                self._probes_passed += 1
+                if self._probes_passed >= self.probes:
+                    log.info("Circuit breaker closed: %r", self)
+                    self.state = self.CLOSED
+                    self._buckets.clear()
+            elif self.state == self.CLOSED:
+                self._count(0)
+
+    def record_failure(self):
+        """Record a failed attempt; return True if the breaker is open."""
+        with self._lock:
+            if self.state == self.HALF_OPEN:
+                self._open()
+            elif self.state == self.CLOSED:
+                outcomes, failures = self._count(1)
+                if (
+                    outcomes >= self.min_requests
+                    and failures >= self.failure_ratio * outcomes
+                ):
+                    self._open()
+            return self.state == self.OPEN
+
+    def _open(self):
+        log.warning("Circuit breaker opened: %r", self)
+        self.state = self.OPEN
+        self._opened_at = current_time()
+
+    def _count(self, failed):
+        """Add an outcome and return the outcomes and failures in the window."""
+        second = int(current_time())
+        buckets = self._buckets
+        while buckets and buckets[0][0] <= second - self.window:
+            buckets.popleft()
+        if buckets and buckets[-1][0] == second:
+            buckets[-1][1] += 1
+            buckets[-1][2] += failed
+        else:
+            buckets.append([second, 1, failed])
+        return sum(b[1] for b in buckets), sum(b[2] for b in buckets)
+
+    def __repr__(self):
+        return "%s(state=%r, rejected=%d)" % (
+            type(self).__name__,
+            self.state,
+            self.rejected,
+        )
+
+
 class _RetryMeta(type):
     @property
     def DEFAULT_METHOD_WHITELIST(cls):
@@ -203,6 +470,42 @@ class Retry(object):
 
         By default, backoff is disabled (set to 0).
 
+    :param str backoff_jitter:
+        Set to ``"decorrelated"`` to replace the exponential formula with
+        decorrelated jitter: each sleep is drawn uniformly between
+        ``backoff_factor`` and three times the previous sleep, capped at
+        :attr:`Retry.DEFAULT_BACKOFF_MAX`. Clients that failed together
+        then retry at spread out times instead of in synchronized waves.
+        The first retry still happens immediately.
+
+    :param budget:
+        A :class:`RetryBudget` shared with other requests. Error and status
+        retries are only made while it has allowance left; otherwise
+        :class:`~urllib3.exceptions.MaxRetryError` is raised, with the
+        error that caused the retry as reason, or a
+        :class:`RetryBudgetExhaustedError` for status retries. Redirects
+        are not counted.
+
+    :param circuit_breaker:
+        A :class:`CircuitBreaker` of the host, normally attached by
+        ``PoolManager(circuit_breaker=...)``. Every failed attempt seen by
+        :meth:`increment` is recorded with it, and once it is open a
+        :class:`~urllib3.exceptions.MaxRetryError` is raised instead of
+        retrying, with the error that caused the retry as reason, or a
+        :class:`CircuitOpenError` for status retries.
+
+    :param bool defer:
+        If True, ``urlopen`` does not sleep before a retry. When the next
+        attempt has to wait, for a backoff or a ``Retry-After`` header, it
+        returns a :class:`RetryAt` instead of a response and the caller
+        resumes the request once the wait is over, so no thread is held
+        for its duration::
+
+            result = http.request("GET", url, retries=Retry(5, defer=True))
+            if isinstance(result, RetryAt):
+                # Park the request, e.g. with sched or an event loop
+                loop.call_later(result.delay, executor.submit, result.resume)
+
     :param bool raise_on_redirect: Whether, if the number of redirects is
         exhausted, to raise a MaxRetryError, or to return a response with a
         response code in the 3xx range.
@@ -258,6 +561,10 @@ class Retry(object):
         remove_headers_on_redirect=_Default,
         # TODO: Deprecated, remove in v2.0
         method_whitelist=_Default,
+        backoff_jitter=None,
+        budget=None,
+        circuit_breaker=None,
+        defer=False,
     ):
 
         if method_whitelist is not _Default:
@@ -300,6 +607,16 @@ class Retry(object):
         self.remove_headers_on_redirect = frozenset(
             [h.lower() for h in remove_headers_on_redirect]
         )
+        if backoff_jitter not in (None, "decorrelated"):
+            raise ValueError("Unknown backoff_jitter: %r" % (backoff_jitter,))
+        self.backoff_jitter = backoff_jitter
+        self.budget = budget
+        self.circuit_breaker = circuit_breaker
+        self.defer = defer
+        # Decorrelated jitter: the sleep drawn for this attempt and the one
+        # drawn for the previous attempt.
+        self._backoff = None
+        self._previous_backoff = None
 
     def new(self, **kw):
         params = dict(
@@ -316,6 +633,10 @@ class Retry(object):
             history=self.history,
             remove_headers_on_redirect=self.remove_headers_on_redirect,
             respect_retry_after_header=self.respect_retry_after_header,
+            backoff_jitter=self.backoff_jitter,
+            budget=self.budget,
+            circuit_breaker=self.circuit_breaker,
+            defer=self.defer,
         )
 
         # TODO: If already given in **kw we use what's given to us
@@ -335,7 +656,12 @@ class Retry(object):
                 params["allowed_methods"] = self.allowed_methods
 
         params.update(kw)
-        return type(self)(**params)
+        retry = type(self)(**params)
+        if self._backoff is not None:
+            retry._previous_backoff = self._backoff
+        else:
+            retry._previous_backoff = self._previous_backoff
+        return retry
 
     @classmethod
     def from_int(cls, retries, redirect=True, default=None):
@@ -365,6 +691,15 @@ class Retry(object):
         if consecutive_errors_len <= 1:
             return 0
 
+        if self.backoff_jitter == "decorrelated":
+            if self._backoff is None:
+                previous = self._previous_backoff or self.backoff_factor
+                self._backoff = min(
+                    self.DEFAULT_BACKOFF_MAX,
+                    random.uniform(self.backoff_factor, previous * 3),
+                )
+            return self._backoff
+
         backoff_value = self.backoff_factor * (2 ** (consecutive_errors_len - 1))
         return min(self.DEFAULT_BACKOFF_MAX, backoff_value)
 
@@ -415,6 +750,14 @@ class Retry(object):
             return
         time.sleep(backoff)
 
+    def get_sleep_time(self, response=None):
+        """Seconds :meth:`sleep` waits before the next attempt."""
+        if self.respect_retry_after_header and response:
+            retry_after = self.get_retry_after(response)
+            if retry_after:
+                return retry_after
+        return max(self.get_backoff_time(), 0)
+
     def sleep(self, response=None):
         """Sleep between retry attempts.
 
@@ -520,6 +863,12 @@ class Retry(object):
 
         :return: A new ``Retry`` object.
         """
+        breaker_open = False
+        if self.circuit_breaker is not None and (
+            error or not (response and response.get_redirect_location())
+        ):
+            breaker_open = self.circuit_breaker.record_failure()
+
         if self.total is False and error:
             # Disabled, indicate to re-raise the error.
             raise six.reraise(type(error), error, _stacktrace)
@@ -588,8 +937,45 @@ class Retry(object):
             history=history,
         )
 
-        if new_retry.is_exhausted():
+        exhausted = new_retry.is_exhausted()
+        over_budget = (
+            not exhausted
+            and not breaker_open
+            and self.budget is not None
+            and redirect_location is None
+            and not self.budget.withdraw()
+        )
+        metrics = getattr(_pool, "metrics", None)
+        if metrics is not None:
+            metrics.record(
+                "retry",
+                _pool,
+                counters=("retries_exhausted",)
+                if exhausted or breaker_open or over_budget
+                else ("retries",),
+                method=method,
+                url=url,
+                error=error,
+                status=status,
+                retries=new_retry,
+            )
+
+        if exhausted:
             raise MaxRetryError(_pool, url, error or ResponseError(cause))
+        if breaker_open:
+            log.debug(
+                "Circuit breaker open for (url='%s'): %r", url, self.circuit_breaker
+            )
+            raise MaxRetryError(
+                _pool, url, error or CircuitOpenError("circuit breaker open")
+            )
+        if over_budget:
+            log.debug("Retry budget exhausted for (url='%s'): %r", url, self.budget)
+            raise MaxRetryError(
+                _pool,
+                url,
+                error or RetryBudgetExhaustedError("retry budget exhausted"),
+            )
 
         log.debug("Incremented Retry for (url='%s'): %r", url, new_retry)
 
@@ -0,0 +1,287 @@
+import argparse
+import csv
+import os
+import re
+import sqlite3
+import sys
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+from database import Database
+
+REQUIRED_COLUMNS = ("id", "name", "class")
+OPTIONAL_COLUMNS = ("email", "phone", "photo_path")
+COLUMN_ALIASES = {
+    "student_id": "id",
+    "class_name": "class",
+    "photo": "photo_path",
+}
+
+EMAIL_RE = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
+PHONE_RE = re.compile(r"^\+?[0-9 ()-]{6,20}$")
+
+UPSERT_STUDENT_SQL = '''
+    INSERT INTO students (id, name, class, email, phone)
+    VALUES (?, ?, ?, ?, ?)
+    ON CONFLICT(id) DO UPDATE SET
+        name = excluded.name,
+        class = excluded.class,
+        email = COALESCE(excluded.email, email),
+        phone = COALESCE(excluded.phone, phone)
+'''
+
+RowError = namedtuple("RowError", ["line", "student_id", "message"])
+
+
+class ImportReport:
+    """Running totals for a roster import"""
+
+    def __init__(self):
+        self.rows_read = 0
+        self.imported = 0
+        self.photos_queued = 0
+        self.photos_enrolled = 0
+        self.errors = []
+        self.started = time.monotonic()
+        self.finished = None
+
+    @property
+    def elapsed(self):
+        end = self.finished if self.finished is not None else time.monotonic()
+        return end - self.started
+
+    @property
+    def rows_per_second(self):
+        elapsed = self.elapsed
+        return self.rows_read / elapsed if elapsed > 0 else 0.0
+
+    def summary(self):
+        return (f"{self.imported}/{self.rows_read} rows imported, "
+                f"{self.photos_enrolled}/{self.photos_queued} photos enrolled, "
+                f"{len(self.errors)} errors, {self.rows_per_second:.0f} rows/s")
+
+
+def normalize_header(name):
+    """Map a CSV header onto the roster column it names"""
+    key = (name or "").strip().lower().replace(" ", "_")
+    return COLUMN_ALIASES.get(key, key)
+
+
+def validate_row(row):
+    """Return a cleaned roster row, raising ValueError if it is unusable"""
+    cleaned = {column: (row.get(column) or "").strip()
+               for column in REQUIRED_COLUMNS + OPTIONAL_COLUMNS}
+
+    for column in REQUIRED_COLUMNS:
+        if not cleaned[column]:
+            raise ValueError(f"missing required field '{column}'")
+    if cleaned["email"] and not EMAIL_RE.match(cleaned["email"]):
+        raise ValueError(f"invalid email '{cleaned['email']}'")
+    if cleaned["phone"] and not PHONE_RE.match(cleaned["phone"]):
+        raise ValueError(f"invalid phone '{cleaned['phone']}'")
+
+    for column in OPTIONAL_COLUMNS:
+        cleaned[column] = cleaned[column] or None
+    return cleaned
+
+
+def enroll_photo(student_id, source_path, photo_dir):
+    """Copy a student's photo into photo_dir and compute its face encoding.
+
+    Runs on a worker thread. The encoding is None when face_recognition is
+    not installed.
+    """
+    import cv2
+
+    image = cv2.imread(source_path)
+    if image is None:
+        raise ValueError(f"could not read photo '{source_path}'")
+
+    encoding = None
+    try:
+        import face_recognition
+    except ImportError:
+        face_recognition = None
+    if face_recognition is not None:
+        rgb_image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+        encodings = face_recognition.face_encodings(rgb_image)
+        if not encodings:
+            raise ValueError(f"no face found in photo '{source_path}'")
+        encoding = encodings[0].tobytes()
+
+    photo_path = os.path.join(photo_dir, f"{student_id}.jpg")
+    if not cv2.imwrite(photo_path, image):
+        raise ValueError(f"could not write photo '{photo_path}'")
+    return photo_path, encoding
+
+
+class RosterImporter:
+    """Stream a roster CSV into the database.
+
+    Rows are validated one at a time and upserted in batches of
+    ``batch_size`` per transaction. Rows with a photo are handed to a pool
+    of ``photo_workers`` threads once their batch has been committed, so
+    photo enrollment overlaps with the rest of the import. ``progress`` is
+    called with the running ImportReport after every batch.
+    """
+
+    def __init__(self, db_file="attendance.db", batch_size=500, photo_workers=4,
+                 photo_dir="photos", progress=None, enroll=enroll_photo):
+        self.db_file = db_file
+        self.batch_size = max(1, batch_size)
+        self.photo_workers = max(1, photo_workers)
+        self.photo_dir = photo_dir
+        self.progress = progress
+        self.enroll = enroll
+
+    def import_csv(self, csv_path):
+        """Import a roster CSV file and return an ImportReport"""
+        base_dir = os.path.dirname(os.path.abspath(csv_path))
+        with open(csv_path, newline="", encoding="utf-8-sig") as csv_file:
+            return self.import_rows(csv_file, base_dir=base_dir)
+
+    def import_rows(self, lines, base_dir="."):
+        """Import roster rows from any iterable of CSV lines"""
+        # Make sure the schema exists before opening our own connection
+        Database(self.db_file)
+
+        report = ImportReport()
+        reader = csv.reader(lines)
+        header = next(reader, None)
+        if header is None:
+            report.finished = time.monotonic()
+            return report
+        columns = [normalize_header(name) for name in header]
+        missing = [column for column in REQUIRED_COLUMNS if column not in columns]
+        if missing:
+            report.errors.append(RowError(1, None, f"missing columns: {', '.join(missing)}"))
+            report.finished = time.monotonic()
+            return report
+
+        conn = sqlite3.connect(self.db_file)
+        executor = ThreadPoolExecutor(max_workers=self.photo_workers,
+                                      thread_name_prefix="roster-photo")
+        pending = {}
+        seen_ids = set()
+        batch = []
+        try:
+            for line_number, values in enumerate(reader, start=2):
+                if not any(value.strip() for value in values):
+                    continue
+                report.rows_read += 1
+                row = dict(zip(columns, values))
+                try:
+                    student = validate_row(row)
+                    if student["id"] in seen_ids:
+                        raise ValueError("duplicate student id in roster")
+                except ValueError as e:
+                    report.errors.append(RowError(line_number, row.get("id") or None, str(e)))
+                    continue
+                seen_ids.add(student["id"])
+                batch.append((line_number, student))
+
+                if len(batch) >= self.batch_size:
+                    self._flush(conn, batch, report, executor, pending, base_dir)
+                    batch = []
+                    self._collect_photos(conn, pending, report, block=False)
+                    self._report_progress(report)
+
+            if batch:
+                self._flush(conn, batch, report, executor, pending, base_dir)
+            self._collect_photos(conn, pending, report, block=True)
+        finally:
+            executor.shutdown(wait=True)
+            conn.close()
+
+        report.finished = time.monotonic()
+        self._report_progress(report)
+        return report
+
+    def _flush(self, conn, batch, report, executor, pending, base_dir):
+        """Upsert one batch in a single transaction and queue its photos"""
+        params = [(s["id"], s["name"], s["class"], s["email"], s["phone"])
+                  for _, s in batch]
+        classes = {(s["class"],) for _, s in batch}
+        try:
+            with conn:
+                conn.executemany(UPSERT_STUDENT_SQL, params)
+                conn.executemany(
+                    "INSERT OR IGNORE INTO classes (class_name) VALUES (?)", classes)
+        except sqlite3.Error as e:
+            for line_number, student in batch:
+                report.errors.append(RowError(line_number, student["id"], f"database error: {e}"))
+            return
+        report.imported += len(batch)
+
+        for line_number, student in batch:
+            if not student["photo_path"]:
+                continue
+            source = student["photo_path"]
+            if not os.path.isabs(source):
+                source = os.path.join(base_dir, source)
+            if not os.path.exists(self.photo_dir):
+                os.makedirs(self.photo_dir, exist_ok=True)
+            future = executor.submit(self.enroll, student["id"], source, self.photo_dir)
+            pending[future] = (line_number, student["id"])
+            report.photos_queued += 1
+
+    def _collect_photos(self, conn, pending, report, block):
+        """Write finished photo enrollments back in one transaction"""
+        while pending:
+            done, _ = wait(list(pending), timeout=None if block else 0,
+                           return_when=FIRST_COMPLETED)
+            if not done:
+                return
+            photo_rows = []
+            encoding_rows = []
+            for future in done:
+                line_number, student_id = pending.pop(future)
+                try:
+                    photo_path, encoding = future.result()
+                except Exception as e:
+                    report.errors.append(RowError(line_number, student_id, f"photo: {e}"))
+                    continue
+                photo_rows.append((photo_path, student_id))
+                if encoding is not None:
+                    encoding_rows.append((student_id, encoding))
+            with conn:
+                conn.executemany("UPDATE students SET photo_path = ? WHERE id = ?", photo_rows)
+                conn.executemany(
+                    "INSERT OR REPLACE INTO face_encodings (student_id, encoding) VALUES (?, ?)",
+                    encoding_rows)
+            report.photos_enrolled += len(photo_rows)
+            if not block:
+                return
+
+    def _report_progress(self, report):
+        if self.progress is not None:
+            self.progress(report)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Import a student roster from CSV")
+    parser.add_argument("csv_file", help="roster CSV with id, name, class[, email, phone, photo_path] columns")
+    parser.add_argument("--db", default="attendance.db", help="database file (default: attendance.db)")
+    parser.add_argument("--batch-size", type=int, default=500, help="rows per transaction")
+    parser.add_argument("--photo-workers", type=int, default=4, help="threads used for photo enrollment")
+    parser.add_argument("--photo-dir", default="photos", help="where enrolled photos are stored")
+    args = parser.parse_args(argv)
+
+    def show_progress(report):
+        sys.stderr.write(f"\r{report.summary()}")
+        sys.stderr.flush()
+
+    importer = RosterImporter(args.db, batch_size=args.batch_size,
+                              photo_workers=args.photo_workers,
+                              photo_dir=args.photo_dir, progress=show_progress)
+    report = importer.import_csv(args.csv_file)
+    sys.stderr.write("\n")
+    for error in report.errors:
+        print(f"line {error.line} ({error.student_id or '-'}): {error.message}")
+    print(f"Finished in {report.elapsed:.2f}s: {report.summary()}")
+    return 1 if report.errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
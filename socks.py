@@ -14,6 +14,14 @@ supports the following SOCKS features:
 - SOCKS5 with local DNS (``proxy_url='socks5://...``)
 - Usernames and passwords for the SOCKS proxy
 
+Connecting through the proxy is timed in three phases, reported in the
+pool's metrics (see :meth:`urllib3.PoolManager.pool_metrics`): ``connect``
+for the TCP handshake with the proxy, ``socks_handshake`` for greeting and
+authenticating with it and ``socks_connect`` for the proxy connecting to the
+target. Local name resolution, of the proxy and with ``socks5://`` or
+``socks4://`` of the target too, goes through the pool's ``resolver``, so a
+:class:`~urllib3.util.connection.CachingResolver` saves repeated lookups.
+
 .. note::
    It is recommended to use ``socks5h://`` or ``socks4a://`` schemes in
    your ``proxy_url`` to ensure that DNS resolution is done from the remote
@@ -57,13 +65,21 @@ except ImportError:
     )
     raise
 
+import socket
 from socket import error as SocketError
 from socket import timeout as SocketTimeout
 
 from ..connection import HTTPConnection, HTTPSConnection
 from ..connectionpool import HTTPConnectionPool, HTTPSConnectionPool
 from ..exceptions import ConnectTimeoutError, NewConnectionError
+from ..metrics import clock
 from ..poolmanager import PoolManager
+from ..util.connection import (
+    Resolver,
+    allowed_gai_family,
+    connect_context,
+    connect_timings,
+)
 from ..util.url import parse_url
 
 try:
@@ -72,6 +88,121 @@ except ImportError:
     ssl = None
 
 
+def keepalive_socket_options(idle, interval=10, count=5):
+    """
+    Socket options that enable TCP keep-alive: probes start after ``idle``
+    seconds without traffic and are repeated every ``interval`` seconds,
+    and the connection is dropped after ``count`` unanswered probes.
+    Options the platform lacks are left out.
+    """
+    options = [(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)]
+    idle_option = getattr(socket, "TCP_KEEPIDLE", None)
+    if idle_option is None:  # macOS
+        idle_option = getattr(socket, "TCP_KEEPALIVE", None)
+    for option, value in (
+        (idle_option, idle),
+        (getattr(socket, "TCP_KEEPINTVL", None), interval),
+        (getattr(socket, "TCP_KEEPCNT", None), count),
+    ):
+        if option is not None:
+            options.append((socket.IPPROTO_TCP, option, value))
+    return options
+
+
+class _TimedSOCKSSocket(socks.socksocket):
+    """
+    A :class:`socks.socksocket` that remembers when it sent its first and
+    its latest message. After :meth:`connect` these are the greeting and
+    the CONNECT request, which tells the phases of the negotiation apart.
+    """
+
+    first_sent = last_sent = None
+
+    def send(self, *args, **kwargs):
+        self.last_sent = clock()
+        if self.first_sent is None:
+            self.first_sent = self.last_sent
+        return super(_TimedSOCKSSocket, self).send(*args, **kwargs)
+
+
+def _create_connection(
+    address,
+    socks_options,
+    timeout=None,
+    source_address=None,
+    socket_options=None,
+    resolver=None,
+):
+    """
+    Connect to ``address`` through the SOCKS proxy of ``socks_options``,
+    like :func:`socks.create_connection`, and record the duration of each
+    phase in :data:`urllib3.util.connection.connect_timings`. Names are
+    resolved with ``resolver``, or the system resolver.
+    """
+    host, port = address
+    if host.startswith("["):
+        host = host.strip("[]")
+    proxy_host = socks_options["proxy_host"]
+    if proxy_host.startswith("["):
+        proxy_host = proxy_host.strip("[]")
+    socks_version = socks_options["socks_version"]
+    rdns = socks_options["rdns"]
+    if resolver is None:
+        resolver = Resolver()
+
+    started = clock()
+    proxy_addresses = resolver.resolve(
+        proxy_host, socks_options["proxy_port"], 0, socket.SOCK_STREAM
+    )
+    if not rdns:
+        # PySocks would look the target up on its own, bypassing the resolver
+        family = allowed_gai_family()
+        if socks_version != socks.PROXY_TYPE_SOCKS5:
+            family = socket.AF_INET
+        host = resolver.resolve(host, port, family, socket.SOCK_STREAM)[0][4][0]
+    connect_timings.dns = clock() - started
+
+    err = None
+    for af, socktype, proto, canonname, sa in proxy_addresses:
+        sock = None
+        try:
+            sock = _TimedSOCKSSocket(af, socktype, proto)
+            for option in socket_options or ():
+                sock.setsockopt(*option)
+            if isinstance(timeout, (int, float)):
+                sock.settimeout(timeout)
+            # The resolved address, or PySocks would resolve the proxy again
+            sock.set_proxy(
+                socks_version,
+                sa[0],
+                socks_options["proxy_port"],
+                rdns,
+                socks_options["username"],
+                socks_options["password"],
+            )
+            if source_address:
+                sock.bind(source_address)
+            started = clock()
+            sock.connect((host, port))
+        except (SocketError, socks.ProxyError) as e:
+            err = e
+            if sock is not None:
+                sock.close()
+            continue
+
+        connected = clock()
+        greeted = sock.first_sent or connected
+        requested = sock.last_sent or connected
+        connect_timings.tcp = greeted - started
+        connect_timings.socks_handshake = requested - greeted
+        connect_timings.socks_connect = connected - requested
+        return sock
+
+    if err is not None:
+        raise err
+    raise SocketError("getaddrinfo returns an empty list")
+
+
 class SOCKSConnection(HTTPConnection):
     """
     A plain-text HTTP connection that connects via a SOCKS proxy.
@@ -93,15 +224,11 @@ class SOCKSConnection(HTTPConnection):
             extra_kw["socket_options"] = self.socket_options
 
         try:
-            conn = socks.create_connection(
+            conn = _create_connection(
                 (self.host, self.port),
-                proxy_type=self._socks_options["socks_version"],
-                proxy_addr=self._socks_options["proxy_host"],
-                proxy_port=self._socks_options["proxy_port"],
-                proxy_username=self._socks_options["username"],
-                proxy_password=self._socks_options["password"],
-                proxy_rdns=self._socks_options["rdns"],
+                self._socks_options,
                 timeout=self.timeout,
+                resolver=getattr(connect_context, "resolver", None),
                 **extra_kw
             )
 
@@ -160,6 +287,14 @@ class SOCKSProxyManager(PoolManager):
     """
     A version of the urllib3 ProxyManager that routes connections via the
     defined SOCKS proxy.
+
+    :param keepalive:
+        If set, tunnels send TCP keep-alive probes after ``keepalive``
+        seconds without traffic (see :func:`keepalive_socket_options`), so
+        that the proxy and middleboxes do not silently drop pooled tunnels
+        and dead ones are noticed. Combine it with a ``max_idle_time`` below
+        the proxy's idle timeout, and ``min_connections`` with a
+        ``maintenance_interval`` to keep tunnels open ahead of requests.
     """
 
     pool_classes_by_scheme = {
@@ -174,6 +309,7 @@ class SOCKSProxyManager(PoolManager):
         password=None,
         num_pools=10,
         headers=None,
+        keepalive=None,
         **connection_pool_kw
     ):
         parsed = parse_url(proxy_url)
@@ -209,6 +345,14 @@ class SOCKSProxyManager(PoolManager):
         }
         connection_pool_kw["_socks_options"] = socks_options
 
+        if keepalive is not None:
+            socket_options = connection_pool_kw.get("socket_options")
+            if socket_options is None:
+                socket_options = HTTPConnection.default_socket_options
+            connection_pool_kw["socket_options"] = list(
+                socket_options
+            ) + keepalive_socket_options(keepalive)
+
         super(SOCKSProxyManager, self).__init__(
             num_pools, headers, **connection_pool_kw
         )
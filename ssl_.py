@@ -13,7 +13,9 @@ from ..exceptions import (
     SNIMissingWarning,
     SSLError,
 )
+from .._collections import RecentlyUsedContainer
 from ..packages import six
+from .connection import connect_context
 from .url import BRACELESS_IPV6_ADDRZ_RE, IPV4_RE
 
 SSLContext = None
@@ -26,6 +28,11 @@ ALPN_PROTOCOLS = ["http/1.1"]
 # Maps the length of a digest to a possible hash function producing this digest
 HASHFUNC_MAP = {32: md5, 40: sha1, 64: sha256}
 
+#: Number of contexts kept by :func:`cached_urllib3_context`.
+SSL_CONTEXT_CACHE_SIZE = 32
+
+_context_cache = RecentlyUsedContainer(SSL_CONTEXT_CACHE_SIZE)
+
 
 def _const_compare_digest_backport(a, b):
     """
@@ -352,6 +359,102 @@ def create_urllib3_context(
     return context
 
 
+def cached_urllib3_context(
+    ssl_version=None,
+    cert_reqs=None,
+    ciphers=None,
+    ca_certs=None,
+    ca_cert_dir=None,
+    ca_cert_data=None,
+    certfile=None,
+    keyfile=None,
+    key_password=None,
+):
+    """
+    Return a context made by :func:`create_urllib3_context` with the given
+    CA certificates (or the system's) and client certificate loaded, shared
+    by every caller asking for the same settings.
+
+    Loading certificates is the most expensive part of setting up a
+    context, and TLS sessions can only be resumed with the context that
+    created them, so connections should share contexts where they can.
+    :func:`ssl_wrap_socket` does not load the files again into a context
+    returned by this function. Callers must not modify it.
+
+    Contexts are also keyed by the modification time and size of
+    ``ca_certs``, ``ca_cert_dir``, ``certfile`` and ``keyfile``, so a
+    rotated file is loaded into a new context. Certificates replaced in
+    place inside ``ca_cert_dir`` only change the time of the files
+    themselves; call :func:`clear_context_cache` after updating them.
+    """
+    files = (ca_certs, ca_cert_dir, ca_cert_data, certfile, keyfile, key_password)
+    key = (ssl_version, cert_reqs, ciphers) + files
+    key += tuple(_file_signature(f) for f in (ca_certs, ca_cert_dir, certfile, keyfile))
+    context = _context_cache.get(key)
+    if context is None:
+        context = create_urllib3_context(ssl_version, cert_reqs, ciphers=ciphers)
+        _load_context_files(context, *files)
+        # Tells ssl_wrap_socket the files are already loaded
+        context._urllib3_loaded_files = files
+        _context_cache[key] = context
+    return context
+
+
+def clear_context_cache():
+    """Drop the contexts shared by :func:`cached_urllib3_context`."""
+    _context_cache.clear()
+
+
+def _file_signature(path):
+    """Return the modification time and size of ``path``, or None."""
+    if not path:
+        return None
+    try:
+        stat = os.stat(path)
+    except (IOError, OSError):
+        return None  # Loading the file reports the error
+    return stat.st_mtime, stat.st_size
+
+
+def _load_context_files(
+    context,
+    ca_certs=None,
+    ca_cert_dir=None,
+    ca_cert_data=None,
+    certfile=None,
+    keyfile=None,
+    key_password=None,
+    load_default_certs=True,
+):
+    if ca_certs or ca_cert_dir or ca_cert_data:
+        try:
+            context.load_verify_locations(ca_certs, ca_cert_dir, ca_cert_data)
+        except (IOError, OSError) as e:
+            raise SSLError(e)
+
+    elif load_default_certs and hasattr(context, "load_default_certs"):
+        # try to load OS default certs; works well on Windows (require Python3.4+)
+        context.load_default_certs()
+
+    # Attempt to detect if we get the goofy behavior of the
+    # keyfile being encrypted and OpenSSL asking for the
+    # passphrase via the terminal and instead error out.
+    if keyfile and key_password is None and _is_key_file_encrypted(keyfile):
+        raise SSLError("Client private key is encrypted, password is required")
+
+    if certfile:
+        if key_password is None:
+            context.load_cert_chain(certfile, keyfile)
+        else:
+            context.load_cert_chain(certfile, keyfile, key_password)
+
+    try:
+        if hasattr(context, "set_alpn_protocols"):
+            context.set_alpn_protocols(ALPN_PROTOCOLS)
+    except NotImplementedError:  # Defensive: in CI, we always have set_alpn_protocols
+        pass
+
+
 def ssl_wrap_socket(
     sock,
     keyfile=None,
@@ -366,6 +469,7 @@ def ssl_wrap_socket(
     key_password=None,
     ca_cert_data=None,
     tls_in_tls=False,
+    session=None,
 ):
     """
     All arguments except for server_hostname, ssl_context, and ca_cert_dir have
@@ -389,41 +493,25 @@ def ssl_wrap_socket(
         passing as the cadata parameter to SSLContext.load_verify_locations()
     :param tls_in_tls:
         Use SSLTransport to wrap the existing socket.
+    :param session:
+        An :class:`ssl.SSLSession` of an earlier connection made with
+        ``ssl_context`` to resume. Defaults to the session the pool
+        connecting offers for ``ssl_context``, if any.
     """
+    files = (ca_certs, ca_cert_dir, ca_cert_data, certfile, keyfile, key_password)
     context = ssl_context
     if context is None:
         # Note: This branch of code and all the variables in it are no longer
         # used by urllib3 itself. We should consider deprecating and removing
         # this code.
-        context = create_urllib3_context(ssl_version, cert_reqs, ciphers=ciphers)
+        context = cached_urllib3_context(ssl_version, cert_reqs, ciphers, *files)
+    elif getattr(context, "_urllib3_loaded_files", None) != files:
+        _load_context_files(context, *files, load_default_certs=False)
 
-    if ca_certs or ca_cert_dir or ca_cert_data:
-        try:
-            context.load_verify_locations(ca_certs, ca_cert_dir, ca_cert_data)
-        except (IOError, OSError) as e:
-            raise SSLError(e)
-
-    elif ssl_context is None and hasattr(context, "load_default_certs"):
-        # try to load OS default certs; works well on Windows (require Python3.4+)
-        context.load_default_certs()
-
-    # Attempt to detect if we get the goofy behavior of the
-    # keyfile being encrypted and OpenSSL asking for the
-    # passphrase via the terminal and instead error out.
-    if keyfile and key_password is None and _is_key_file_encrypted(keyfile):
-        raise SSLError("Client private key is encrypted, password is required")
-
-    if certfile:
-        if key_password is None:
-            context.load_cert_chain(certfile, keyfile)
-        else:
-            context.load_cert_chain(certfile, keyfile, key_password)
-
-    try:
-        if hasattr(context, "set_alpn_protocols"):
-            context.set_alpn_protocols(ALPN_PROTOCOLS)
-    except NotImplementedError:  # Defensive: in CI, we always have set_alpn_protocols
-        pass
+    if session is None and not tls_in_tls:
+        offered = getattr(connect_context, "tls_session", None)
+        if offered is not None and offered[0] is context:
+            session = offered[1]
 
     # If we detect server_hostname is an IP address then the SNI
     # extension should not be used according to RFC3546 Section 3.1
@@ -447,10 +535,10 @@ def ssl_wrap_socket(
 
     if send_sni:
         ssl_sock = _ssl_wrap_socket_impl(
-            sock, context, tls_in_tls, server_hostname=server_hostname
+            sock, context, tls_in_tls, server_hostname=server_hostname, session=session
         )
     else:
-        ssl_sock = _ssl_wrap_socket_impl(sock, context, tls_in_tls)
+        ssl_sock = _ssl_wrap_socket_impl(sock, context, tls_in_tls, session=session)
     return ssl_sock
 
 
@@ -478,7 +566,9 @@ def _is_key_file_encrypted(key_file):
     return False
 
 
-def _ssl_wrap_socket_impl(sock, ssl_context, tls_in_tls, server_hostname=None):
+def _ssl_wrap_socket_impl(
+    sock, ssl_context, tls_in_tls, server_hostname=None, session=None
+):
     if tls_in_tls:
         if not SSLTransport:
             # Import error, ssl is not available.
@@ -489,7 +579,11 @@ def _ssl_wrap_socket_impl(sock, ssl_context, tls_in_tls, server_hostname=None):
         SSLTransport._validate_ssl_context_for_tls_in_tls(ssl_context)
         return SSLTransport(sock, ssl_context, server_hostname)
 
+    kwargs = {}
+    if session is not None:
+        # Only the standard library's SSLContext takes a session
+        kwargs["session"] = session
     if server_hostname:
-        return ssl_context.wrap_socket(sock, server_hostname=server_hostname)
+        return ssl_context.wrap_socket(sock, server_hostname=server_hostname, **kwargs)
     else:
-        return ssl_context.wrap_socket(sock)
+        return ssl_context.wrap_socket(sock, **kwargs)
@@ -6,6 +6,9 @@ from ..exceptions import ProxySchemeUnsupported
 from ..packages import six
 
 SSL_BLOCKSIZE = 16384
+#: Size up to which the receive buffer of a transport grows while the
+#: socket keeps filling it, as during bulk downloads.
+SSL_MAX_BLOCKSIZE = 262144
 
 
 class SSLTransport:
@@ -53,6 +56,10 @@ class SSLTransport:
         self.suppress_ragged_eofs = suppress_ragged_eofs
         self.socket = socket
 
+        # Ciphertext is received here and handed to self.incoming, which
+        # copies it, so the buffer is reused for every read.
+        self._recv_buffer = memoryview(bytearray(SSL_BLOCKSIZE))
+
         self.sslobj = ssl_context.wrap_bio(
             self.incoming, self.outgoing, server_hostname=server_hostname
         )
@@ -207,15 +214,25 @@ class SSLTransport:
                     raise e
                 errno = e.errno
 
-            buf = self.outgoing.read()
-            self.socket.sendall(buf)
+            # All pending records leave in one sendall(); most reads have
+            # nothing to send at all.
+            if self.outgoing.pending:
+                self.socket.sendall(self.outgoing.read())
 
             if errno is None:
                 should_loop = False
             elif errno == ssl.SSL_ERROR_WANT_READ:
-                buf = self.socket.recv(SSL_BLOCKSIZE)
-                if buf:
-                    self.incoming.write(buf)
-                else:
-                    self.incoming.write_eof()
+                self._fill_incoming()
         return ret
+
+    def _fill_incoming(self):
+        """Receive ciphertext from the socket into self.incoming."""
+        buffer = self._recv_buffer
+        received = self.socket.recv_into(buffer)
+        if not received:
+            self.incoming.write_eof()
+            return
+        self.incoming.write(buffer[:received])
+        if received == len(buffer) and received < SSL_MAX_BLOCKSIZE:
+            # More was waiting than the buffer holds, take bigger bites
+            self._recv_buffer = memoryview(bytearray(received * 2))
@@ -0,0 +1,64 @@
+from __future__ import absolute_import
+
+import threading
+
+import pytest
+
+from urllib3.packages.six.moves import BaseHTTPServer, socketserver
+
+
+class _Server(socketserver.ThreadingMixIn, BaseHTTPServer.HTTPServer):
+    daemon_threads = True
+
+    def process_request(self, request, client_address):
+        self.connections.append(request)
+        socketserver.ThreadingMixIn.process_request(self, request, client_address)
+
+
+class _Handler(BaseHTTPServer.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def _respond(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        if length:
+            self.rfile.read(length)
+        self.server.requests.append((self.command, self.path))
+        status, headers, body = self.server.respond(self)
+        self.send_response(status)
+        for name, value in headers:
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    do_GET = do_POST = do_PUT = do_DELETE = _respond
+
+
+def _ok(handler):
+    return 200, [], b"ok"
+
+
+@pytest.fixture
+def http_server():
+    """
+    A keep-alive HTTP server on 127.0.0.1 answering ``200 ok``. Set its
+    ``respond(handler)`` to return other ``(status, headers, body)``; its
+    ``requests`` and ``connections`` record what it received.
+    """
+    server = _Server(("127.0.0.1", 0), _Handler)
+    server.requests = []
+    server.connections = []
+    server.respond = _ok
+    thread = threading.Thread(
+        target=server.serve_forever, kwargs={"poll_interval": 0.05}
+    )
+    thread.daemon = True
+    thread.start()
+    server.host, server.port = server.server_address
+    server.url = "http://%s:%d" % server.server_address
+    yield server
+    server.shutdown()
+    server.server_close()
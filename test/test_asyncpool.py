@@ -0,0 +1,188 @@
+from __future__ import absolute_import
+
+import sys
+import time
+
+import pytest
+
+from urllib3.exceptions import ReadTimeoutError
+from urllib3.util.timeout import Timeout
+
+pytestmark = pytest.mark.skipif(
+    sys.version_info < (3, 7), reason="asyncpool requires Python 3.7+"
+)
+
+if sys.version_info >= (3, 7):
+    import asyncio
+
+    from urllib3.asyncpool import AsyncHTTPConnectionPool, AsyncPoolManager
+
+
+async def _read_request(reader):
+    """Read one request from ``reader``; return its body, or None at EOF."""
+    request_line = await reader.readline()
+    if not request_line:
+        return None
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b""):
+            break
+        name, _, value = line.partition(b":")
+        if name.strip().lower() == b"content-length":
+            length = int(value)
+    return request_line.split()[0] + b" " + await reader.readexactly(length)
+
+
+def _response(body, headers=b""):
+    return (
+        b"HTTP/1.1 200 OK\r\nContent-Length: %d\r\n%s\r\n%s"
+        % (len(body), headers, body)
+    )
+
+
+def _run(handler, test):
+    """Serve ``handler`` on a local port and run ``test(port)`` against it."""
+
+    async def main():
+        server = await asyncio.start_server(handler, "127.0.0.1", 0)
+        try:
+            return await test(server.sockets[0].getsockname()[1])
+        finally:
+            server.close()
+            await server.wait_closed()
+
+    return asyncio.run(main())
+
+
+async def _echo(reader, writer):
+    while True:
+        body = await _read_request(reader)
+        if body is None:
+            break
+        writer.write(_response(body))
+        await writer.drain()
+    writer.close()
+
+
+class TestAsyncHTTPConnectionPool(object):
+    def test_requests_reuse_connection(self):
+        async def test(port):
+            async with AsyncHTTPConnectionPool("127.0.0.1", port) as pool:
+                r = await pool.request("GET", "/")
+                assert r.status == 200
+                assert r.data == b"GET "
+                r = await pool.request("POST", "/", body=b"hello")
+                assert r.data == b"POST hello"
+                assert pool.num_connections == 1
+                assert pool.num_requests == 2
+
+        _run(_echo, test)
+
+    def test_concurrent_requests(self):
+        async def test(port):
+            async with AsyncHTTPConnectionPool(
+                "127.0.0.1", port, maxsize=4, block=True
+            ) as pool:
+                responses = await asyncio.gather(
+                    *[pool.request("POST", "/", body=b"%d" % i) for i in range(50)]
+                )
+                assert [r.data for r in responses] == [
+                    b"POST %d" % i for i in range(50)
+                ]
+                assert pool.num_connections <= 4
+
+        _run(_echo, test)
+
+    def test_dropped_connection_is_replaced(self):
+        writers = []
+
+        async def handler(reader, writer):
+            writers.append(writer)
+            await _echo(reader, writer)
+
+        async def test(port):
+            async with AsyncHTTPConnectionPool("127.0.0.1", port) as pool:
+                await pool.request("GET", "/")
+                conn = pool.pool[0]
+                assert not conn.is_dropped()
+
+                writers[0].close()
+                await asyncio.sleep(0.05)
+                assert conn.is_dropped()
+
+                r = await pool.request("GET", "/", retries=False)
+                assert r.data == b"GET "
+                assert pool.pool[0] is not conn
+
+                # Unsolicited data on an idle connection also means it's unusable
+                writers[1].write(b"junk")
+                await asyncio.sleep(0.05)
+                assert pool.pool[0].is_dropped()
+
+        _run(handler, test)
+
+    def test_total_timeout_covers_connect_and_read(self):
+        async def handler(reader, writer):
+            await _read_request(reader)
+            await asyncio.sleep(1)
+            writer.close()
+
+        async def test(port):
+            timeout = Timeout(total=0.3, read=5)
+            async with AsyncHTTPConnectionPool(
+                "127.0.0.1", port, timeout=timeout, retries=False
+            ) as pool:
+                start = time.time()
+                with pytest.raises(ReadTimeoutError):
+                    await pool.request("GET", "/")
+                assert time.time() - start < 0.9
+
+        _run(handler, test)
+
+    def test_total_timeout_covers_sending(self):
+        stop = []
+
+        async def handler(reader, writer):
+            # Never reads, so the client's writes back up
+            while not stop:
+                await asyncio.sleep(0.05)
+            writer.close()
+
+        async def test(port):
+            timeout = Timeout(total=0.3, read=5)
+            async with AsyncHTTPConnectionPool(
+                "127.0.0.1", port, timeout=timeout, retries=False
+            ) as pool:
+                start = time.time()
+                with pytest.raises(ReadTimeoutError):
+                    await pool.request("POST", "/", body=b"x" * (64 * 1024 * 1024))
+                assert time.time() - start < 0.9
+            stop.append(True)
+
+        _run(handler, test)
+
+    def test_unsupported_content_encoding_is_not_decoded(self):
+        async def handler(reader, writer):
+            await _read_request(reader)
+            writer.write(_response(b"raw", b"Content-Encoding: unknown\r\n"))
+            await writer.drain()
+            writer.close()
+
+        async def test(port):
+            async with AsyncHTTPConnectionPool("127.0.0.1", port) as pool:
+                r = await pool.request("GET", "/")
+                assert r.data == b"raw"
+
+        _run(handler, test)
+
+
+class TestAsyncPoolManager(object):
+    def test_request(self):
+        async def test(port):
+            async with AsyncPoolManager() as http:
+                r = await http.request("POST", "http://127.0.0.1:%d/" % port, body=b"x")
+                assert r.data == b"POST x"
+                assert len(http.pools) == 1
+
+        _run(_echo, test)
@@ -0,0 +1,125 @@
+from __future__ import absolute_import
+
+import socket
+import threading
+
+import pytest
+
+from urllib3 import PoolManager
+from urllib3.batch import BatchResult, BatchTimeoutError, run_batch
+from urllib3.exceptions import NewConnectionError, TimeoutError, URLSchemeUnknown
+
+
+def _gated(gate):
+    def respond(handler):
+        if handler.path == "/slow":
+            gate.wait(5)
+        return 200, [], handler.path.encode("ascii")
+
+    return respond
+
+
+def _closed_port():
+    sock = socket.socket()
+    sock.bind(("127.0.0.1", 0))
+    port = sock.getsockname()[1]
+    sock.close()
+    return port
+
+
+class TestRequestBatch(object):
+    def test_results_in_request_order(self, http_server):
+        http_server.respond = _gated(None)
+        urls = [http_server.url + "/%d" % i for i in range(5)]
+
+        with PoolManager(maxsize=2) as http:
+            results = http.request_batch([("GET", url) for url in urls])
+
+        assert [result.index for result in results] == list(range(5))
+        assert all(isinstance(result, BatchResult) for result in results)
+        assert all(result.ok for result in results)
+        assert [result.response.data for result in results] == [
+            b"/%d" % i for i in range(5)
+        ]
+        assert [result.url for result in results] == urls
+        assert len(http_server.connections) <= 2
+
+    def test_max_workers_limits_connections(self, http_server):
+        http_server.respond = _gated(None)
+
+        with PoolManager(maxsize=4) as http:
+            results = http.request_batch(
+                [("GET", http_server.url + "/")] * 4, max_workers=1
+            )
+
+        assert all(result.ok for result in results)
+        assert len(http_server.connections) == 1
+
+    def test_errors_are_per_url(self, http_server):
+        http_server.respond = _gated(None)
+        requests = [
+            ("GET", http_server.url + "/before"),
+            ("GET", "ftp://127.0.0.1/"),
+            ("GET", "http://127.0.0.1:%d/" % _closed_port(), {"retries": False}),
+            ("POST", http_server.url + "/after", {"body": b"x"}),
+        ]
+
+        with PoolManager() as http:
+            results = http.request_batch(requests)
+
+        before, scheme, refused, after = results
+        assert before.ok and before.response.data == b"/before"
+        assert isinstance(scheme.error, URLSchemeUnknown)
+        assert scheme.response is None
+        assert isinstance(refused.error, NewConnectionError)
+        assert refused.method == "GET"
+        assert after.ok and after.response.data == b"/after"
+        assert after.method == "POST"
+
+    def test_as_completed(self, http_server):
+        gate = threading.Event()
+        http_server.respond = _gated(gate)
+
+        with PoolManager(maxsize=2) as http:
+            results = http.request_batch(
+                [("GET", http_server.url + path) for path in ("/slow", "/fast")],
+                as_completed=True,
+            )
+            first = next(results)
+            gate.set()
+            second = next(results)
+            with pytest.raises(StopIteration):
+                next(results)
+
+        assert (first.index, first.response.data) == (1, b"/fast")
+        assert (second.index, second.response.data) == (0, b"/slow")
+
+    def test_batch_timeout(self, http_server):
+        gate = threading.Event()
+        http_server.respond = _gated(gate)
+
+        try:
+            with PoolManager(maxsize=1) as http:
+                results = http.request_batch(
+                    [("GET", http_server.url + path) for path in ("/slow", "/")],
+                    timeout=0.3,
+                    retries=False,
+                )
+        finally:
+            gate.set()
+
+        slow, queued = results
+        # The running request hits its capped read timeout or the deadline
+        assert isinstance(slow.error, TimeoutError)
+        assert isinstance(queued.error, BatchTimeoutError)
+        assert queued.response is None
+        assert ("GET", "/") not in http_server.requests
+
+    def test_run_batch_reports_unpoolable_url(self):
+        with PoolManager() as http:
+            results = list(run_batch(http, [("GET", "ftp://127.0.0.1/")]))
+
+        assert len(results) == 1
+        assert results[0].index == 0
+        assert isinstance(results[0].error, URLSchemeUnknown)
+        assert not results[0].ok
@@ -0,0 +1,99 @@
+from __future__ import absolute_import
+
+import io
+import threading
+import time
+
+import pytest
+
+from urllib3.coalesce import SingleFlight
+from urllib3.exceptions import TimeoutError
+from urllib3.response import HTTPResponse
+from urllib3.util.retry import Retry
+from urllib3.util.timeout import Timeout
+
+
+class TestSingleFlightKey(object):
+    def test_equal_retries_share_a_key(self):
+        sf = SingleFlight()
+        assert sf.key("GET", "/", retries=Retry(3)) == sf.key(
+            "get", "/", retries=Retry(3)
+        )
+        assert sf.key(
+            "GET", "/", retries=Retry(3, status_forcelist=[500, 503])
+        ) == sf.key("GET", "/", retries=Retry(3, status_forcelist=[503, 500]))
+
+    @pytest.mark.parametrize(
+        "kw",
+        [
+            {"retries": Retry(2)},
+            {"retries": Retry(3, raise_on_redirect=False)},
+            {"retries": Retry(3, status_forcelist=[500])},
+            {"retries": 3},
+            {"redirect": False},
+        ],
+    )
+    def test_different_settings_differ(self, kw):
+        sf = SingleFlight()
+        assert sf.key("GET", "/", retries=Retry(3)) != sf.key(
+            "GET", "/", **dict({"retries": Retry(3)}, **kw)
+        )
+
+    def test_false_and_zero_differ(self):
+        sf = SingleFlight()
+        assert sf.key("GET", "/", retries=False) != sf.key("GET", "/", retries=0)
+
+    def test_key_headers_and_body(self):
+        sf = SingleFlight()
+        accept = sf.key("GET", "/", {"Accept": "a"})
+        assert accept == sf.key("GET", "/", {"accept": "a"})
+        assert accept != sf.key("GET", "/", {"Accept": "b"})
+        assert sf.key("GET", "/", {"X-Other": "a"}) == sf.key("GET", "/")
+        assert sf.key("GET", "/", body=b"x") is None
+        assert sf.key("POST", "/") is None
+
+
+class TestSingleFlightUrlopen(object):
+    def _slow_urlopen(self, calls, release):
+        def urlopen(method, url, **kw):
+            calls.append(url)
+            release.wait(5)
+            return HTTPResponse(
+                body=io.BytesIO(b"ok"), status=200, preload_content=False
+            )
+
+        return urlopen
+
+    def test_followers_share_the_leaders_request(self):
+        sf = SingleFlight()
+        calls, release = [], threading.Event()
+        urlopen = self._slow_urlopen(calls, release)
+        results = []
+
+        def request():
+            results.append(sf.urlopen(urlopen, "GET", "/", retries=Retry(3)).data)
+
+        threads = [threading.Thread(target=request) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        time.sleep(0.1)
+        release.set()
+        for thread in threads:
+            thread.join()
+        assert results == [b"ok"] * 5
+        assert calls == ["/"]
+        assert sf.coalesced == 4
+
+    def test_follower_gives_up_after_its_timeout(self):
+        sf = SingleFlight()
+        calls, release = [], threading.Event()
+        urlopen = self._slow_urlopen(calls, release)
+        leader = threading.Thread(target=sf.urlopen, args=(urlopen, "GET", "/"))
+        leader.start()
+        time.sleep(0.05)
+        start = time.time()
+        with pytest.raises(TimeoutError):
+            sf.urlopen(urlopen, "GET", "/", timeout=Timeout(total=0.2))
+        assert time.time() - start < 1
+        release.set()
+        leader.join()
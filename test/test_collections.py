@@ -0,0 +1,242 @@
+from __future__ import absolute_import
+
+import pickle
+
+import pytest
+
+from urllib3._collections import ConcurrentRecentlyUsedContainer, HTTPHeaderDict
+
+
+def _filled(maxsize, disposed=None):
+    dispose_func = disposed.append if disposed is not None else None
+    container = ConcurrentRecentlyUsedContainer(maxsize, dispose_func=dispose_func)
+    for i in range(maxsize):
+        container[i] = str(i)
+    return container
+
+
+class TestConcurrentRecentlyUsedContainer(object):
+    def test_evicts_oldest_unreferenced(self):
+        disposed = []
+        container = _filled(3, disposed)
+
+        container[3] = "3"
+
+        assert sorted(container.keys()) == [1, 2, 3]
+        assert disposed == ["0"]
+
+    def test_referenced_entry_gets_second_chance(self):
+        disposed = []
+        container = _filled(3, disposed)
+        assert container[0] == "0"
+        assert container.get(1) == "1"
+
+        # 0 and 1 lose their bit and go to the back, so 2 goes first
+        container[3] = "3"
+        assert disposed == ["2"]
+
+        # then the clock reaches 0 and 1, which are no longer referenced
+        container[4] = "4"
+        container[5] = "5"
+        assert disposed == ["2", "0", "1"]
+        assert sorted(container.keys()) == [3, 4, 5]
+
+    def test_all_referenced_evicts_oldest(self):
+        disposed = []
+        container = _filled(3, disposed)
+        for i in range(3):
+            container[i]
+
+        container[3] = "3"
+
+        assert disposed == ["0"]
+        assert sorted(container.keys()) == [1, 2, 3]
+
+    def test_new_entry_is_never_evicted(self):
+        container = _filled(1)
+        container[0]
+
+        container[1] = "1"
+
+        assert list(container.keys()) == [1]
+
+    def test_contains_does_not_reference(self):
+        disposed = []
+        container = _filled(2, disposed)
+        assert 0 in container
+
+        container[2] = "2"
+
+        assert disposed == ["0"]
+
+    def test_replaced_entry_keeps_its_new_position(self):
+        disposed = []
+        container = _filled(3, disposed)
+        container[0] = "zero"
+        assert disposed == ["0"]
+
+        # The stale clock slot for the old value of 0 is skipped
+        container[3] = "3"
+        assert disposed == ["0", "1"]
+        container[4] = "4"
+        assert disposed == ["0", "1", "2"]
+        assert container[0] == "zero"
+
+    def test_deleted_entry_is_skipped(self):
+        disposed = []
+        container = _filled(3, disposed)
+        del container[0]
+        assert disposed == ["0"]
+
+        container[3] = "3"
+        assert disposed == ["0"]
+        container[4] = "4"
+        assert disposed == ["0", "1"]
+        assert sorted(container.keys()) == [2, 3, 4]
+
+    def test_clock_is_pruned(self):
+        container = _filled(2)
+        for i in range(100):
+            container[0] = i
+
+        assert len(container._clock) <= 2 * len(container) + 16
+        assert container[0] == 99
+
+    def test_clear_disposes_everything(self):
+        disposed = []
+        container = _filled(3, disposed)
+
+        container.clear()
+
+        assert len(container) == 0
+        assert sorted(disposed) == ["0", "1", "2"]
+        container[5] = "5"
+        assert list(container.keys()) == [5]
+
+
+def _headers():
+    headers = HTTPHeaderDict([("Set-Cookie", "a=1"), ("Host", "example.com")])
+    headers.add("set-cookie", "b=2")
+    headers["Content-Length"] = "7"
+    return headers
+
+
+def _assert_index_consistent(headers):
+    """A cached lowercase index must match one rebuilt from scratch."""
+    cached = headers._index
+    headers._index = None
+    rebuilt = headers._get_index()
+    if cached is not None:
+        assert cached == rebuilt
+
+
+class TestHTTPHeaderDict(object):
+    @pytest.mark.parametrize("protocol", range(pickle.HIGHEST_PROTOCOL + 1))
+    def test_pickle_roundtrip(self, protocol):
+        headers = _headers()
+        headers["host"]  # builds the index, which is not pickled
+
+        clone = pickle.loads(pickle.dumps(headers, protocol))
+
+        assert type(clone) is HTTPHeaderDict
+        assert clone == headers
+        assert clone.items() == headers.items()
+        assert clone.getlist("SET-COOKIE") == ["a=1", "b=2"]
+        assert list(clone) == ["Set-Cookie", "Host", "Content-Length"]
+
+        clone.add("Host", "other")
+        assert headers.getlist("host") == ["example.com"]
+
+    def test_pickle_before_index_is_built(self):
+        headers = HTTPHeaderDict([("A", "1"), ("a", "2")])
+        assert headers._index is None
+
+        clone = pickle.loads(pickle.dumps(headers))
+
+        assert clone["A"] == "1, 2"
+
+    def test_index_after_add(self):
+        headers = _headers()
+        headers["host"]
+
+        headers.add("HOST", "other")
+        headers.add("X-New", "1")
+
+        _assert_index_consistent(headers)
+        assert headers.getlist("host") == ["example.com", "other"]
+        assert headers["x-new"] == "1"
+
+    def test_index_after_delete(self):
+        headers = _headers()
+        headers["host"]
+
+        del headers["SET-COOKIE"]
+
+        _assert_index_consistent(headers)
+        assert "set-cookie" not in headers
+        assert headers["content-length"] == "7"
+        assert list(headers) == ["Host", "Content-Length"]
+
+        headers["X-After"] = "1"
+        _assert_index_consistent(headers)
+        assert headers.items() == [
+            ("Host", "example.com"),
+            ("Content-Length", "7"),
+            ("X-After", "1"),
+        ]
+
+    def test_index_after_pop(self):
+        headers = _headers()
+        headers["host"]
+
+        assert headers.pop("HOST") == "example.com"
+        assert headers.pop("host", None) is None
+
+        _assert_index_consistent(headers)
+        assert headers.getlist("set-cookie") == ["a=1", "b=2"]
+        with pytest.raises(KeyError):
+            headers.pop("host")
+
+    def test_index_after_setitem_over_repeated_field(self):
+        headers = _headers()
+        headers["host"]
+
+        headers["SET-COOKIE"] = "c=3"
+
+        _assert_index_consistent(headers)
+        assert headers.getlist("set-cookie") == ["c=3"]
+        assert list(headers) == ["SET-COOKIE", "Host", "Content-Length"]
+        assert headers["content-length"] == "7"
+
+    def test_index_after_extend(self):
+        headers = _headers()
+        headers["host"]
+
+        headers.extend([("host", "other"), ("X-Raw", "1")])
+        headers.extend({"x-raw": "2"}, Via="proxy")
+
+        _assert_index_consistent(headers)
+        assert headers.getlist("HOST") == ["example.com", "other"]
+        assert headers.getlist("x-raw") == ["1", "2"]
+        assert headers["via"] == "proxy"
+
+    def test_extend_before_index_is_built(self):
+        headers = HTTPHeaderDict()
+        headers.extend([("A", "1"), ("a", "2"), ("B", "3")])
+
+        assert headers._index is None
+        assert headers["A"] == "1, 2"
+        assert len(headers) == 2
+
+    def test_copy_does_not_share_index(self):
+        headers = _headers()
+        headers["host"]
+
+        clone = headers.copy()
+        clone.add("host", "other")
+        del clone["set-cookie"]
+
+        _assert_index_consistent(headers)
+        _assert_index_consistent(clone)
+        assert headers.getlist("host") == ["example.com"]
+        assert headers.getlist("set-cookie") == ["a=1", "b=2"]
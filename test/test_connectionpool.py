@@ -0,0 +1,116 @@
+from __future__ import absolute_import
+
+import socket
+import time
+
+import pytest
+
+from urllib3 import HTTPConnectionPool, connectionpool
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(connectionpool, "current_time", lambda: now[0])
+    return now
+
+
+def _close_server_side(server):
+    for sock in server.connections:
+        try:
+            sock.shutdown(socket.SHUT_RDWR)
+        except socket.error:
+            pass
+    time.sleep(0.05)
+
+
+class TestPoolMaintenance(object):
+    def test_prewarm_opens_min_connections(self, http_server):
+        with HTTPConnectionPool(
+            http_server.host, http_server.port, maxsize=3, min_connections=2
+        ) as pool:
+            assert pool.prewarm() == 2
+            assert pool.prewarm() == 0  # Already warm
+            time.sleep(0.05)
+            assert len(http_server.connections) == 2
+            assert pool.metrics.counters["connections_created"] == 2
+
+            assert pool.request("GET", "/").status == 200
+            assert len(http_server.connections) == 2
+            assert pool.num_connections == 2
+
+    def test_prewarm_never_grows_beyond_maxsize(self, http_server):
+        with HTTPConnectionPool(http_server.host, http_server.port, maxsize=2) as pool:
+            assert pool.prewarm(5) == 2
+
+    def test_prewarm_stops_at_connect_failure(self):
+        sock = socket.socket()
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+        sock.close()
+        with HTTPConnectionPool("127.0.0.1", port, min_connections=2) as pool:
+            assert pool.prewarm() == 0
+            assert pool.metrics.counters["connect_failures"] == 1
+
+    def test_evict_stale_closes_dropped_connections(self, http_server):
+        with HTTPConnectionPool(http_server.host, http_server.port, maxsize=2) as pool:
+            pool.request("GET", "/")
+            assert pool.evict_stale() == 0
+
+            _close_server_side(http_server)
+            assert pool.evict_stale() == 1
+            assert pool.metrics.counters["connections_dropped"] == 1
+            assert pool.pool.qsize() == 2  # The placeholder keeps the size
+
+            assert pool.request("GET", "/").status == 200
+            assert len(http_server.connections) == 2
+
+    def test_evict_stale_closes_idle_connections(self, http_server, clock):
+        with HTTPConnectionPool(
+            http_server.host, http_server.port, max_idle_time=30
+        ) as pool:
+            pool.request("GET", "/")
+            clock[0] += 29
+            assert pool.evict_stale() == 0
+            clock[0] += 2
+            assert pool.evict_stale() == 1
+
+    def test_max_lifetime_retires_connection_at_checkout(self, http_server, clock):
+        with HTTPConnectionPool(
+            http_server.host, http_server.port, max_lifetime=60
+        ) as pool:
+            pool.request("GET", "/")
+            clock[0] += 30
+            pool.request("GET", "/")
+            assert len(http_server.connections) == 1
+
+            clock[0] += 31
+            pool.request("GET", "/")
+            assert len(http_server.connections) == 2
+            assert pool.metrics.counters["connections_dropped"] == 1
+
+    def test_put_conn_sweeps_without_maintenance_thread(self, http_server, clock):
+        with HTTPConnectionPool(
+            http_server.host, http_server.port, maxsize=2, max_idle_time=10
+        ) as pool:
+            first = pool._get_conn()
+            second = pool._get_conn()
+            first.connect()
+            second.connect()
+            pool._put_conn(first)
+            clock[0] += 11
+            # Returning a connection sweeps the idle one
+            pool._put_conn(second)
+            assert first.sock is None
+            assert second.sock is not None
+
+    def test_put_conn_accepts_none(self, http_server, clock):
+        with HTTPConnectionPool(
+            http_server.host, http_server.port, maxsize=1, max_idle_time=10
+        ) as pool:
+            pool._put_conn(pool._get_conn())
+            conn = pool._get_conn()
+            clock[0] += 11
+            pool._put_conn(None)
+            assert pool.pool.qsize() == 1
+            conn.close()
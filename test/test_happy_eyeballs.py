@@ -0,0 +1,115 @@
+from __future__ import absolute_import
+
+import socket
+import time
+
+import pytest
+
+from urllib3.util.connection import _staggered_connect
+
+
+def _address(port):
+    return (
+        socket.AF_INET,
+        socket.SOCK_STREAM,
+        socket.IPPROTO_TCP,
+        "",
+        ("127.0.0.1", port),
+    )
+
+
+@pytest.fixture
+def listener():
+    sock = socket.socket()
+    sock.bind(("127.0.0.1", 0))
+    sock.listen(1)
+    yield sock
+    sock.close()
+
+
+@pytest.fixture
+def refused():
+    """The address of a port nobody listens on."""
+    sock = socket.socket()
+    sock.bind(("127.0.0.1", 0))
+    port = sock.getsockname()[1]
+    sock.close()
+    return _address(port)
+
+
+@pytest.fixture
+def unresponsive():
+    """
+    The address of a listener whose backlog is full, so that connects to it
+    stay pending instead of completing or failing.
+    """
+    sock = socket.socket()
+    sock.bind(("127.0.0.1", 0))
+    sock.listen(0)
+    address = sock.getsockname()
+    backlog = []
+    for _ in range(4):
+        filler = socket.socket()
+        filler.setblocking(False)
+        filler.connect_ex(address)
+        backlog.append(filler)
+    time.sleep(0.05)
+    yield _address(address[1])
+    for filler in backlog:
+        filler.close()
+    sock.close()
+
+
+class TestStaggeredConnect(object):
+    def test_connects_to_first_address(self, listener):
+        sock = _staggered_connect(
+            [_address(listener.getsockname()[1])], 5, None, None, 0.25
+        )
+        try:
+            assert sock.getpeername() == listener.getsockname()
+            assert sock.gettimeout() == 5
+        finally:
+            sock.close()
+
+    def test_failure_starts_next_attempt_without_pending_ones(
+        self, refused, listener
+    ):
+        start = time.time()
+        sock = _staggered_connect(
+            [refused, _address(listener.getsockname()[1])], 5, None, None, 2.0
+        )
+        try:
+            assert sock.getpeername() == listener.getsockname()
+            assert time.time() - start < 1.0
+        finally:
+            sock.close()
+
+    def test_failure_starts_next_attempt_with_pending_ones(
+        self, unresponsive, refused, listener
+    ):
+        # The first attempt hangs; the second starts after the delay and
+        # fails, which must start the third at once instead of after
+        # another delay.
+        start = time.time()
+        sock = _staggered_connect(
+            [unresponsive, refused, _address(listener.getsockname()[1])],
+            5,
+            None,
+            None,
+            0.5,
+        )
+        try:
+            assert sock.getpeername() == listener.getsockname()
+            assert time.time() - start < 0.9
+        finally:
+            sock.close()
+
+    def test_raises_last_error(self, refused):
+        with pytest.raises(socket.error):
+            _staggered_connect([refused, refused], 5, None, None, 0.25)
+
+    def test_timeout(self, unresponsive):
+        start = time.time()
+        with pytest.raises(socket.timeout):
+            _staggered_connect([unresponsive, unresponsive], 0.3, None, None, 0.1)
+        assert time.time() - start < 1.0
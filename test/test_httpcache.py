@@ -0,0 +1,201 @@
+from __future__ import absolute_import
+
+import os
+import threading
+import time
+
+import pytest
+
+from urllib3 import PoolManager
+from urllib3.httpcache import CachedResponse, FileCache, HTTPCache, MemoryCache
+from urllib3.packages.six.moves import BaseHTTPServer, socketserver
+
+
+class _Server(socketserver.ThreadingMixIn, BaseHTTPServer.HTTPServer):
+    daemon_threads = True
+
+
+class _Handler(BaseHTTPServer.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def _respond(self):
+        server = self.server
+        server.requests.append((self.command, self.path, dict(self.headers.items())))
+        length = int(self.headers.get("Content-Length") or 0)
+        if length:
+            self.rfile.read(length)
+        status, headers, body = server.routes[self.path](self)
+        self.send_response(status)
+        for name, value in headers:
+            self.send_header(name, value)
+        if body is None:
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            for chunk in server.chunks:
+                if chunk is None:
+                    # Hold back the rest until the client has seen the response
+                    self.wfile.flush()
+                    server.gate.wait(5)
+                    continue
+                self.wfile.write(b"%x\r\n%s\r\n" % (len(chunk), chunk))
+            self.wfile.write(b"0\r\n\r\n")
+        else:
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    do_GET = do_POST = _respond
+
+
+@pytest.fixture
+def server():
+    httpd = _Server(("127.0.0.1", 0), _Handler)
+    httpd.requests = []
+    httpd.routes = {}
+    httpd.chunks = []
+    httpd.gate = threading.Event()
+    thread = threading.Thread(target=httpd.serve_forever)
+    thread.daemon = True
+    thread.start()
+    httpd.url = "http://127.0.0.1:%d" % httpd.server_address[1]
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def _upstream(server, path):
+    return [r for r in server.requests if r[1] == path]
+
+
+class TestHTTPCache(object):
+    def test_fresh_hit_makes_no_request(self, server):
+        server.routes["/"] = lambda h: (200, [("Cache-Control", "max-age=60")], b"hi")
+        cache = HTTPCache()
+        http = PoolManager(cache=cache)
+
+        first = http.request("GET", server.url + "/")
+        second = http.request("GET", server.url + "/")
+        assert first.data == second.data == b"hi"
+        assert not getattr(first, "from_cache", False)
+        assert second.from_cache
+        assert len(server.requests) == 1
+        assert cache.hits == 1
+
+    def test_stale_entry_revalidated_by_304(self, server):
+        versions = iter(["1", "2"])
+
+        def route(handler):
+            headers = [("Cache-Control", "max-age=0"), ("X-Version", next(versions))]
+            if handler.headers.get("If-None-Match") == '"v1"':
+                return 304, [("ETag", '"v1"')] + headers, b""
+            return 200, [("ETag", '"v1"')] + headers, b"body"
+
+        server.routes["/"] = route
+        cache = HTTPCache()
+        http = PoolManager(cache=cache)
+
+        assert http.request("GET", server.url + "/").data == b"body"
+        response = http.request("GET", server.url + "/")
+        assert response.status == 200
+        assert response.data == b"body"
+        assert response.headers["X-Version"] == "2"
+        assert server.requests[1][2].get("If-None-Match") == '"v1"'
+        assert cache.revalidated == 1
+        stored = cache.backend.get(server.url + "/")
+        assert dict(stored.headers)["X-Version"] == "2"
+
+    def test_vary_mismatch_is_not_served(self, server):
+        server.routes["/"] = lambda h: (
+            200,
+            [("Cache-Control", "max-age=60"), ("Vary", "Accept")],
+            h.headers.get("Accept", "").encode("ascii"),
+        )
+        http = PoolManager(cache=HTTPCache())
+
+        for accept in ("a", "b"):
+            response = http.request("GET", server.url + "/", headers={"Accept": accept})
+            assert response.data == accept.encode("ascii")
+        assert len(server.requests) == 2
+        response = http.request("GET", server.url + "/", headers={"Accept": "b"})
+        assert response.data == b"b"
+        assert response.from_cache
+
+    def test_unsafe_method_invalidates(self, server):
+        server.routes["/"] = lambda h: (200, [("Cache-Control", "max-age=60")], b"x")
+        cache = HTTPCache()
+        http = PoolManager(cache=cache)
+
+        http.request("GET", server.url + "/")
+        assert cache.backend.get(server.url + "/") is not None
+        http.request("POST", server.url + "/", body=b"data")
+        assert cache.backend.get(server.url + "/") is None
+        http.request("GET", server.url + "/")
+        assert [method for method, _, _ in server.requests] == ["GET", "POST", "GET"]
+
+    @pytest.mark.parametrize("preload_content", [True, False])
+    def test_oversized_chunked_body_passes_through(self, server, preload_content):
+        server.routes["/"] = lambda h: (200, [("Cache-Control", "max-age=60")], None)
+        server.chunks = [b"a" * 7, b"b" * 7, None, b"c" * 7]
+        cache = HTTPCache(MemoryCache(max_bytes=10))
+        http = PoolManager(cache=cache)
+
+        if preload_content:
+            server.gate.set()
+        start = time.time()
+        response = http.request(
+            "GET", server.url + "/", preload_content=preload_content
+        )
+        if preload_content:
+            data = response.data
+        else:
+            # Only read up to the size limit, not to the end of the body
+            assert time.time() - start < 2
+            server.gate.set()
+            data = b"".join(response.stream(4))
+            response.release_conn()
+        assert data == b"a" * 7 + b"b" * 7 + b"c" * 7
+        assert cache.backend.get(server.url + "/") is None
+
+        # The connection is reusable afterwards
+        server.chunks = [b"small"]
+        assert http.request("GET", server.url + "/").data == b"small"
+        assert cache.backend.get(server.url + "/").body == b"small"
+        assert http.connection_from_url(server.url).num_connections == 1
+
+
+def _entry(body):
+    return CachedResponse(200, "OK", 11, [], body, [], 0.0)
+
+
+class TestBackends(object):
+    def test_memory_cache_evicts_least_recently_used(self):
+        cache = MemoryCache(max_bytes=10)
+        cache.set("a", _entry(b"1234"))
+        cache.set("b", _entry(b"1234"))
+        cache.get("a")
+        cache.set("c", _entry(b"1234"))
+        assert cache.get("b") is None
+        assert cache.get("a").body == cache.get("c").body == b"1234"
+        assert cache.size == 8
+
+        cache.set("d", _entry(b"x" * 11))
+        assert cache.get("d") is None
+        assert cache.size == 8
+
+    def test_file_cache_evicts_at_max_bytes(self, tmpdir):
+        cache = FileCache(str(tmpdir), max_bytes=400)
+        for i, key in enumerate("abcdef"):
+            cache.set(key, _entry(b"x" * 50))
+            os.utime(cache._path(key), (i, i))  # Use order
+        assert cache.size <= 400
+        assert cache.get("f").body == b"x" * 50
+        assert cache.get("a") is None
+
+        cache.set("big", _entry(b"x" * 500))
+        assert cache.get("big") is None
+
+        # The size is recovered from the directory by another instance
+        assert FileCache(str(tmpdir), max_bytes=400).size == cache.size
@@ -0,0 +1,85 @@
+from __future__ import absolute_import
+
+import pytest
+
+from urllib3 import HTTPConnectionPool, PoolManager
+from urllib3.metrics import COUNTERS, PoolMetrics
+
+
+class TestPoolMetrics(object):
+    def test_snapshot_after_requests(self, http_server):
+        events = []
+        with HTTPConnectionPool(
+            http_server.host,
+            http_server.port,
+            maxsize=2,
+            event_hooks=[lambda event, pool, data: events.append(event)],
+        ) as pool:
+            pool.request("GET", "/")
+            pool.request("GET", "/")
+            snapshot = pool.metrics.snapshot(pool)
+
+        counters = snapshot["counters"]
+        assert counters["requests"] == 2
+        assert counters["checkouts"] == 2
+        assert counters["connections_created"] == 1
+        assert counters["connections_reused"] == 1
+        assert counters["retries"] == counters["connect_failures"] == 0
+
+        timings = snapshot["timings"]
+        for name in ("checkout_wait", "first_byte", "total"):
+            assert timings[name]["count"] == 2
+            assert 0 <= timings[name]["mean"] <= timings[name]["max"]
+            assert timings[name]["p50"] <= timings[name]["p99"]
+        assert timings["connect"]["count"] == 1
+        assert "tls" not in timings
+
+        assert snapshot["host"] == http_server.host
+        assert snapshot["port"] == http_server.port
+        assert snapshot["idle_connections"] == 1
+        assert snapshot["maxsize"] == 2
+
+        assert events.count("request") == 2
+        assert events.count("connection_created") == 1
+
+    def test_pool_manager_metrics(self, http_server):
+        with PoolManager(maxsize=1) as http:
+            http.request("GET", http_server.url + "/")
+            (snapshot,) = http.pool_metrics()
+        assert snapshot["port"] == http_server.port
+        assert snapshot["counters"]["requests"] == 1
+
+    def test_failing_hook_is_ignored(self):
+        def hook(event, pool, data):
+            raise ValueError(event)
+
+        metrics = PoolMetrics(hooks=[hook])
+        metrics.record("request", None, counters=("requests",), timings={"total": 1.0})
+        assert metrics.snapshot()["counters"]["requests"] == 1
+
+    def test_hooks_receive_timings(self):
+        received = []
+        metrics = PoolMetrics(hooks=[lambda *args: received.append(args)])
+        metrics.record("request", None, timings={"total": 0.5, "tls": None}, status=200)
+        assert received == [
+            ("request", None, {"total": 0.5, "tls": None, "status": 200})
+        ]
+        assert list(metrics.snapshot()["timings"]) == ["total"]
+
+    def test_percentiles_over_window(self):
+        metrics = PoolMetrics(window=10)
+        for i in range(100):
+            metrics.record("request", None, timings={"total": float(i)})
+        summary = metrics.snapshot()["timings"]["total"]
+        assert summary["count"] == 100
+        assert summary["max"] == 99.0
+        assert summary["mean"] == pytest.approx(49.5)
+        assert 90.0 <= summary["p50"] <= summary["p99"] == 99.0
+
+    def test_reset(self):
+        metrics = PoolMetrics()
+        metrics.record("request", None, counters=("requests",), timings={"total": 1})
+        metrics.reset()
+        snapshot = metrics.snapshot()
+        assert snapshot["counters"] == dict.fromkeys(COUNTERS, 0)
+        assert snapshot["timings"] == {}
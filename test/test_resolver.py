@@ -0,0 +1,161 @@
+from __future__ import absolute_import
+
+import socket
+import threading
+
+import pytest
+
+from urllib3 import HTTPConnectionPool, PoolManager
+from urllib3.exceptions import NewConnectionError
+from urllib3.packages.six.moves import BaseHTTPServer
+from urllib3.util import connection
+from urllib3.util.connection import CachingResolver, Resolver
+
+
+class CountingResolver(Resolver):
+    """Answers with 127.0.0.1 for known hosts and counts its lookups."""
+
+    def __init__(self, hosts=("example.test",)):
+        self.hosts = set(hosts)
+        self.lookups = []
+
+    def resolve(self, host, port, family=0, type=socket.SOCK_STREAM):
+        self.lookups.append(host)
+        if host not in self.hosts:
+            raise socket.gaierror(socket.EAI_NONAME, "Name or service not known")
+        return [(socket.AF_INET, type, socket.IPPROTO_TCP, "", ("127.0.0.1", port))]
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(connection, "current_time", lambda: now[0])
+    return now
+
+
+class TestCachingResolver(object):
+    def test_answers_are_cached_until_ttl_expires(self, clock):
+        fake = CountingResolver()
+        resolver = CachingResolver(fake, ttl=10)
+
+        first = resolver.resolve("example.test", 80)
+        assert resolver.resolve("EXAMPLE.test", 80) == first
+        assert fake.lookups == ["example.test"]
+
+        clock[0] += 9.9
+        resolver.resolve("example.test", 80)
+        assert len(fake.lookups) == 1
+
+        clock[0] += 0.2
+        resolver.resolve("example.test", 80)
+        assert len(fake.lookups) == 2
+
+    def test_keyed_by_port(self, clock):
+        fake = CountingResolver()
+        resolver = CachingResolver(fake)
+        assert resolver.resolve("example.test", 80)[0][4] == ("127.0.0.1", 80)
+        assert resolver.resolve("example.test", 81)[0][4] == ("127.0.0.1", 81)
+        assert len(fake.lookups) == 2
+
+    def test_failures_are_cached_for_negative_ttl(self, clock):
+        fake = CountingResolver()
+        resolver = CachingResolver(fake, negative_ttl=5)
+
+        for _ in range(3):
+            with pytest.raises(socket.gaierror):
+                resolver.resolve("missing.test", 80)
+        assert fake.lookups == ["missing.test"]
+
+        clock[0] += 5.1
+        with pytest.raises(socket.gaierror):
+            resolver.resolve("missing.test", 80)
+        assert len(fake.lookups) == 2
+
+    def test_no_negative_caching(self, clock):
+        fake = CountingResolver()
+        resolver = CachingResolver(fake, negative_ttl=0)
+        for _ in range(2):
+            with pytest.raises(socket.gaierror):
+                resolver.resolve("missing.test", 80)
+        assert len(fake.lookups) == 2
+
+    def test_static_hosts(self, clock):
+        fake = CountingResolver()
+        resolver = CachingResolver(
+            fake, hosts={"Static.test": ["127.0.0.2", "::1"], "one.test": "127.0.0.3"}
+        )
+
+        result = resolver.resolve("static.test", 80, socket.AF_INET)
+        assert [res[4] for res in result] == [("127.0.0.2", 80)]
+        assert resolver.resolve("one.test", 80)[0][4] == ("127.0.0.3", 80)
+        with pytest.raises(socket.gaierror):
+            resolver.resolve("one.test", 80, socket.AF_INET6)
+        assert fake.lookups == []
+
+        # Static entries never expire and survive clear()
+        clock[0] += 10 ** 6
+        resolver.clear()
+        assert resolver.resolve("one.test", 80)[0][4] == ("127.0.0.3", 80)
+        assert fake.lookups == []
+
+    def test_clear(self, clock):
+        fake = CountingResolver()
+        resolver = CachingResolver(fake)
+        resolver.resolve("example.test", 80)
+        resolver.clear()
+        resolver.resolve("example.test", 80)
+        assert len(fake.lookups) == 2
+
+
+class _Handler(BaseHTTPServer.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        body = self.headers.get("Host", "").encode("ascii")
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@pytest.fixture
+def port():
+    httpd = BaseHTTPServer.HTTPServer(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=httpd.serve_forever)
+    thread.daemon = True
+    thread.start()
+    yield httpd.server_address[1]
+    httpd.shutdown()
+    httpd.server_close()
+
+
+class TestResolverKwarg(object):
+    def test_connection_pool(self, port):
+        fake = CountingResolver()
+        with HTTPConnectionPool("example.test", port, resolver=fake) as pool:
+            response = pool.request("GET", "/")
+            assert response.data == b"example.test:%d" % port
+        assert fake.lookups == ["example.test"]
+        # The pool's resolver is only set while it connects
+        assert getattr(connection.connect_context, "resolver", None) is None
+
+    def test_pool_manager(self, port):
+        fake = CountingResolver()
+        resolver = CachingResolver(fake)
+        with PoolManager(resolver=resolver) as http:
+            for path in ("/a", "/b"):
+                url = "http://example.test:%d%s" % (port, path)
+                assert http.request("GET", url, retries=False).status == 200
+            http.clear()
+            http.request("GET", "http://example.test:%d/" % port)
+        assert fake.lookups == ["example.test"]
+
+    def test_pool_manager_lookup_failure(self):
+        fake = CountingResolver()
+        with PoolManager(resolver=fake) as http:
+            with pytest.raises(NewConnectionError):
+                http.request("GET", "http://missing.test/", retries=False)
+        assert fake.lookups == ["missing.test"]
@@ -0,0 +1,365 @@
+from __future__ import absolute_import
+
+import random
+import socket
+import time
+
+import pytest
+
+from urllib3 import HTTPConnectionPool, PoolManager
+from urllib3.exceptions import ConnectTimeoutError, MaxRetryError, NewConnectionError
+from urllib3.util import retry as retry_module
+from urllib3.util.retry import (
+    CircuitBreaker,
+    CircuitOpenError,
+    Retry,
+    RetryAt,
+    RetryBudget,
+    RetryBudgetExhaustedError,
+)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(retry_module, "current_time", lambda: now[0])
+    return now
+
+
+def _unavailable(handler):
+    if handler.path == "/ok":
+        return 200, [], b"ok"
+    return 503, [], b"unavailable"
+
+
+class _Response(object):
+    def __init__(self, status, location=None):
+        self.status = status
+        self.location = location
+
+    def get_redirect_location(self):
+        return self.location
+
+
+class TestRetryBudget(object):
+    def test_withdraw_takes_deposited_tokens(self, clock):
+        budget = RetryBudget(ratio=0.5, min_per_second=0)
+        assert not budget.withdraw()
+
+        budget.deposit()
+        assert budget.available == 0
+        budget.deposit()
+        assert budget.available == 1
+
+        assert budget.withdraw()
+        assert not budget.withdraw()
+        assert budget.rejected == 2
+
+    def test_tokens_are_capped(self, clock):
+        budget = RetryBudget(ratio=1, min_per_second=0, max_tokens=3)
+        for _ in range(10):
+            budget.deposit()
+
+        assert budget.available == 3
+        assert [budget.withdraw() for _ in range(4)] == [True, True, True, False]
+
+    def test_reserve_refills_over_time(self, clock):
+        budget = RetryBudget(ratio=0, min_per_second=2)
+        assert [budget.withdraw() for _ in range(3)] == [True, True, False]
+
+        clock[0] += 0.5
+        assert [budget.withdraw() for _ in range(2)] == [True, False]
+
+        # The reserve never holds more than one second's worth
+        clock[0] += 60
+        assert [budget.withdraw() for _ in range(3)] == [True, True, False]
+
+    def test_increment_raises_when_exhausted(self, clock):
+        retry = Retry(total=5, budget=RetryBudget(min_per_second=0))
+
+        with pytest.raises(MaxRetryError) as e:
+            retry.increment(method="GET", url="/", error=ConnectTimeoutError())
+        assert isinstance(e.value.reason, ConnectTimeoutError)
+
+        with pytest.raises(MaxRetryError) as e:
+            retry.increment(method="GET", url="/", response=_Response(503))
+        assert isinstance(e.value.reason, RetryBudgetExhaustedError)
+
+    def test_redirects_are_not_counted(self, clock):
+        budget = RetryBudget(min_per_second=0)
+        retry = Retry(total=5, budget=budget)
+
+        retry = retry.increment(
+            method="GET", url="/", response=_Response(302, location="/next")
+        )
+
+        assert retry.total == 4
+        assert budget.rejected == 0
+
+    def test_pool_manager_stops_retrying(self, http_server, clock):
+        http_server.respond = _unavailable
+        budget = RetryBudget(ratio=1, min_per_second=0)
+        retries = Retry(3, status_forcelist=[503])
+
+        with PoolManager(retry_budget=budget) as http:
+            with pytest.raises(MaxRetryError) as e:
+                http.request("GET", http_server.url + "/fail", retries=retries)
+            assert isinstance(e.value.reason, RetryBudgetExhaustedError)
+            assert len(http_server.requests) == 1
+
+            # A success pays for exactly one retry
+            assert http.request("GET", http_server.url + "/ok").status == 200
+            with pytest.raises(MaxRetryError):
+                http.request("GET", http_server.url + "/fail", retries=retries)
+
+        assert [path for _, path in http_server.requests] == [
+            "/fail",
+            "/ok",
+            "/fail",
+            "/fail",
+        ]
+
+
+class TestDecorrelatedJitter(object):
+    def _sleeps(self, retry, count):
+        sleeps = []
+        for _ in range(count):
+            retry = retry.increment(method="GET", url="/", error=ConnectTimeoutError())
+            sleeps.append(retry.get_backoff_time())
+            assert retry.get_backoff_time() == sleeps[-1]
+        return sleeps
+
+    @pytest.mark.parametrize("seed", range(5))
+    def test_sleeps_are_bounded(self, seed):
+        random.seed(seed)
+        retry = Retry(total=30, backoff_factor=0.1, backoff_jitter="decorrelated")
+
+        sleeps = self._sleeps(retry, 30)
+
+        assert sleeps[0] == 0
+        previous = 0.1
+        for sleep in sleeps[1:]:
+            assert 0.1 <= sleep <= min(previous * 3, Retry.DEFAULT_BACKOFF_MAX)
+            previous = sleep
+        assert len(set(sleeps[1:])) > 1
+
+    def test_sleeps_reach_the_cap(self):
+        random.seed(0)
+        retry = Retry(total=100, backoff_factor=1, backoff_jitter="decorrelated")
+
+        sleeps = self._sleeps(retry, 100)
+
+        assert max(sleeps) <= Retry.DEFAULT_BACKOFF_MAX
+        assert max(sleeps) > Retry.DEFAULT_BACKOFF_MAX / 3
+
+    def test_unknown_jitter(self):
+        with pytest.raises(ValueError):
+            Retry(backoff_jitter="full")
+
+
+def _statuses(*statuses):
+    """Answer with ``statuses`` in turn, then with 200."""
+    statuses = list(statuses)
+
+    def respond(handler):
+        if statuses:
+            status, headers = statuses.pop(0)
+            return status, headers, b"retry"
+        return 200, [], b"done"
+
+    return respond
+
+
+def _closed_port():
+    sock = socket.socket()
+    sock.bind(("127.0.0.1", 0))
+    port = sock.getsockname()[1]
+    sock.close()
+    return port
+
+
+class TestDeferredRetry(object):
+    def test_retry_after_returns_retry_at(self, http_server):
+        http_server.respond = _statuses((503, [("Retry-After", "30")]))
+        retries = Retry(3, status_forcelist=[503], defer=True)
+
+        with HTTPConnectionPool(http_server.host, http_server.port) as pool:
+            start = time.time()
+            pending = pool.urlopen("GET", "/", retries=retries)
+
+            assert time.time() - start < 5
+            assert isinstance(pending, RetryAt)
+            assert 25 < pending.delay <= 30
+            assert pending.retries.total == 2
+            assert len(pending.retries.history) == 1
+            assert len(http_server.requests) == 1
+
+            response = pending.resume()
+
+        assert response.status == 200
+        assert response.data == b"done"
+        assert len(http_server.requests) == 2
+
+    def test_no_wait_retries_at_once(self, http_server):
+        http_server.respond = _statuses((503, []))
+        retries = Retry(3, status_forcelist=[503], defer=True)
+
+        with HTTPConnectionPool(http_server.host, http_server.port) as pool:
+            response = pool.urlopen("GET", "/", retries=retries)
+
+        assert response.status == 200
+        assert len(http_server.requests) == 2
+
+    def test_backoff_is_deferred(self):
+        retries = Retry(total=2, backoff_factor=30, defer=True)
+
+        with HTTPConnectionPool("127.0.0.1", _closed_port()) as pool:
+            start = time.time()
+            # The first retry is immediate, the second one backs off
+            pending = pool.urlopen("GET", "/", retries=retries)
+
+            assert time.time() - start < 5
+            assert isinstance(pending, RetryAt)
+            assert 50 < pending.delay <= 60
+            assert pending.retries.total == 0
+
+            with pytest.raises(MaxRetryError) as e:
+                pending.resume()
+        assert isinstance(e.value.reason, NewConnectionError)
+
+    def test_pool_manager_resumes_through_the_manager(self, http_server):
+        http_server.respond = _statuses((503, [("Retry-After", "30")]), (503, []))
+        retries = Retry(3, status_forcelist=[503], defer=True)
+
+        with PoolManager() as http:
+            pending = http.request("GET", http_server.url + "/", retries=retries)
+
+            assert isinstance(pending, RetryAt)
+            response = pending.resume()
+
+        assert response.status == 200
+        assert len(http_server.requests) == 3
+
+
+def _open_breaker(**kw):
+    breaker = CircuitBreaker(failure_ratio=0.5, min_requests=4, **kw)
+    breaker.record_success()
+    breaker.record_success()
+    assert not breaker.record_failure()
+    assert breaker.record_failure()
+    return breaker
+
+
+class TestCircuitBreaker(object):
+    def test_opens_at_failure_ratio(self, clock):
+        breaker = CircuitBreaker(failure_ratio=0.5, min_requests=4)
+        assert breaker.state == CircuitBreaker.CLOSED
+
+        # Not enough outcomes yet, however many fail
+        for _ in range(3):
+            assert not breaker.record_failure()
+        assert breaker.allow()
+
+        assert breaker.record_failure()
+        assert breaker.state == CircuitBreaker.OPEN
+        assert not breaker.allow()
+        assert breaker.rejected == 1
+
+    def test_successes_keep_it_closed(self, clock):
+        breaker = CircuitBreaker(failure_ratio=0.5, min_requests=4)
+        for _ in range(3):
+            breaker.record_success()
+
+        assert not breaker.record_failure()
+        assert not breaker.record_failure()
+        assert breaker.record_failure()
+
+    def test_old_outcomes_leave_the_window(self, clock):
+        breaker = CircuitBreaker(failure_ratio=0.5, min_requests=4, window=10)
+        for _ in range(3):
+            breaker.record_failure()
+
+        clock[0] += 10
+        for _ in range(3):
+            assert not breaker.record_failure()
+        assert breaker.state == CircuitBreaker.CLOSED
+
+    def test_open_half_open_closed(self, clock):
+        breaker = _open_breaker(recovery_time=30, probes=2)
+
+        clock[0] += 29
+        assert not breaker.allow()
+        assert breaker.state == CircuitBreaker.OPEN
+
+        clock[0] += 1
+        assert breaker.allow()
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+        assert breaker.allow()
+        assert not breaker.allow()
+
+        breaker.record_success()
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+        breaker.record_success()
+        assert breaker.state == CircuitBreaker.CLOSED
+        assert breaker.allow()
+
+        # Closing starts a fresh window
+        assert not breaker.record_failure()
+
+    def test_failed_probe_reopens(self, clock):
+        breaker = _open_breaker(recovery_time=30)
+        clock[0] += 30
+        assert breaker.allow()
+
+        assert breaker.record_failure()
+        assert breaker.state == CircuitBreaker.OPEN
+        assert not breaker.allow()
+
+        clock[0] += 30
+        assert breaker.allow()
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+
+    def test_lost_probe_frees_its_slot(self, clock):
+        breaker = _open_breaker(recovery_time=30)
+        clock[0] += 30
+        assert breaker.allow()
+        assert not breaker.allow()
+
+        clock[0] += 30
+        assert breaker.allow()
+        breaker.record_success()
+        assert breaker.state == CircuitBreaker.CLOSED
+
+    def test_new_is_closed(self, clock):
+        breaker = _open_breaker(recovery_time=5, probes=3)
+
+        fresh = breaker.new()
+
+        assert fresh.state == CircuitBreaker.CLOSED
+        assert (fresh.min_requests, fresh.recovery_time, fresh.probes) == (4, 5, 3)
+
+    def test_pool_manager_stops_sending(self, http_server, clock):
+        http_server.respond = _statuses(*[(500, [])] * 10)
+        breaker = CircuitBreaker(failure_ratio=0.5, min_requests=2, recovery_time=30)
+        retries = Retry(5, status_forcelist=[500])
+
+        with PoolManager(circuit_breaker=breaker) as http:
+            with pytest.raises(MaxRetryError) as e:
+                http.request("GET", http_server.url + "/", retries=retries)
+            assert isinstance(e.value.reason, CircuitOpenError)
+            assert len(http_server.requests) == 2
+
+            with pytest.raises(MaxRetryError) as e:
+                http.request("GET", http_server.url + "/", retries=retries)
+            assert isinstance(e.value.reason, CircuitOpenError)
+            assert len(http_server.requests) == 2
+
+            # The breaker passed in is a template; each pool has its own copy
+            assert breaker.state == CircuitBreaker.CLOSED
+
+            clock[0] += 30
+            http_server.respond = _statuses()
+            assert http.request("GET", http_server.url + "/").status == 200
+            assert len(http_server.requests) == 3
+            pool = http.connection_from_url(http_server.url)
+            assert pool.circuit_breaker.state == CircuitBreaker.CLOSED
@@ -0,0 +1,210 @@
+from __future__ import absolute_import
+
+import select
+import socket
+import struct
+import threading
+import time
+
+import pytest
+
+pytest.importorskip("socks")
+
+from urllib3.contrib import socks  # noqa: E402
+from urllib3.exceptions import NewConnectionError  # noqa: E402
+from urllib3.util.connection import Resolver  # noqa: E402
+
+#: Seconds the stand-in waits before answering the greeting and the CONNECT
+#: request, so that the phases are long enough to tell apart.
+DELAY = 0.05
+
+
+class CountingResolver(Resolver):
+    """Answers with 127.0.0.1 for known hosts and counts its lookups."""
+
+    def __init__(self, hosts):
+        self.hosts = set(hosts)
+        self.lookups = []
+
+    def resolve(self, host, port, family=0, type=socket.SOCK_STREAM):
+        self.lookups.append(host)
+        if host not in self.hosts:
+            raise socket.gaierror(socket.EAI_NONAME, "Name or service not known")
+        return [(socket.AF_INET, type, socket.IPPROTO_TCP, "", ("127.0.0.1", port))]
+
+
+def _recv_exactly(sock, count):
+    data = b""
+    while len(data) < count:
+        chunk = sock.recv(count - len(data))
+        if not chunk:
+            raise EOFError()
+        data += chunk
+    return data
+
+
+def _relay(client, upstream):
+    while True:
+        readable = select.select([client, upstream], [], [], 5)[0]
+        if not readable:
+            return
+        for sock in readable:
+            data = sock.recv(65536)
+            if not data:
+                return
+            (upstream if sock is client else client).sendall(data)
+
+
+class Socks5Proxy(object):
+    """
+    A SOCKS5 proxy without authentication that only understands CONNECT.
+    Domain names are looked up in ``hosts``; every request's address type
+    and address are recorded in ``requests``.
+    """
+
+    def __init__(self, hosts=None):
+        self.hosts = hosts or {}
+        self.requests = []
+        self.server = socket.socket()
+        self.server.bind(("127.0.0.1", 0))
+        self.server.listen(5)
+        self.port = self.server.getsockname()[1]
+        thread = threading.Thread(target=self._serve)
+        thread.daemon = True
+        thread.start()
+
+    def _serve(self):
+        while True:
+            try:
+                client, _ = self.server.accept()
+            except socket.error:
+                return
+            thread = threading.Thread(target=self._handle, args=(client,))
+            thread.daemon = True
+            thread.start()
+
+    def _handle(self, client):
+        upstream = None
+        try:
+            _, methods = struct.unpack("!BB", _recv_exactly(client, 2))
+            _recv_exactly(client, methods)
+            time.sleep(DELAY)
+            client.sendall(b"\x05\x00")
+
+            _, _, _, atyp = struct.unpack("!BBBB", _recv_exactly(client, 4))
+            if atyp == 1:
+                host = socket.inet_ntoa(_recv_exactly(client, 4))
+            elif atyp == 3:
+                length = ord(_recv_exactly(client, 1))
+                host = _recv_exactly(client, length).decode("ascii")
+            else:
+                host = socket.inet_ntop(socket.AF_INET6, _recv_exactly(client, 16))
+            port = struct.unpack("!H", _recv_exactly(client, 2))[0]
+            self.requests.append((atyp, host, port))
+
+            upstream = socket.create_connection((self.hosts.get(host, host), port))
+            time.sleep(DELAY)
+            bound = socket.inet_aton("127.0.0.1") + b"\0\0"
+            client.sendall(b"\x05\x00\x00\x01" + bound)
+            _relay(client, upstream)
+        except (EOFError, socket.error):
+            pass
+        finally:
+            client.close()
+            if upstream is not None:
+                upstream.close()
+
+    def close(self):
+        self.server.close()
+
+
+@pytest.fixture
+def proxy():
+    proxy = Socks5Proxy(hosts={"example.test": "127.0.0.1"})
+    yield proxy
+    proxy.close()
+
+
+class TestSOCKSProxyManager(object):
+    def test_local_dns_goes_through_the_pool_resolver(self, http_server, proxy):
+        resolver = CountingResolver(["socks.test", "example.test"])
+        events = []
+        url = "http://example.test:%d/" % http_server.port
+
+        with socks.SOCKSProxyManager(
+            "socks5://socks.test:%d" % proxy.port,
+            resolver=resolver,
+            event_hooks=[lambda event, pool, data: events.append((event, data))],
+        ) as http:
+            assert http.request("GET", url).data == b"ok"
+            assert http.request("GET", url).data == b"ok"
+            (snapshot,) = http.pool_metrics()
+
+        # The proxy got the address, not the name, and the connection is reused
+        assert proxy.requests == [(1, "127.0.0.1", http_server.port)]
+        assert resolver.lookups == ["socks.test", "example.test"]
+        assert http_server.requests == [("GET", "/"), ("GET", "/")]
+
+        (created,) = [data for event, data in events if event == "connection_created"]
+        assert created["dns"] >= 0
+        assert created["connect"] >= 0
+        assert created["socks_handshake"] >= DELAY * 0.9
+        assert created["socks_connect"] >= DELAY * 0.9
+        assert created["tls"] is None
+        for name in ("dns", "connect", "socks_handshake", "socks_connect"):
+            assert snapshot["timings"][name]["count"] == 1
+        assert snapshot["counters"]["connections_created"] == 1
+
+    def test_remote_dns_only_resolves_the_proxy(self, http_server, proxy):
+        resolver = CountingResolver(["socks.test"])
+
+        with socks.SOCKSProxyManager(
+            "socks5h://socks.test:%d" % proxy.port, resolver=resolver
+        ) as http:
+            response = http.request("GET", "http://example.test:%d/" % http_server.port)
+
+        assert response.data == b"ok"
+        assert proxy.requests == [(3, "example.test", http_server.port)]
+        assert resolver.lookups == ["socks.test"]
+
+    def test_resolver_failure_for_the_target(self, proxy):
+        resolver = CountingResolver(["socks.test"])
+
+        with socks.SOCKSProxyManager(
+            "socks5://socks.test:%d" % proxy.port, resolver=resolver, retries=False
+        ) as http:
+            with pytest.raises(NewConnectionError):
+                http.request("GET", "http://unknown.test/")
+
+        assert resolver.lookups == ["socks.test", "unknown.test"]
+        assert proxy.requests == []
+
+
+def test_create_connection_records_timings(http_server, proxy):
+    resolver = CountingResolver(["socks.test", "example.test"])
+    options = {
+        "socks_version": socks.socks.PROXY_TYPE_SOCKS5,
+        "proxy_host": "socks.test",
+        "proxy_port": proxy.port,
+        "username": None,
+        "password": None,
+        "rdns": False,
+    }
+
+    sock = socks._create_connection(
+        ("example.test", http_server.port), options, timeout=5, resolver=resolver
+    )
+    try:
+        timings = socks.connect_timings
+        assert timings.dns >= 0
+        assert timings.tcp >= 0
+        assert timings.socks_handshake >= DELAY * 0.9
+        assert timings.socks_connect >= DELAY * 0.9
+
+        sock.sendall(b"GET / HTTP/1.1\r\nHost: example.test\r\n\r\n")
+        assert sock.recv(1024).startswith(b"HTTP/1.1 200")
+    finally:
+        sock.close()
+
+    assert resolver.lookups == ["socks.test", "example.test"]
+    assert proxy.requests == [(1, "127.0.0.1", http_server.port)]
@@ -0,0 +1,100 @@
+from __future__ import absolute_import
+
+import os
+import shutil
+
+import pytest
+
+from urllib3.util import ssl_
+
+CERTS = os.path.join(os.path.dirname(__file__), "certs")
+CA_ONE = os.path.join(CERTS, "ca_one.pem")
+CA_TWO = os.path.join(CERTS, "ca_two.pem")
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    ssl_.clear_context_cache()
+    yield
+    ssl_.clear_context_cache()
+
+
+def _rotate(source, path, mtime):
+    shutil.copyfile(source, path + ".new")
+    os.rename(path + ".new", path)
+    # Both test CAs have the same size; make sure the time moves on
+    os.utime(path, (mtime, mtime))
+
+
+def _ca_names(context):
+    return [dict(cert["subject"][1])["commonName"] for cert in context.get_ca_certs()]
+
+
+class TestCachedContext(object):
+    def test_same_settings_share_a_context(self, tmpdir):
+        ca_certs = str(tmpdir.join("ca.pem"))
+        shutil.copyfile(CA_ONE, ca_certs)
+
+        context = ssl_.cached_urllib3_context(ca_certs=ca_certs)
+
+        assert ssl_.cached_urllib3_context(ca_certs=ca_certs) is context
+        assert _ca_names(context) == ["Test CA one"]
+        assert context._urllib3_loaded_files[0] == ca_certs
+
+    def test_different_settings_get_their_own_context(self):
+        context = ssl_.cached_urllib3_context(ca_certs=CA_ONE)
+
+        other_ca = ssl_.cached_urllib3_context(ca_certs=CA_TWO)
+        other_ciphers = ssl_.cached_urllib3_context(ca_certs=CA_ONE, ciphers="HIGH")
+
+        assert other_ca is not context
+        assert other_ciphers is not context
+        assert _ca_names(other_ciphers) == ["Test CA one"]
+
+    def test_rotated_file_is_reloaded(self, tmpdir):
+        ca_certs = str(tmpdir.join("ca.pem"))
+        _rotate(CA_ONE, ca_certs, 1000000000)
+        old = ssl_.cached_urllib3_context(ca_certs=ca_certs)
+
+        _rotate(CA_TWO, ca_certs, 1000000060)
+        new = ssl_.cached_urllib3_context(ca_certs=ca_certs)
+
+        assert new is not old
+        assert _ca_names(old) == ["Test CA one"]
+        assert _ca_names(new) == ["Test CA two"]
+        assert ssl_.cached_urllib3_context(ca_certs=ca_certs) is new
+
+    def test_grown_bundle_is_reloaded(self, tmpdir):
+        ca_certs = tmpdir.join("ca.pem")
+        shutil.copyfile(CA_ONE, str(ca_certs))
+        mtime = os.stat(str(ca_certs)).st_mtime
+        old = ssl_.cached_urllib3_context(ca_certs=str(ca_certs))
+
+        with open(CA_TWO) as f:
+            ca_certs.write(f.read(), mode="a")
+        os.utime(str(ca_certs), (mtime, mtime))
+        new = ssl_.cached_urllib3_context(ca_certs=str(ca_certs))
+
+        assert new is not old
+        assert sorted(_ca_names(new)) == ["Test CA one", "Test CA two"]
+
+    def test_clear_context_cache(self, tmpdir):
+        ca_certs = str(tmpdir.join("ca.pem"))
+        shutil.copyfile(CA_ONE, ca_certs)
+        old = ssl_.cached_urllib3_context(ca_certs=ca_certs)
+
+        # Replaced in place: same size and time, so only a clear notices
+        stat = os.stat(ca_certs)
+        shutil.copyfile(CA_TWO, ca_certs)
+        os.utime(ca_certs, (stat.st_atime, stat.st_mtime))
+        assert ssl_.cached_urllib3_context(ca_certs=ca_certs) is old
+
+        ssl_.clear_context_cache()
+        new = ssl_.cached_urllib3_context(ca_certs=ca_certs)
+
+        assert new is not old
+        assert _ca_names(new) == ["Test CA two"]
+
+    def test_missing_file_raises(self, tmpdir):
+        with pytest.raises(ssl_.SSLError):
+            ssl_.cached_urllib3_context(ca_certs=str(tmpdir.join("missing.pem")))
@@ -0,0 +1,96 @@
+from __future__ import absolute_import
+
+import select
+import socket
+import threading
+import time
+
+import pytest
+
+from urllib3.util import wait as wait_module
+from urllib3.util.wait import wait_for_any
+
+IMPLEMENTATIONS = ["select"]
+if hasattr(select, "poll"):
+    IMPLEMENTATIONS.append("poll")
+
+
+@pytest.fixture(params=IMPLEMENTATIONS)
+def implementation(request, monkeypatch):
+    monkeypatch.setattr(
+        wait_module,
+        "wait_for_sockets",
+        getattr(wait_module, "%s_wait_for_sockets" % request.param),
+    )
+
+
+@pytest.fixture
+def pairs():
+    pairs = [socket.socketpair() for _ in range(3)]
+    yield pairs
+    for a, b in pairs:
+        a.close()
+        b.close()
+
+
+def _ids(socks):
+    return sorted(id(sock) for sock in socks)
+
+
+@pytest.mark.usefixtures("implementation")
+class TestWaitForAny(object):
+    def test_timeout(self, pairs):
+        start = time.time()
+        assert wait_for_any([a for a, _ in pairs], read=True, timeout=0.1) == []
+        assert time.time() - start >= 0.05
+
+    def test_returns_only_ready_sockets(self, pairs):
+        socks = [a for a, _ in pairs]
+        pairs[1][1].send(b"x")
+
+        assert wait_for_any(socks, read=True, timeout=1) == [socks[1]]
+
+        pairs[2][1].send(b"y")
+        ready = wait_for_any(socks, read=True, timeout=1)
+        assert _ids(ready) == _ids([socks[1], socks[2]])
+
+    def test_closed_peer_is_readable(self, pairs):
+        socks = [a for a, _ in pairs]
+        pairs[0][1].close()
+
+        assert wait_for_any(socks, read=True, timeout=1) == [socks[0]]
+
+    def test_write(self, pairs):
+        socks = [a for a, _ in pairs]
+
+        ready = wait_for_any(socks, write=True, timeout=1)
+
+        assert _ids(ready) == _ids(socks)
+
+    def test_read_or_write(self, pairs):
+        socks = [a for a, _ in pairs]
+        pairs[0][1].send(b"x")
+
+        ready = wait_for_any(socks[:1], read=True, write=True, timeout=1)
+
+        assert ready == [socks[0]]
+
+    def test_blocks_until_ready(self, pairs):
+        socks = [a for a, _ in pairs]
+        timer = threading.Timer(0.1, pairs[2][1].send, args=(b"x",))
+        timer.start()
+        try:
+            assert wait_for_any(socks, read=True) == [socks[2]]
+        finally:
+            timer.join()
+
+    def test_requires_read_or_write(self, pairs):
+        with pytest.raises(RuntimeError):
+            wait_for_any([pairs[0][0]], timeout=0)
+
+
+def test_empty_returns_at_once():
+    start = time.time()
+    assert wait_for_any([], read=True, timeout=5) == []
+    assert wait_for_any([], read=True) == []
+    assert time.time() - start < 1
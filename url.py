@@ -3,6 +3,7 @@ from __future__ import absolute_import
 import re
 from collections import namedtuple
 
+from .._collections import ConcurrentRecentlyUsedContainer
 from ..exceptions import LocationParseError
 from ..packages import six
 
@@ -78,6 +79,23 @@ USERINFO_CHARS = UNRESERVED_CHARS | SUB_DELIM_CHARS | {":"}
 PATH_CHARS = USERINFO_CHARS | {"@", "/"}
 QUERY_CHARS = FRAGMENT_CHARS = PATH_CHARS | {"?"}
 
+# HTTP(S) URLs that parse_url() would return unchanged: lowercase scheme and
+# host, no userinfo, a port without leading zeros, and a path and query
+# made of allowed characters only (no '%' whose hex digits might need
+# uppercasing). Dot segments are ruled out separately.
+_NORMALIZED_URL_RE = re.compile(
+    r"^(https?)://([a-z0-9.-]+)(?::([1-9][0-9]{0,4}))?"
+    r"(/[A-Za-z0-9._~!$&'()*+,;=:@/-]*)?"
+    r"(?:\?([A-Za-z0-9._~!$&'()*+,;=:@/?-]*))?\Z"
+)
+
+#: Number of parsed URLs kept by :func:`parse_url`.
+PARSE_URL_CACHE_SIZE = 512
+# Longer URLs are parsed every time rather than evicting the hot entries.
+_MAX_CACHED_URL_LENGTH = 2048
+
+_parse_url_cache = ConcurrentRecentlyUsedContainer(PARSE_URL_CACHE_SIZE)
+
 
 class Url(namedtuple("Url", url_attrs)):
     """
@@ -351,11 +369,52 @@ def parse_url(url):
         Url(scheme=None, host='google.com', port=80, path=None, ...)
         >>> parse_url('/foo?bar')
         Url(scheme=None, host=None, port=None, path='/foo', query='bar', ...)
+
+    Results are immutable and the most recently parsed URLs are cached, so
+    a client hitting the same endpoints does not parse them again.
     """
     if not url:
         # Empty
         return Url()
 
+    # The type is part of the key: str and unicode URLs parse to different
+    # types on Python 2.
+    key = (url, type(url))
+    parsed = _parse_url_cache.get(key)
+    if parsed is not None:
+        return parsed
+
+    if type(url) is str:
+        parsed = _parse_normalized_url(url)
+    if parsed is None:
+        parsed = _parse_url(url)
+    if len(url) <= _MAX_CACHED_URL_LENGTH:
+        _parse_url_cache[key] = parsed
+    return parsed
+
+
+def _parse_normalized_url(url):
+    """
+    Parse a URL that normalization would leave untouched without the
+    encoding passes, or return None if it may need them.
+    """
+    match = _NORMALIZED_URL_RE.match(url)
+    if match is None:
+        return None
+    scheme, host, port, path, query = match.groups()
+    if path and "/." in path:
+        return None
+    if port is not None:
+        port = int(port)
+        if port > 65535:
+            return None
+    if not path and query is not None:
+        path = ""
+    return Url(scheme=scheme, host=host, port=port, path=path, query=query)
+
+
+def _parse_url(url):
+    """Uncached :func:`parse_url`."""
     source_url = url
     if not SCHEME_RE.search(url):
         url = "//" + url
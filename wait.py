@@ -8,7 +8,12 @@ try:
 except ImportError:
     from time import time as monotonic
 
-__all__ = ["NoWayToWaitForSocketError", "wait_for_read", "wait_for_write"]
+__all__ = [
+    "NoWayToWaitForSocketError",
+    "wait_for_any",
+    "wait_for_read",
+    "wait_for_write",
+]
 
 
 class NoWayToWaitForSocketError(Exception):
@@ -36,6 +41,11 @@ class NoWayToWaitForSocketError(Exception):
 #
 # So: on Windows we use select(), and everywhere else we use poll(). We also
 # fall back to select() in case poll() is somehow broken or missing.
+#
+# The same reasoning holds for wait_for_any(), which waits on many sockets at
+# once: those change from one call to the next (connections come and go from
+# a pool), so registering them with epoll would cost a syscall per socket
+# and call, while poll() and select() take them all in a single syscall.
 
 if sys.version_info >= (3, 5):
     # Modern Python, that retries syscalls by default
@@ -106,6 +116,41 @@ def poll_wait_for_socket(sock, read=False, write=False, timeout=None):
     return bool(_retry_on_intr(do_poll, timeout))
 
 
+def select_wait_for_sockets(socks, read=False, write=False, timeout=None):
+    if not read and not write:
+        raise RuntimeError("must specify at least one of read=True, write=True")
+    rcheck = list(socks) if read else []
+    wcheck = list(socks) if write else []
+    # See select_wait_for_socket() for checking write sockets for errors
+    fn = partial(select.select, rcheck, wcheck, wcheck)
+    rready, wready, xready = _retry_on_intr(fn, timeout)
+    ready = set(rready) | set(wready) | set(xready)
+    return [sock for sock in socks if sock in ready]
+
+
+def poll_wait_for_sockets(socks, read=False, write=False, timeout=None):
+    if not read and not write:
+        raise RuntimeError("must specify at least one of read=True, write=True")
+    mask = 0
+    if read:
+        mask |= select.POLLIN
+    if write:
+        mask |= select.POLLOUT
+    poll_obj = select.poll()
+    by_fd = {}
+    for sock in socks:
+        by_fd[sock.fileno()] = sock
+        poll_obj.register(sock, mask)
+
+    # For some reason, poll() takes timeout in milliseconds
+    def do_poll(t):
+        if t is not None:
+            t *= 1000
+        return poll_obj.poll(t)
+
+    return [by_fd[fd] for fd, _ in _retry_on_intr(do_poll, timeout)]
+
+
 def null_wait_for_socket(*args, **kwargs):
     raise NoWayToWaitForSocketError("no select-equivalent available")
 
@@ -138,6 +183,29 @@ def wait_for_socket(*args, **kwargs):
     return wait_for_socket(*args, **kwargs)
 
 
+def wait_for_sockets(*args, **kwargs):
+    # Chosen on first use, like wait_for_socket()
+    global wait_for_sockets
+    if _have_working_poll():
+        wait_for_sockets = poll_wait_for_sockets
+    elif hasattr(select, "select"):
+        wait_for_sockets = select_wait_for_sockets
+    else:  # Platform-specific: Appengine.
+        wait_for_sockets = null_wait_for_socket
+    return wait_for_sockets(*args, **kwargs)
+
+
+def wait_for_any(socks, read=False, write=False, timeout=None):
+    """Waits until at least one of the given sockets is readable or writable,
+    as requested, with a single system call.
+    Returns the sockets that are ready, or an empty list if the timeout
+    expired. Returns at once if ``socks`` is empty.
+    """
+    if not socks:
+        return []
+    return wait_for_sockets(socks, read=read, write=write, timeout=timeout)
+
+
 def wait_for_read(sock, timeout=None):
     """Waits for reading to be available on a given socket.
     Returns True if the socket is readable, or False if the timeout expired.